@@ -1,5 +1,4 @@
 import datetime
-import json
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
@@ -7,7 +6,9 @@ import numpy as np
 from collections import Counter, defaultdict
 from datetime import datetime, timezone, timedelta
 from dateutil import parser
-from constants import COMMIT_ANALYSIS_RESULTS, PLOTS, RESULTS
+from constants import PLOTS, RESULTS
+from diff_stats import attach_diff_stats
+from repository_cache import repository_cache
 from tabulate import tabulate
 
 # Define a consistent green color palette
@@ -33,6 +34,26 @@ def analyze_rq1(repos, summaries, commits, dataset):
     # Plot CCP over all Repos and CC-Repos
     plot_ccp(repos, 'cc_over_time.pdf')
 
+    # Plot commit types impact on codebase metrics (needs diff stats of conventional commits only)
+    attach_diff_stats(repos, commit_filter=lambda commit: commit.get('is_conventional'))
+    plot_commit_types_impact_on_codebase_metrics_bar(commits, 'commit_types_impact_on_codebase_metrics_bar.pdf')
+
+    classification_matrix, correlations = analyze_rq1_summaries(summaries)
+
+    # Compile overall results
+    compile_overall_results(repos, dataset, classification_matrix, correlations)
+
+
+def analyze_rq1_summaries(summaries):
+    """
+    Performs the analyses of Research Question 1 that only need the analysis summaries, e.g. as loaded from the
+    summary index with repository_cache.summaries().
+
+    Returns:
+        tuple: The CC indication classification matrix and the correlations of the repository characteristics.
+    """
+    repos = [{'analysis_summary': summary} for summary in summaries]
+
     # Plot adoption rate by language
     plot_adoption_rate_by_language(summaries, 'adoption_rate_by_language.pdf')
 
@@ -48,9 +69,6 @@ def analyze_rq1(repos, summaries, commits, dataset):
     # Plot adoption rate by project size
     plot_cc_adoption_by_project_size(summaries, "adoption_rate_by_project_size.pdf")
 
-    # Plot commit types impact on codebase metrics
-    plot_commit_types_impact_on_codebase_metrics_bar(commits, 'commit_types_impact_on_codebase_metrics_bar.pdf')
-
     # Compare cc indication and adoption date
     classification_matrix = compare_cc_indication(repos)
 
@@ -62,9 +80,7 @@ def analyze_rq1(repos, summaries, commits, dataset):
 
     # Analyze and plot commit types distribution
     analyze_commit_types_distribution(repos)
-
-    # Compile overall results
-    compile_overall_results(repos, dataset, classification_matrix, correlations)
+    return classification_matrix, correlations
 
 
 def calculate_ccp(repos):
@@ -759,13 +775,11 @@ def calculate_project_age(created_at):
 
 
 def load_repo_data_by_id(repo_id):
-    """Load commit data for a specific repository by ID."""
-    repo_file = COMMIT_ANALYSIS_RESULTS / f"{repo_id}.json"
-    if not repo_file.is_file():
-        print(f"Repo file {repo_file} not found for repository {repo_id}. Skipping.")
-        return None
-    with open(repo_file, 'r', encoding='utf-8') as rf:
-        return json.load(rf)
+    """Load commit data for a specific repository by ID from the shared repository cache."""
+    repo_data = repository_cache.get(repo_id)
+    if repo_data is None:
+        print(f"Repo file not found for repository {repo_id}. Skipping.")
+    return repo_data
 
 
 def gather_repo_data(repos_data):
@@ -785,17 +799,18 @@ def gather_repo_data(repos_data):
         owner = repo.get('owner', 'Unknown')
         total_commits = repo_data.get('analysis_summary', {}).get('total_commits', 0)
         num_contributors = extract_contributors_from_commits(repo_data.get('commits', []))
+        age = calculate_project_age(repo.get('created_at'))
 
         # Update statistics
         owner_stats[owner]['num_projects'] += 1
         owner_stats[owner]['total_contributors'] += num_contributors
         owner_stats[owner]['total_stars'] += stars
-        owner_stats[owner]['age'] += calculate_project_age(repo.get('created_at'))
+        owner_stats[owner]['age'] += age
 
         language_stats[language]['num_projects'] += 1
         language_stats[language]['total_contributors'] += num_contributors
         language_stats[language]['total_stars'] += stars
-        language_stats[language]['age'] += calculate_project_age(repo.get('created_at'))
+        language_stats[language]['age'] += age
 
         data.append({
             'Language': language,
@@ -803,7 +818,7 @@ def gather_repo_data(repos_data):
             'Commits': total_commits,
             'Contributors': num_contributors,
             'Size': size,
-            'Age': calculate_project_age(repo.get('created_at')),
+            'Age': age,
         })
 
     # Convert to DataFrame
@@ -918,3 +933,8 @@ def compile_overall_results(repositories, dataset, classification_matrix, correl
             file.write(f"Correlation between CC adoption and {metric}: {value:.2f}\n")
 
     print(f"Overall results saved to {filename}")
+
+
+if __name__ == "__main__":
+    # Runs the summary-level analyses from the summary index, without loading any commits
+    analyze_rq1_summaries(repository_cache.summaries())
@@ -3,6 +3,7 @@ from matplotlib import pyplot as plt
 import pandas as pd
 import seaborn as sns
 from constants import PLOTS
+from diff_stats import attach_diff_stats
 
 colors = ['#e6f4e6', '#c3e6c3', '#a1d8a1', '#7eca7e', '#5cbd5c', '#4da64d', '#3d8c3d']
 
@@ -55,6 +56,8 @@ def analyze_rq2(repos):
     """
     Performs analysis related to Research Question 2.
     """
+    # Diff stats are only needed for repositories with an adoption date
+    attach_diff_stats(repos, repo_filter=lambda repo: repo['analysis_summary'].get('cc_adoption_date'))
 
     # Load and filter CC-commits before and after without consistent adoption
     df, df_consistent, df_adoption_date = load_and_filter_commits_adopted(repos)
@@ -7,6 +7,41 @@ import requests
 
 from pathlib import Path
 from bs4 import BeautifulSoup
+from git import GitCommandError
+
+from constants import INDICATOR_BACKEND, OFFLINE
+
+# Files in the repository root whose presence or content indicates the use of Conventional Commits
+CC_CONFIG_FILES = [
+    'commitlint.config.js',
+    '.commitlintrc',
+    '.commitlintrc.js',
+    '.commitlintrc.json',
+    '.cz-config.js',
+    '.czrc',
+    '.versionrc'
+]
+DOC_FILES = [
+    'README.md',
+    'CONTRIBUTING.md',
+    'DEVELOPING.md'
+]
+PACKAGE_JSON = 'package.json'
+HUSKY_DIR = '.husky'
+INDICATOR_PATHS = [PACKAGE_JSON, HUSKY_DIR] + CC_CONFIG_FILES + DOC_FILES
+
+# Keywords referring to Conventional Commits in documentation and wiki files
+DOC_KEYWORDS = [
+    "Conventional Commits",
+    "Conventional Commit",
+    "Conventional Changelog",
+    "Commit Message Convention",
+    "Commit Guidelines",
+    "commitizen",
+    "commitlint",
+    "standard-version",
+    "semantic-release"
+]
 
 
 def check_homepage_for_cc(homepage_url):
@@ -56,25 +91,60 @@ def check_homepage_for_cc(homepage_url):
     return False
 
 
-def search_for_cc_indications(repo_instance, homepage):
+def search_for_cc_indications(repo_instance, homepage, backend=INDICATOR_BACKEND):
     """
     Checks if a repository follows the Conventional Commits convention based on specific files and indicators.
 
     Args:
         :param repo_instance: Repository instance to analyze.
         :param homepage: URL of the repository's homepage.
+        :param backend: 'worktree' probes the checked-out files, 'object_db' reads the HEAD tree from the
+            object database. Repositories without a working tree (bare clones) always use 'object_db'.
 
     Returns:
         bool: True if CC is used, False otherwise.
 
     """
-    local_path = Path(repo_instance.working_tree_dir)
     logging.info("Checking repository for CC indicators")
 
+    # 1.-4. Check package.json, configuration files, Git hooks, documentation and wiki
+    if backend == 'object_db' or repo_instance.working_tree_dir is None:
+        cc_detected = search_head_tree_for_cc_indications(repo_instance)
+    else:
+        cc_detected = search_working_tree_for_cc_indications(Path(repo_instance.working_tree_dir))
+
+    # 5. Check homepage for CC indications if provided
+    if homepage and OFFLINE:
+        logging.info("Offline mode. Skipping homepage check.")
+    elif homepage:
+        logging.info(f"Checking homepage {homepage} for CC indications.")
+        homepage_uses_cc = check_homepage_for_cc(homepage)
+        cc_detected = homepage_uses_cc or cc_detected
+    else:
+        logging.info("No homepage provided. Skipping homepage check.")
+
+    if cc_detected:
+        logging.info("Found indications of Conventional Commit usage.")
+        return True
+    else:
+        logging.info("No indications of Conventional Commit usage found.")
+        return False
+
+
+def search_working_tree_for_cc_indications(local_path):
+    """
+    Checks the files of a checked-out working tree for indications of Conventional Commits.
+
+    Args:
+        local_path (Path): Path to the local repository.
+
+    Returns:
+        bool: True if indications are found, False otherwise.
+    """
     cc_detected = False  # Flag for CC indication detection
 
     # 1. Check package.json for relevant dependencies
-    package_json_path = local_path / 'package.json'
+    package_json_path = local_path / PACKAGE_JSON
     if package_json_path.exists():
         cc_detected = check_package_json(package_json_path) or cc_detected
 
@@ -87,20 +157,86 @@ def search_for_cc_indications(repo_instance, homepage):
     # 4. Check documentation and wiki files for CC references
     cc_detected = check_docu_wiki_for_cc(local_path) or cc_detected
 
-    # 5. Check homepage for CC indications if provided
-    if homepage:
-        logging.info(f"Checking homepage {homepage} for CC indications.")
-        homepage_uses_cc = check_homepage_for_cc(homepage)
-        cc_detected = homepage_uses_cc or cc_detected
+    return cc_detected
+
+
+def read_head_indicator_files(repo_instance):
+    """
+    Reads all indicator files of the HEAD tree directly from the git object database.
+
+    A single 'git ls-tree' lists the indicator paths and the blobs are read through GitPython's persistent
+    'git cat-file --batch' process, so no working tree is needed and no file system probing takes place.
+
+    Args:
+        repo_instance (Repo): Repository instance, may be bare.
+
+    Returns:
+        dict: Mapping of repository-relative paths to their decoded content.
+    """
+    try:
+        listing = repo_instance.git.ls_tree("-r", "-z", "--full-tree", "HEAD", "--", *INDICATOR_PATHS)
+    except GitCommandError as e:
+        logging.error(f"Error listing the HEAD tree: {e}")
+        return {}
+
+    files = {}
+    for entry in listing.split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        _, object_type, hexsha = meta.split()
+        if object_type != "blob":
+            continue  # e.g. submodules
+        _, _, _, data = repo_instance.git.get_object_data(hexsha)
+        files[path] = data.decode("utf-8", errors="ignore")
+    return files
+
+
+def search_head_tree_for_cc_indications(repo_instance):
+    """
+    Checks the HEAD tree in the object database for indications of Conventional Commits.
+
+    Performs the same checks as search_working_tree_for_cc_indications, but on file contents read by
+    read_head_indicator_files.
+
+    Args:
+        repo_instance (Repo): Repository instance, may be bare.
+
+    Returns:
+        bool: True if indications are found, False otherwise.
+    """
+    files = read_head_indicator_files(repo_instance)
+    repo_dir = Path(repo_instance.working_tree_dir or repo_instance.git_dir)
+    cc_detected = False
+
+    # 1. Check package.json for relevant dependencies
+    if PACKAGE_JSON in files:
+        cc_detected = check_package_json_content(files[PACKAGE_JSON]) or cc_detected
+
+    # 2. Check for specific configuration files
+    for config_file in CC_CONFIG_FILES:
+        if config_file in files:
+            logging.info(f"Configuration file found: {config_file}")
+            cc_detected = True
+            break
+
+    # 3. Check for Git hooks indicating CC use
+    husky_hooks = {path: content for path, content in files.items() if path.startswith(f"{HUSKY_DIR}/")}
+    if husky_hooks:
+        cc_detected = any(check_hook_content(Path(path).name, content)
+                          for path, content in husky_hooks.items()) or cc_detected
     else:
-        logging.info("No homepage provided. Skipping homepage check.")
+        cc_detected = check_local_git_hooks(Path(repo_instance.git_dir) / 'hooks') or cc_detected
 
-    if cc_detected:
-        logging.info("Found indications of Conventional Commit usage.")
-        return True
+    # 4. Check documentation and wiki files for CC references
+    for doc_file in DOC_FILES:
+        if doc_file in files and find_cc_keyword(files[doc_file], doc_file):
+            cc_detected = True
+            break
     else:
-        logging.info("No indications of Conventional Commit usage found.")
-        return False
+        cc_detected = check_wiki_for_cc(repo_dir / '.wiki') or cc_detected
+
+    return cc_detected
 
 
 def check_package_json(package_json_path):
@@ -115,23 +251,40 @@ def check_package_json(package_json_path):
     """
     try:
         with open(package_json_path, 'r', encoding='utf-8', errors='ignore') as f:
-            data = json.load(f)
-            dependencies = data.get('dependencies', {})
-            dev_dependencies = data.get('devDependencies', {})
-            all_dependencies = {**dependencies, **dev_dependencies}
-            cc_packages = [
-                "commitizen",
-                "cz-conventional-changelog",
-                "@commitlint/cli",
-                "@commitlint/config-conventional",
-                "standard-version",
-                "semantic-release"
-            ]
-            found_packages = [dep for dep in cc_packages if dep in all_dependencies]
-
-            if found_packages:
-                logging.info(f"Found CC-related dependencies in package.json: {found_packages}")
-                return True
+            return check_package_json_content(f.read())
+    except Exception as e:
+        logging.error(f"Error reading package.json: {e}")
+    return False
+
+
+def check_package_json_content(content):
+    """
+    Checks the content of a package.json for dependencies related to Conventional Commits.
+
+    Args:
+        content (str): Content of the package.json file.
+
+    Returns:
+        bool: True if relevant dependencies are found, False otherwise.
+    """
+    try:
+        data = json.loads(content)
+        dependencies = data.get('dependencies', {})
+        dev_dependencies = data.get('devDependencies', {})
+        all_dependencies = {**dependencies, **dev_dependencies}
+        cc_packages = [
+            "commitizen",
+            "cz-conventional-changelog",
+            "@commitlint/cli",
+            "@commitlint/config-conventional",
+            "standard-version",
+            "semantic-release"
+        ]
+        found_packages = [dep for dep in cc_packages if dep in all_dependencies]
+
+        if found_packages:
+            logging.info(f"Found CC-related dependencies in package.json: {found_packages}")
+            return True
     except Exception as e:
         logging.error(f"Error reading package.json: {e}")
     return False
@@ -147,17 +300,7 @@ def check_cc_configuration_files(local_path):
     Returns:
         bool: True if relevant configuration files are found, False otherwise.
     """
-    cc_config_files = [
-        'commitlint.config.js',
-        '.commitlintrc',
-        '.commitlintrc.js',
-        '.commitlintrc.json',
-        '.cz-config.js',
-        '.czrc',
-        '.versionrc'
-    ]
-
-    for config_file in cc_config_files:
+    for config_file in CC_CONFIG_FILES:
         config_path = local_path / config_file
         if config_path.exists():
             logging.info(f"Configuration file found: {config_file}")
@@ -165,6 +308,42 @@ def check_cc_configuration_files(local_path):
     return False
 
 
+def check_hook_content(hook_name, content):
+    """
+    Checks the content of a Git hook for references to Conventional Commits tooling.
+
+    Args:
+        hook_name (str): Name of the hook file.
+        content (str): Content of the hook file.
+
+    Returns:
+        bool: True if the hook references commitlint or commitizen, False otherwise.
+    """
+    if 'commitlint' in content or 'commitizen' in content:
+        logging.info(f"Git Hook with CC reference found: {hook_name}")
+        return True
+    return False
+
+
+def check_local_git_hooks(git_hooks_path):
+    """
+    Checks the hooks of the local git directory, ignoring the sample hooks installed by git.
+
+    Args:
+        git_hooks_path (Path): Path to the hooks directory inside the git directory.
+
+    Returns:
+        bool: True if relevant Git hooks are found, False otherwise.
+    """
+    if git_hooks_path.exists() and git_hooks_path.is_dir():
+        for hook_file in git_hooks_path.iterdir():
+            if hook_file.is_file() and not hook_file.name.endswith('.sample'):
+                with open(hook_file, 'r', encoding='utf-8', errors='ignore') as f:
+                    if check_hook_content(hook_file.name, f.read()):
+                        return True
+    return False
+
+
 def check_git_hooks(local_path):
     """
     Checks Git hooks for indications of Conventional Commits usage.
@@ -175,70 +354,47 @@ def check_git_hooks(local_path):
     Returns:
         bool: True if relevant Git hooks are found, False otherwise.
     """
-    git_hooks_path = local_path / '.husky'
+    git_hooks_path = local_path / HUSKY_DIR
     if git_hooks_path.exists() and git_hooks_path.is_dir():
         for hook_file in git_hooks_path.iterdir():
             if hook_file.is_file():
                 with open(hook_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    if 'commitlint' in content or 'commitizen' in content:
-                        logging.info(f"Git Hook with CC reference found: {hook_file.name}")
+                    if check_hook_content(hook_file.name, f.read()):
                         return True
     else:
         # Alternative check in .git/hooks
-        git_hooks_path = local_path / '.git' / 'hooks'
-        if git_hooks_path.exists() and git_hooks_path.is_dir():
-            for hook_file in git_hooks_path.iterdir():
-                if hook_file.is_file() and not hook_file.name.endswith('.sample'):
-                    with open(hook_file, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        if 'commitlint' in content or 'commitizen' in content:
-                            logging.info(f"Git Hook with CC reference found: {hook_file.name}")
-                            return True
+        return check_local_git_hooks(local_path / '.git' / 'hooks')
     return False
 
 
-def check_docu_wiki_for_cc(local_path):
+def find_cc_keyword(content, source):
     """
-    Searches documentation and wiki files for mentions of Conventional Commits.
+    Searches a text for keywords referring to Conventional Commits.
 
     Args:
-        local_path (Path): Path to the local repository.
+        content (str): Text to search.
+        source (str): Name of the searched file, used for logging.
 
     Returns:
-        bool: True if relevant references are found, False otherwise.
+        bool: True if a keyword is found, False otherwise.
     """
-    doc_files = [
-        'README.md',
-        'CONTRIBUTING.md',
-        'DEVELOPING.md'
-    ]
+    for keyword in DOC_KEYWORDS:
+        if re.search(r'\b' + re.escape(keyword) + r'\b', content, re.IGNORECASE):
+            logging.info(f"Keyword '{keyword}' found in {source}")
+            return True
+    return False
 
-    keywords = [
-        "Conventional Commits",
-        "Conventional Commit",
-        "Conventional Changelog",
-        "Commit Message Convention",
-        "Commit Guidelines",
-        "commitizen",
-        "commitlint",
-        "standard-version",
-        "semantic-release"
-    ]
 
-    # Check main documentation files
-    for doc_file in doc_files:
-        doc_path = local_path / doc_file
-        if doc_path.exists():
-            with open(doc_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                for keyword in keywords:
-                    if re.search(r'\b' + re.escape(keyword) + r'\b', content, re.IGNORECASE):
-                        logging.info(f"Keyword '{keyword}' found in {doc_file}")
-                        return True
+def check_wiki_for_cc(wiki_dir):
+    """
+    Searches the files of a cloned wiki for mentions of Conventional Commits.
 
-    # Check wiki for relevant references
-    wiki_dir = local_path / '.wiki'
+    Args:
+        wiki_dir (Path): Path to the cloned wiki.
+
+    Returns:
+        bool: True if relevant references are found, False otherwise.
+    """
     if wiki_dir.exists():
         for root, dirs, files in os.walk(wiki_dir):
             for file in files:
@@ -246,14 +402,33 @@ def check_docu_wiki_for_cc(local_path):
                     file_path = Path(root) / file
                     try:
                         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            for keyword in keywords:
-                                if re.search(r'\b' + re.escape(keyword) + r'\b', content, re.IGNORECASE):
-                                    logging.info(f"Keyword '{keyword}' found in Wiki file: {file_path}")
-                                    return True
+                            if find_cc_keyword(f.read(), f"Wiki file: {file_path}"):
+                                return True
                     except Exception as e:
                         logging.warning(f"Error reading file {file_path}: {e}")
     else:
         logging.debug("No wiki directory found. Skipping wiki check.")
 
     return False
+
+
+def check_docu_wiki_for_cc(local_path):
+    """
+    Searches documentation and wiki files for mentions of Conventional Commits.
+
+    Args:
+        local_path (Path): Path to the local repository.
+
+    Returns:
+        bool: True if relevant references are found, False otherwise.
+    """
+    # Check main documentation files
+    for doc_file in DOC_FILES:
+        doc_path = local_path / doc_file
+        if doc_path.exists():
+            with open(doc_path, 'r', encoding='utf-8', errors='ignore') as f:
+                if find_cc_keyword(f.read(), doc_file):
+                    return True
+
+    # Check wiki for relevant references
+    return check_wiki_for_cc(local_path / '.wiki')
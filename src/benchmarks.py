@@ -0,0 +1,359 @@
+# benchmarks.py
+# Standard library imports
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+# Third-party library imports
+import numpy as np
+
+# Local imports
+from change_point_detection import find_change_points
+from commit_loader import READ_CHUNK_SIZE, RECORD_SEPARATOR, parse_log_lines, parse_numstat_records
+from constants import COMMIT_ANALYSIS_RESULTS
+from commit_table import CommitTable
+from data_enricher import ADOPTION_COLUMNS, classify_commit_message, enrich_commit_table, enrich_commits
+from data_saver import (get_result_path, get_result_size, iter_repositories_data, load_all_repositories_data,
+                        save_result)
+from result_compression import zstandard
+
+AUTHORS = ["Alice", "Bob Smith", "Carol; Jr", "dependabot-bot", "Dan", "Eve"]
+SUBJECTS = ["feat(core): add option {i}", "fix: handle edge case {i}; again", "Update README.md",
+            "Merge pull request #{i} from fork/branch", "chore(deps): bump lib to 1.{i}", "wip {i}"]
+
+
+def synthetic_commits(n_commits, seed=42):
+    """
+    Generates random commits with header fields and per-file line counts.
+
+    Args:
+        n_commits (int): Number of commits to generate.
+        seed (int): Seed of the random generator.
+
+    Yields:
+        tuple: (hash, timestamp, author, subject, list of (added, deleted, path)).
+    """
+    rng = random.Random(seed)
+    for i in range(n_commits):
+        files = [(rng.randint(0, 200), rng.randint(0, 50), f"src/module{rng.randint(0, 99)}/file{j}.py")
+                 for j in range(rng.randint(1, 4))]
+        yield (f"{i:040x}", 1500000000 + i * 60, rng.choice(AUTHORS), rng.choice(SUBJECTS).format(i=i), files)
+
+
+def synthetic_shortstat_log(n_commits):
+    """
+    Renders synthetic commits as the output of 'git log --pretty=%H;%ct;%an;%s --shortstat'.
+
+    Returns:
+        list: Lines of the log output.
+    """
+    lines = []
+    for hexsha, timestamp, author, subject, files in synthetic_commits(n_commits):
+        insertions = sum(added for added, _, _ in files)
+        deletions = sum(deleted for _, deleted, _ in files)
+        lines.append(f"{hexsha};{timestamp};{author};{subject}")
+        lines.append("")
+        lines.append(f" {len(files)} files changed, {insertions} insertions(+), {deletions} deletions(-)")
+    return lines
+
+
+def synthetic_numstat_log(n_commits):
+    """
+    Renders synthetic commits as the output of 'git log -z --numstat --pretty=NUMSTAT_PRETTY'.
+
+    Returns:
+        bytes: The log output.
+    """
+    parts = []
+    for hexsha, timestamp, author, subject, files in synthetic_commits(n_commits):
+        parts.append(RECORD_SEPARATOR + f"{hexsha}\0{timestamp}\0{author}\0{subject}\0\0\n".encode())
+        parts.extend(f"{added}\t{deleted}\t{path}\0".encode() for added, deleted, path in files)
+    return b"".join(parts)
+
+
+def benchmark_log_parsers(n_commits=1_000_000):
+    """
+    Compares the shortstat line parser with the single-pass numstat parser on a synthetic history.
+
+    Args:
+        n_commits (int): Number of synthetic commits.
+    """
+    shortstat_lines = synthetic_shortstat_log(n_commits)
+    start = time.perf_counter()
+    shortstat_count = sum(1 for _ in parse_log_lines(shortstat_lines))
+    shortstat_seconds = time.perf_counter() - start
+    del shortstat_lines
+
+    numstat_output = synthetic_numstat_log(n_commits)
+    chunks = (numstat_output[i:i + READ_CHUNK_SIZE] for i in range(0, len(numstat_output), READ_CHUNK_SIZE))
+    start = time.perf_counter()
+    numstat_count = sum(1 for _ in parse_numstat_records(chunks))
+    numstat_seconds = time.perf_counter() - start
+
+    print(f"Log parsers on {n_commits} synthetic commits:")
+    print(f"  shortstat: {shortstat_count} commits in {shortstat_seconds:.2f}s "
+          f"({shortstat_count / shortstat_seconds:,.0f} commits/s)")
+    print(f"  numstat:   {numstat_count} commits in {numstat_seconds:.2f}s "
+          f"({numstat_count / numstat_seconds:,.0f} commits/s)")
+
+
+def legacy_classify_commit_message(message):
+    """
+    Classifies a commit message like enrich_commits did before the single-pass classifier: three parses with an
+    uncompiled pattern and a type list rebuilt on every call.
+    """
+    def parse(msg):
+        match = re.match(r"^([a-zA-Z]+)(?:\(([\w\-\.\s]+)\))?(!)?: (.+)", msg.lower())
+        return match.group(1) if match else None
+
+    def cc_types():
+        return ["feat", "fix", "docs", "style", "refactor", "perf", "test", "build", "ci", "chore", "revert"]
+
+    commit_type = parse(message)
+    is_cc = parse(message) in cc_types() if commit_type else False
+    custom_type = parse(message)
+    is_custom = custom_type is not None and custom_type not in cc_types()
+    if is_cc:
+        return commit_type, "cc"
+    if is_custom:
+        return commit_type, "custom"
+    return None, None
+
+
+def iter_corpus_messages():
+    """
+    Yields the commit messages of all saved results in COMMIT_ANALYSIS_RESULTS, one repository at a time.
+    """
+    for repo in iter_repositories_data(COMMIT_ANALYSIS_RESULTS, as_table=True, columns=['message']):
+        yield from repo['commits'].column('message') if 'message' in repo['commits'].keys else []
+
+
+def benchmark_classifier(n_commits=None):
+    """
+    Compares the three-pass legacy classification with the single-pass classifier and checks that both agree.
+
+    Runs on the messages of the saved results (the full corpus) unless a number of synthetic commits is given.
+
+    Args:
+        n_commits (int): Number of synthetic commits, or None to use the saved results.
+    """
+    if n_commits is None:
+        messages = list(iter_corpus_messages())
+        source = "corpus"
+    else:
+        messages = [subject for _, _, _, subject, _ in synthetic_commits(n_commits)]
+        source = "synthetic"
+
+    start = time.perf_counter()
+    legacy = [legacy_classify_commit_message(message) for message in messages]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single_pass = [classify_commit_message(message) for message in messages]
+    single_pass_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for (legacy_type, legacy_class), (commit_type, _, _, commit_class) in zip(legacy, single_pass)
+                     if legacy_class != commit_class or (legacy_class and legacy_type != commit_type))
+
+    print(f"Commit classifiers on {len(messages)} {source} commits ({mismatches} mismatches):")
+    print(f"  legacy:      {legacy_seconds:.2f}s ({len(messages) / legacy_seconds:,.0f} commits/s)")
+    print(f"  single-pass: {single_pass_seconds:.2f}s ({len(messages) / single_pass_seconds:,.0f} commits/s)")
+
+
+def benchmark_enrichment(n_commits=500_000):
+    """
+    Compares the per-commit enrichment of enrich_commits with the enrichment of a CommitTable by
+    enrich_commit_table, which the pipeline uses, and checks that both create the same summary.
+
+    Args:
+        n_commits (int): Number of synthetic commits.
+    """
+    commits = [{'committed_datetime': str(np.datetime64(timestamp, 's')), 'message': subject, 'author': author}
+               for _, timestamp, author, subject, _ in synthetic_commits(n_commits)]
+
+    start = time.perf_counter()
+    _, row_summary = enrich_commits(commits, {})
+    row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _, table_summary = enrich_commit_table(CommitTable.from_commits(commits), {})
+    table_seconds = time.perf_counter() - start
+
+    print(f"Enrichment of {n_commits} synthetic commits (same summary: {row_summary == table_summary}):")
+    print(f"  per commit:   {row_seconds:.2f}s ({n_commits / row_seconds:,.0f} commits/s)")
+    print(f"  commit table: {table_seconds:.2f}s ({n_commits / table_seconds:,.0f} commits/s)")
+
+
+def benchmark_change_points(n_commits=100_000, n_sequences=5):
+    """
+    Compares the ruptures Binseg engine with the prefix sum engine on synthetic CC sequences that switch from a low
+    to a high CC rate, and checks that both find the same change points.
+
+    Args:
+        n_commits (int): Length of each synthetic sequence.
+        n_sequences (int): Number of sequences.
+    """
+    rng = np.random.default_rng(42)
+    signals = []
+    for _ in range(n_sequences):
+        adoption = int(rng.integers(0, n_commits))
+        signals.append(np.concatenate([rng.random(adoption) < rng.random() * 0.3,
+                                       rng.random(n_commits - adoption) < 0.5 + rng.random() * 0.5]).astype(int))
+
+    timings = {}
+    change_points = {}
+    for engine in ("ruptures", "prefix_sum"):
+        start = time.perf_counter()
+        change_points[engine] = [find_change_points(signal, engine=engine) for signal in signals]
+        timings[engine] = time.perf_counter() - start
+
+    mismatches = sum(1 for expected, found in zip(change_points["ruptures"], change_points["prefix_sum"])
+                     if expected != found)
+    print(f"Change point detection on {n_sequences} sequences of {n_commits} commits ({mismatches} mismatches):")
+    print(f"  ruptures:   {timings['ruptures']:.2f}s")
+    print(f"  prefix sum: {timings['prefix_sum']:.4f}s")
+
+
+def benchmark_result_store(n_commits=200_000, n_repos=10):
+    """
+    Compares loading the saved results from JSON files and from the columnar store, all columns and only the
+    columns of the adoption analyses, and checks that both stores load the same commits.
+
+    Args:
+        n_commits (int): Number of synthetic commits per repository.
+        n_repos (int): Number of repositories.
+    """
+    commits = [{'hash': hexsha, 'committed_datetime': str(np.datetime64(timestamp, 's')), 'author': author,
+                'message': subject, 'insertions': sum(added for added, _, _ in files),
+                'deletions': sum(deleted for _, deleted, _ in files), 'files_changed': len(files)}
+               for hexsha, timestamp, author, subject, files in synthetic_commits(n_commits)]
+    table, enriched_summary = enrich_commit_table(CommitTable.from_commits(commits), {})
+
+    print(f"Loading {n_repos} results of {n_commits} synthetic commits:")
+    loaded = {}
+    with tempfile.TemporaryDirectory() as results_dir:
+        for store in ("json", "columnar"):
+            size = 0
+            for repo_id in range(n_repos):
+                summary = {**enriched_summary, 'id': repo_id}
+                path = save_result(table, summary, get_result_path(repo_id, results_dir, store))
+                size += get_result_size(path)
+
+            # Each store is read from its own directory so that the other store's results are not loaded
+            store_dir = os.path.join(results_dir, store)
+            os.mkdir(store_dir)
+            for repo_id in range(n_repos):
+                path = get_result_path(repo_id, results_dir, store)
+                os.rename(path, os.path.join(store_dir, os.path.basename(path)))
+
+            for label, selected in (("all columns", None), ("adoption columns", ADOPTION_COLUMNS)):
+                start = time.perf_counter()
+                repos = load_all_repositories_data(store_dir, as_table=True, columns=selected)
+                seconds = time.perf_counter() - start
+                loaded[store, label] = [repo['commits'].to_columns() for repo in repos]
+                print(f"  {store + ',':9} {label + ':':17} {seconds:.2f}s "
+                      f"({n_repos * n_commits / seconds:,.0f} commits/s, {size / 1e6:,.0f} MB on disk)")
+
+    mismatches = sum(1 for label in ("all columns", "adoption columns")
+                     if loaded["json", label] != loaded["columnar", label])
+    print(f"  {mismatches} mismatches")
+
+
+def benchmark_parallel_loading(n_commits=100_000, n_repos=16, workers=None):
+    """
+    Compares decoding JSON result files in one process with decoding them in a process pool and checks that both
+    return the same repositories in the same order.
+
+    Args:
+        n_commits (int): Number of synthetic commits per repository.
+        n_repos (int): Number of repositories.
+        workers (int): Number of decoding processes, one per CPU if None (PROCESS_WORKERS defaults to 1).
+    """
+    workers = workers or os.cpu_count()
+    commits = [{'hash': hexsha, 'committed_datetime': str(np.datetime64(timestamp, 's')), 'author': author,
+                'message': subject, 'files_changed': len(files)}
+               for hexsha, timestamp, author, subject, files in synthetic_commits(n_commits)]
+    table, enriched_summary = enrich_commit_table(CommitTable.from_commits(commits), {})
+
+    print(f"Decoding {n_repos} result files of {n_commits} synthetic commits:")
+    with tempfile.TemporaryDirectory() as results_dir:
+        for repo_id in range(n_repos):
+            summary = {**enriched_summary, 'id': repo_id}
+            save_result(table, summary, get_result_path(repo_id, results_dir, 'json'))
+        size = sum(get_result_size(get_result_path(repo_id, results_dir, 'json')) for repo_id in range(n_repos)) / 1e6
+
+        loaded = {}
+        for n_workers in sorted({1, workers}):
+            start = time.perf_counter()
+            repos = load_all_repositories_data(results_dir, as_table=True, workers=n_workers)
+            seconds = time.perf_counter() - start
+            loaded[n_workers] = [(repo['analysis_summary']['id'], repo['commits'].to_columns()) for repo in repos]
+            print(f"  {n_workers:2} processes: {seconds:.2f}s ({size / seconds:,.0f} MB/s of {size:,.0f} MB)")
+
+    print(f"  same order and commits: {loaded[1] == loaded[max(loaded)]}")
+
+
+def benchmark_compression(n_commits=200_000, n_repos=4):
+    """
+    Compares the size and decode throughput of uncompressed and compressed JSON results (zstd only if the
+    zstandard package is installed) and checks that all of them load the same commits.
+
+    Args:
+        n_commits (int): Number of synthetic commits per repository.
+        n_repos (int): Number of repositories.
+    """
+    commits = [{'hash': hexsha, 'committed_datetime': str(np.datetime64(timestamp, 's')), 'author': author,
+                'message': subject, 'insertions': sum(added for added, _, _ in files),
+                'deletions': sum(deleted for _, deleted, _ in files), 'files_changed': len(files)}
+               for hexsha, timestamp, author, subject, files in synthetic_commits(n_commits)]
+    table, enriched_summary = enrich_commit_table(CommitTable.from_commits(commits), {})
+    compressions = ["none", "gzip"] + (["zstd"] if zstandard is not None else [])
+
+    print(f"Loading {n_repos} JSON results of {n_commits} synthetic commits:")
+    loaded = {}
+    sizes = {}
+    for compression in compressions:
+        with tempfile.TemporaryDirectory() as results_dir:
+            start = time.perf_counter()
+            for repo_id in range(n_repos):
+                summary = {**enriched_summary, 'id': repo_id}
+                save_result(table, summary, get_result_path(repo_id, results_dir, 'json', compression))
+            write_seconds = time.perf_counter() - start
+            sizes[compression] = sum(get_result_size(get_result_path(repo_id, results_dir, 'json', compression))
+                                     for repo_id in range(n_repos)) / 1e6
+
+            start = time.perf_counter()
+            repos = load_all_repositories_data(results_dir, as_table=True)
+            seconds = time.perf_counter() - start
+            loaded[compression] = [repo['commits'].to_columns() for repo in repos]
+            ratio = sizes['none'] / sizes[compression]
+            print(f"  {compression + ':':5} {sizes[compression]:8,.1f} MB (ratio {ratio:4.1f}), written in "
+                  f"{write_seconds:.2f}s, decoded in {seconds:.2f}s ({sizes[compression] / seconds:,.0f} MB/s read, "
+                  f"{sizes['none'] / seconds:,.0f} MB/s of JSON)")
+
+    mismatches = sum(1 for compression in compressions if loaded[compression] != loaded["none"])
+    print(f"  {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    # Usage: benchmarks.py [parsers|classifier|enrichment|change_points|result_store|parallel_loading|compression]
+    #        [n_commits]
+    benchmark = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].isdigit() else "parsers"
+    arguments = [int(arg) for arg in sys.argv[1:] if arg.isdigit()]
+    if benchmark == "classifier":
+        benchmark_classifier(*arguments)
+    elif benchmark == "enrichment":
+        benchmark_enrichment(*arguments)
+    elif benchmark == "change_points":
+        benchmark_change_points(*arguments)
+    elif benchmark == "result_store":
+        benchmark_result_store(*arguments)
+    elif benchmark == "parallel_loading":
+        benchmark_parallel_loading(*arguments)
+    elif benchmark == "compression":
+        benchmark_compression(*arguments)
+    else:
+        benchmark_log_parsers(*arguments)
@@ -6,33 +6,72 @@ import matplotlib.pyplot as plt
 import numpy as np
 import ruptures as rpt
 import seaborn as sns
-from matplotlib.colors import ListedColormap
+from matplotlib.colors import LinearSegmentedColormap
 
 # Local module imports
-from constants import MIN_CC_RATE, MIN_COMMITS_AFTER_CP, PLOTS
+from constants import CHANGE_POINT_ENGINE, CHANGE_POINT_MODE, MIN_CC_RATE, MIN_COMMITS_AFTER_CP, PELT_PENALTY, PLOTS
 
+# Defaults of rpt.Binseg: minimum segment length and grid of admissible change points
+MIN_SEGMENT_SIZE = 2
+JUMP = 5
+# Relative gain difference below which candidates are compared with the cost computation of ruptures
+GAIN_TOLERANCE = 1e-9
+# Maximum number of tied candidates re-scored like ruptures; beyond it (e.g. constant signals) the latest one is taken
+MAX_RESCORED_TIES = 32
+# Heatmaps: maximum number of columns (longer sequences are binned) and resolution of the rasterized cells
+HEATMAP_COLUMNS = 1000
+HEATMAP_DPI = 300
 
-def plot_heatmap(sequence, change_point_index, adoption_date, repo_name):
+
+def bin_sequence(sequence, max_columns=HEATMAP_COLUMNS):
     """
-    Generates and saves a heatmap to visualize Conventional Commits adoption over time.
+    Bins a commit sequence into at most max_columns columns holding the CC fraction of their commits.
+
+    Args:
+        sequence (Sequence[int]): 1 for CC-type commits, 0 otherwise.
+        max_columns (int): Maximum number of columns.
+
+    Returns:
+        tuple: The CC fraction per column and the number of columns per commit (1.0 if the sequence is not binned).
+    """
+    sequence = np.asarray(sequence, dtype=np.float64)
+    if len(sequence) <= max_columns:
+        return sequence, 1.0
+    bin_starts = np.arange(max_columns) * len(sequence) // max_columns
+    columns = np.add.reduceat(sequence, bin_starts) / np.diff(np.append(bin_starts, len(sequence)))
+    return columns, max_columns / len(sequence)
+
+
+def render_heatmap(columns, change_point_x, adoption_date, repo_name):
+    """
+    Renders a (binned) CC sequence as rasterized heatmap and saves it as PDF.
+
+    Args:
+        columns (Sequence[float]): CC fraction per column, see bin_sequence.
+        change_point_x (float): Position of the change point in columns.
+        adoption_date (str): Adoption date to annotate.
+        repo_name (str): Name of the repository, used in the file name.
+
+    Returns:
+        str: Path of the saved plot.
     """
     # 1. Prepare data for the heatmap
-    heatmap_data = np.array(sequence).reshape(-1, 1)
-    sequence_size = len(sequence)
-    custom_cmap = ListedColormap(['#ffffff', '#121212'])
+    heatmap_data = np.asarray(columns).reshape(-1, 1)
+    sequence_size = len(columns)
+    custom_cmap = LinearSegmentedColormap.from_list('cc_fraction', ['#ffffff', '#121212'])
 
-    # 2. Plot the heatmap
+    # 2. Plot the heatmap; rasterized, so that the file size does not grow with the number of columns
     plt.figure(figsize=(6.202, 3.500))
-    sns.heatmap(heatmap_data.T, cmap=custom_cmap, cbar=False, linecolor='black')
+    sns.heatmap(heatmap_data.T, cmap=custom_cmap, vmin=0, vmax=1, cbar=False, linecolor='black', rasterized=True)
 
     # 3. Mark the change point
-    plt.axvline(x=change_point_index, color='red', linestyle='-', linewidth=2, label='Change Point')
+    plt.axvline(x=change_point_x, color='red', linestyle='-', linewidth=2, label='Change Point')
 
     # 4. Annotate the change point with the adoption date
     plt.annotate(
         f'Adoption Date\n{adoption_date}',
-        xy=(change_point_index, 0),
-        xytext=(change_point_index + sequence_size * 0.03, 0.6),
+        xy=(change_point_x, 0),
+        xytext=(change_point_x + sequence_size * 0.03, 0.6),
         fontsize=10,
         color='black',
         bbox=dict(boxstyle='round,pad=0.5', fc='white', ec='black')
@@ -44,8 +83,19 @@ def plot_heatmap(sequence, change_point_index, adoption_date, repo_name):
     # plt.xlabel('Commit Index', fontsize=12)
     # plt.ylabel('CC Compliance', fontsize=12)
     plt.yticks([0, 1], ['CC', 'Non-CC'])
-    plt.savefig(save_path)
+    plt.savefig(save_path, dpi=HEATMAP_DPI)
     plt.close()
+    return save_path
+
+
+def plot_heatmap(sequence, change_point_index, adoption_date, repo_name, max_columns=HEATMAP_COLUMNS):
+    """
+    Generates and saves a heatmap to visualize Conventional Commits adoption over time.
+
+    Sequences longer than max_columns are binned (see bin_sequence), so that long histories render quickly.
+    """
+    columns, scale = bin_sequence(sequence, max_columns)
+    return render_heatmap(columns, change_point_index * scale, adoption_date, repo_name)
 
 
 def is_repository_conventional_after_cp(commit_sequence_after_cp):
@@ -65,26 +115,420 @@ def is_repository_conventional_after_cp(commit_sequence_after_cp):
     return cc_rate_after_cp >= MIN_CC_RATE
 
 
-def binary_segmentation_date_analysis(enriched_commits):
+def detect_single_change_point(signal, min_size=MIN_SEGMENT_SIZE, jump=JUMP):
+    """
+    Finds the single change point of a binary signal that rpt.Binseg(model="l2").predict(n_bkps=1) finds, in
+    linear time from prefix sums.
+
+    The l2 cost of a segment with length l and k ones is k - k**2 / l, so the gain of splitting at b is
+    k1**2 / b + k2**2 / (n - b) - K**2 / n. Like Binseg, only multiples of 'jump' leaving 'min_size' commits on
+    both sides are candidates and ties go to the latest one. Exact ties are decided by rounding errors in ruptures,
+    so near-ties are re-scored with its variance-based cost to pick the same change point.
+
+    Args:
+        signal (Sequence[int]): 1 for CC-type commits, 0 otherwise.
+        min_size (int): Minimum segment length.
+        jump (int): Grid of admissible change points.
+
+    Returns:
+        list: [change point, len(signal)], or [len(signal)] if the signal is too short to be split.
+    """
+    n_samples = len(signal)
+    candidates = np.arange(0, n_samples, jump)
+    candidates = candidates[(candidates >= min_size) & (candidates <= n_samples - min_size)]
+    # Binseg refuses signals without room for one change point
+    if len(candidates) == 0 or min_size + -(-min_size // jump) * jump > n_samples:
+        return [n_samples]
+
+    prefix_sums = np.concatenate(([0], np.cumsum(signal, dtype=np.int64)))
+    ones_before = prefix_sums[candidates].astype(np.float64)
+    ones_after = prefix_sums[-1] - ones_before
+    scores = ones_before ** 2 / candidates + ones_after ** 2 / (n_samples - candidates)
+
+    best_score = scores.max()
+    near_best = candidates[scores >= best_score - GAIN_TOLERANCE * max(best_score, 1.0)]
+    if len(near_best) == 1 or len(near_best) > MAX_RESCORED_TIES:
+        return [int(near_best[-1]), n_samples]
+
+    # Same computation as CostL2.error and Binseg.single_bkp
+    column = np.asarray(signal).reshape(-1, 1)
+
+    def l2_cost(start, end):
+        return column[start:end].var(axis=0).sum() * (end - start)
+
+    total_cost = l2_cost(0, n_samples)
+    change_point = max((total_cost - l2_cost(0, bkp) - l2_cost(bkp, n_samples), int(bkp)) for bkp in near_best)[1]
+    return [change_point, n_samples]
+
+
+def find_change_points(signal, engine=CHANGE_POINT_ENGINE):
+    """
+    Finds the single change point of a binary signal with the given engine.
+
+    Args:
+        signal (np.ndarray): 1 for CC-type commits, 0 otherwise.
+        engine (str): 'prefix_sum' or 'ruptures'.
+
+    Returns:
+        list: Change point followed by the signal length, or only the signal length if none was found.
+    """
+    if engine == "ruptures":
+        # Configure the binary segmentation model with an l2 cost function
+        model = "l2"
+        algo = rpt.Binseg(model=model).fit(signal)
+        return algo.predict(n_bkps=1)  # 'n_bkps' = expected number of change points
+    return detect_single_change_point(signal)
+
+
+def pack_sequences(sequences):
+    """
+    Packs the CC sequences of many repositories into one flat array with offsets.
+
+    Args:
+        sequences (Iterable[Sequence[int]]): 1 for CC-type commits, 0 otherwise, per repository.
+
+    Returns:
+        tuple: The concatenated sequences (int8) and the offsets (int64) of the repositories; repository i spans
+        values[offsets[i]:offsets[i + 1]].
+    """
+    sequences = [np.asarray(sequence, dtype=np.int8) for sequence in sequences]
+    offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+    np.cumsum([len(sequence) for sequence in sequences], out=offsets[1:])
+    values = np.concatenate(sequences) if sequences else np.zeros(0, dtype=np.int8)
+    return values, offsets
+
+
+def detect_change_points_batch(values, offsets, min_size=MIN_SEGMENT_SIZE, jump=JUMP):
+    """
+    Finds the single change point of many packed binary sequences at once (see detect_single_change_point).
+
+    The gains of the candidates of all repositories are computed from one prefix sum; only repositories with
+    near-tied candidates are passed to detect_single_change_point.
+
+    Args:
+        values (np.ndarray): Concatenated sequences, see pack_sequences.
+        offsets (np.ndarray): Offsets of the repositories.
+        min_size (int): Minimum segment length.
+        jump (int): Grid of admissible change points.
+
+    Returns:
+        np.ndarray: Change point per repository relative to its sequence, -1 if it has none.
+    """
+    lengths = np.diff(offsets)
+    change_points = np.full(len(lengths), -1, dtype=np.int64)
+
+    # Candidates are the multiples of 'jump' in [first, lengths - min_size]
+    first = -(-min_size // jump) * jump
+    candidate_counts = np.where(lengths >= min_size + first, (lengths - min_size - first) // jump + 1, 0)
+    splittable = np.flatnonzero(candidate_counts)
+    if len(splittable) == 0:
+        return change_points
+
+    counts = candidate_counts[splittable]
+    segment_starts = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=segment_starts[1:])
+    candidate_owner = np.repeat(np.arange(len(counts)), counts)
+    candidates = first + jump * (np.arange(counts.sum()) - segment_starts[candidate_owner])
+
+    prefix_sums = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    starts = offsets[splittable][candidate_owner]
+    candidate_lengths = lengths[splittable][candidate_owner]
+    ones_before = (prefix_sums[starts + candidates] - prefix_sums[starts]).astype(np.float64)
+    ones_after = (prefix_sums[starts + candidate_lengths] - prefix_sums[starts]) - ones_before
+    scores = ones_before ** 2 / candidates + ones_after ** 2 / (candidate_lengths - candidates)
+
+    best_scores = np.maximum.reduceat(scores, segment_starts)
+    best_scores = best_scores[candidate_owner]
+    near_best = scores >= best_scores - GAIN_TOLERANCE * np.maximum(best_scores, 1.0)
+    # Ties go to the latest candidate
+    latest_near_best = np.maximum.reduceat(np.where(near_best, np.arange(len(scores)), -1), segment_starts)
+    change_points[splittable] = candidates[latest_near_best]
+
+    tie_counts = np.add.reduceat(near_best.astype(np.int64), segment_starts)
+    for index in np.flatnonzero((tie_counts > 1) & (tie_counts <= MAX_RESCORED_TIES)).tolist():
+        repo_index = splittable[index]
+        sequence = values[offsets[repo_index]:offsets[repo_index + 1]].astype(np.int64)
+        change_points[repo_index] = detect_single_change_point(sequence, min_size, jump)[0]
+    return change_points
+
+
+def evaluate_change_points_batch(values, offsets, change_points, min_commits_after_cp=MIN_COMMITS_AFTER_CP,
+                                 min_cc_rate=MIN_CC_RATE):
+    """
+    Applies is_repository_conventional_after_cp to the change points of many packed sequences at once.
+
+    Args:
+        values (np.ndarray): Concatenated sequences, see pack_sequences.
+        offsets (np.ndarray): Offsets of the repositories.
+        change_points (np.ndarray): Change point per repository, -1 if it has none.
+        min_commits_after_cp (int): Minimum number of commits after the change point.
+        min_cc_rate (float): Minimum CC rate after the change point.
+
+    Returns:
+        tuple: CC rate after the change point per repository (NaN without change point) and the adoption index per
+        repository (the change point if CC usage is consistent after it, -1 otherwise).
+    """
+    lengths = np.diff(offsets)
+    has_change_point = change_points >= 0
+    prefix_sums = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    ones = prefix_sums[offsets[1:]] - prefix_sums[offsets[:-1]]
+    ones_after = ones - (prefix_sums[offsets[:-1] + np.maximum(change_points, 0)] - prefix_sums[offsets[:-1]])
+    commits_after = lengths - change_points
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cc_rates_after_cp = np.where(has_change_point, ones_after / commits_after, np.nan)
+    adopted = (has_change_point & (ones > 0) & (commits_after >= min_commits_after_cp)
+               & (cc_rates_after_cp >= min_cc_rate))
+    adoption_indices = np.where(adopted, change_points, -1)
+    return cc_rates_after_cp, adoption_indices
+
+
+def detect_adoption_batch(sequences):
+    """
+    Detects the change points and adoption indices of the CC sequences of many repositories in one pass.
+
+    Args:
+        sequences (Iterable[Sequence[int]]): 1 for CC-type commits, 0 otherwise, oldest first, per repository.
+
+    Returns:
+        tuple: Change points, CC rates after the change points and adoption indices per repository (see
+        detect_change_points_batch and evaluate_change_points_batch).
+    """
+    values, offsets = pack_sequences(sequences)
+    change_points = detect_change_points_batch(values, offsets)
+    cc_rates_after_cp, adoption_indices = evaluate_change_points_batch(values, offsets, change_points)
+    return change_points, cc_rates_after_cp, adoption_indices
+
+
+class PeltSegmenter:
+    """
+    Penalized multi change point segmentation (PELT) of a binary CC sequence that can be extended with new commits.
+
+    The recursion is the one of rpt.Pelt(model="l2") with the same candidate grid: the optimal penalized cost of
+    every grid point is computed once from prefix sums, and candidates that can no longer start the last segment
+    are pruned. The work per commit is constant on average if change points occur throughout the history; long
+    stretches without one keep more candidates. Appending commits continues the recursion from the stored state;
+    the segmentation of the whole sequence is only completed on demand (see breakpoints).
+    """
+
+    def __init__(self, penalty=PELT_PENALTY, min_size=MIN_SEGMENT_SIZE, jump=JUMP):
+        self.penalty = penalty
+        self.min_size = min_size
+        self.jump = jump
+        self.n_samples = 0
+        self.ones = 0
+        # Grid points that may start the last segment (the first 'size' entries of the buffers): the ones before
+        # them, their optimal penalized costs and their optimal partitions as [[segment end, ones before end], ...]
+        self.size = 0
+        self.starts = np.zeros(16, dtype=np.int64)
+        self.ones_before = np.zeros(16, dtype=np.int64)
+        self.costs = np.zeros(16, dtype=np.float64)
+        self.partitions = np.empty(16, dtype=object)
+        # Recently processed grid points that are admitted later, as [grid point, ones before it, cost, partition]
+        self.recent = {0: [0, 0, 0.0, []]}
+
+    def admit(self, start, ones_before, cost, partition):
+        """
+        Adds a grid point to the points that may start the last segment.
+        """
+        if self.size == len(self.starts):
+            self.starts, self.ones_before, self.costs, self.partitions = (
+                np.concatenate((buffer, np.empty_like(buffer)))
+                for buffer in (self.starts, self.ones_before, self.costs, self.partitions))
+        self.starts[self.size] = start
+        self.ones_before[self.size] = ones_before
+        self.costs[self.size] = cost
+        self.partitions[self.size] = partition
+        self.size += 1
+
+    def candidate_totals(self, end, ones_before_end):
+        """
+        Returns the optimal penalized cost of signal[0:end] for every admissible start of its last segment.
+        """
+        ones = ones_before_end - self.ones_before[:self.size]
+        return self.costs[:self.size] + ((ones - ones * ones / (end - self.starts[:self.size])) + self.penalty)
+
+    def append(self, sequence):
+        """
+        Appends commits (1 = CC type, 0 otherwise, oldest first) and advances the recursion over all grid points
+        before the new end of the sequence.
+
+        Returns:
+            PeltSegmenter: self.
+        """
+        sequence = np.asarray(sequence, dtype=np.int64)
+        prefix_sums = self.ones + np.concatenate(([0], np.cumsum(sequence)))
+        start = self.n_samples
+        self.n_samples += len(sequence)
+        self.ones = int(prefix_sums[-1])
+
+        first = max(-(-start // self.jump) * self.jump, -(-self.min_size // self.jump) * self.jump)
+        for end in range(first, self.n_samples, self.jump):
+            ones_before_end = int(prefix_sums[end - start])
+            new_point = self.recent.get((end - self.min_size) // self.jump * self.jump)
+            if new_point is not None:
+                self.admit(*new_point)
+
+            totals = self.candidate_totals(end, ones_before_end)
+            best = int(np.argmin(totals))
+            best_cost = float(totals[best])
+            self.recent[end] = [end, ones_before_end, best_cost, self.partitions[best] + [[end, ones_before_end]]]
+
+            keep = totals <= best_cost + self.penalty
+            kept = int(np.count_nonzero(keep))
+            if kept < self.size:
+                for buffer in (self.starts, self.ones_before, self.costs, self.partitions):
+                    buffer[:kept] = buffer[:self.size][keep]
+                self.partitions[kept:self.size] = None
+                self.size = kept
+
+            # Later steps and the completion at n_samples > end only admit grid points from here on
+            oldest_admitted = (end + 1 - self.min_size) // self.jump * self.jump
+            for point in [point for point in self.recent if point < oldest_admitted]:
+                del self.recent[point]
+        return self
+
+    def segments(self):
+        """
+        Completes the segmentation of the whole sequence.
+
+        Returns:
+            list: [segment end, ones before end] per segment, the last one ending at n_samples. Empty if the sequence
+            is shorter than min_size (rpt.Pelt raises BadSegmentationParameters).
+        """
+        if self.n_samples < self.min_size:
+            return []
+        totals = self.candidate_totals(self.n_samples, self.ones)
+        partitions = list(self.partitions[:self.size])
+        new_point = self.recent.get((self.n_samples - self.min_size) // self.jump * self.jump)
+        if new_point is not None:
+            start, ones_before, cost, partition = new_point
+            ones = self.ones - ones_before
+            totals = np.append(totals, cost + ((ones - ones * ones / (self.n_samples - start)) + self.penalty))
+            partitions.append(partition)
+        return partitions[int(np.argmin(totals))] + [[self.n_samples, self.ones]]
+
+    def breakpoints(self):
+        """
+        Returns the change points followed by the sequence length, like rpt.Pelt(model="l2").predict(pen).
+        """
+        return [end for end, _ in self.segments()]
+
+    def adoption_index(self, min_commits_after_cp=MIN_COMMITS_AFTER_CP, min_cc_rate=MIN_CC_RATE):
+        """
+        Returns the start of the trailing segments whose CC rate reaches min_cc_rate if CC usage is consistent from
+        it on (see is_repository_conventional_after_cp), otherwise -1. Projects that adopted, abandoned and
+        re-adopted CC are dated at the re-adoption.
+        """
+        segments = self.segments()
+        adoption_start, adoption_ones = self.n_samples, self.ones
+        for (start, ones_before_start), (end, ones_before_end) in zip(([[0, 0]] + segments)[-2::-1],
+                                                                       segments[::-1]):
+            if (ones_before_end - ones_before_start) / (end - start) < min_cc_rate:
+                break
+            adoption_start, adoption_ones = start, ones_before_start
+
+        commits_after = self.n_samples - adoption_start
+        if (commits_after == 0 or self.ones == 0 or commits_after < min_commits_after_cp
+                or (self.ones - adoption_ones) / commits_after < min_cc_rate):
+            return -1
+        return adoption_start
+
+    def to_dict(self):
+        """
+        Returns the state as JSON-serializable dict, e.g. to store it in the analysis summary.
+        """
+        return {
+            'penalty': self.penalty,
+            'min_size': self.min_size,
+            'jump': self.jump,
+            'n_samples': self.n_samples,
+            'ones': self.ones,
+            'admissible': [[start, ones_before, cost, partition] for start, ones_before, cost, partition in
+                           zip(self.starts[:self.size].tolist(), self.ones_before[:self.size].tolist(),
+                               self.costs[:self.size].tolist(), self.partitions[:self.size])],
+            'recent': list(self.recent.values()),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Restores a segmenter from the output of to_dict.
+        """
+        segmenter = cls(state['penalty'], state['min_size'], state['jump'])
+        segmenter.n_samples = state['n_samples']
+        segmenter.ones = state['ones']
+        for entry in state['admissible']:
+            segmenter.admit(*entry)
+        segmenter.recent = {entry[0]: entry for entry in state['recent']}
+        return segmenter
+
+
+def binary_segmentation_date_analysis(enriched_commits, segmenter=None):
     """
     Performs binary segmentation on a commit sequence to detect the date of Conventional Commits adoption.
     """
-    adoption_date = None
     commits_reversed = enriched_commits[::-1]
 
-    if len(commits_reversed) == 0:
-        return adoption_date
-
     # Create a binary sequence from the commits (1 = CC, 0 = Non-CC)
     commit_sequence = [1 if commit.get("cc_type") else 0 for commit in commits_reversed]
+    commit_dates = [commit.get('committed_datetime') for commit in commits_reversed]
+    return detect_adoption_date(commit_sequence, commit_dates, segmenter)
+
+
+def detect_adoption_date_multi(commit_sequence, commit_dates, segmenter=None):
+    """
+    Detects the date of Conventional Commits adoption with multiple change points (see PeltSegmenter).
+
+    Args:
+        commit_sequence (Sequence[int]): 1 for CC-type commits, 0 otherwise, oldest first.
+        commit_dates (Sequence[str]): ISO commit dates in the same order.
+        segmenter (PeltSegmenter): Segmenter that already holds the oldest commits of the sequence, e.g. restored
+            from the previous analysis; only the remaining commits are appended. A new one is used if None.
+
+    Returns:
+        str: Adoption date ('YYYY-MM-DD') or None if no consistent adoption was found.
+    """
+    if segmenter is None:
+        segmenter = PeltSegmenter()
+    segmenter.append(commit_sequence[segmenter.n_samples:])
+    logging.info(f"Found change points: {segmenter.breakpoints()}")
+
+    adoption_index = segmenter.adoption_index()
+    if adoption_index < 0:
+        logging.info("No consistent CC usage after the change points.")
+        return None
+    adoption_date = commit_dates[adoption_index][:10]
+    logging.info(f"CC usage became consistent from {adoption_date}.")
+    return adoption_date
+
+
+def detect_adoption_date(commit_sequence, commit_dates, segmenter=None):
+    """
+    Detects the date of Conventional Commits adoption in a binary commit sequence.
+
+    Args:
+        commit_sequence (Sequence[int]): 1 for CC-type commits, 0 otherwise, oldest first.
+        commit_dates (Sequence[str]): ISO commit dates in the same order.
+        segmenter (PeltSegmenter): Continued segmentation in CHANGE_POINT_MODE 'multi' (see
+            detect_adoption_date_multi); unused with a single change point.
+
+    Returns:
+        str: Adoption date ('YYYY-MM-DD') or None if no consistent adoption was found.
+    """
+    if CHANGE_POINT_MODE == "multi":
+        return detect_adoption_date_multi(commit_sequence, commit_dates, segmenter)
+
+    adoption_date = None
+
+    if len(commit_sequence) == 0:
+        return adoption_date
+
     length = sum(commit_sequence)
 
     signal = np.array(commit_sequence)
 
-    # Configure the binary segmentation model with an l2 cost function
-    model = "l2"
-    algo = rpt.Binseg(model=model).fit(signal)
-    change_points = algo.predict(n_bkps=1)  # 'n_bkps' = expected number of change points
+    change_points = find_change_points(signal)
 
     logging.info(f"Found change points: {change_points}")
 
@@ -93,8 +537,7 @@ def binary_segmentation_date_analysis(enriched_commits):
         change_point_index = change_points[0]
         commit_sequence_after_cp = commit_sequence[change_point_index:]
         if is_repository_conventional_after_cp(commit_sequence_after_cp):
-            change_point_commit = commits_reversed[change_point_index]
-            adoption_date = change_point_commit.get('committed_datetime')[:10]
+            adoption_date = commit_dates[change_point_index][:10]
             # Debugging:plot_heatmap(commit_sequence, change_point_index, adoption_date, 'AUTOGPT')
             logging.info(f"CC usage became consistent from {adoption_date}.")
             return adoption_date
@@ -0,0 +1,142 @@
+# columnar_store.py
+# Standard library imports
+import json
+import os
+import shutil
+from pathlib import Path
+
+# Third-party library imports
+import numpy as np
+
+# Local imports
+from commit_table import CLASSIFICATION_KEYS, STAT_KEYS, CommitTable
+
+# Array files of a repository directory and the commit keys they hold
+ARRAY_FILES = {
+    'timestamps': ('committed_datetime',),
+    **{key: (key,) for key in STAT_KEYS},
+    'author_codes': ('author',),
+    'message_codes': ('message',),
+    'hashes': ('hash',),
+    'type_codes': CLASSIFICATION_KEYS,
+    'type_classes': CLASSIFICATION_KEYS,
+}
+# Dictionary-encoded strings (JSON lists) and the commit keys they hold
+POOL_FILES = {
+    'author_pool': ('author',),
+    'message_pool': ('message',),
+    'type_pool': CLASSIFICATION_KEYS,
+}
+# Commit keys without a dedicated file are kept in EXTRA_FILE
+FILE_KEYS = {key for holds in (*ARRAY_FILES.values(), *POOL_FILES.values()) for key in holds}
+SUMMARY_FILE = "summary.json"
+EXTRA_FILE = "extra.json"
+
+
+def is_repository_dir(path):
+    """
+    Checks whether a path is the directory of a repository saved with save_table.
+    """
+    return (Path(path) / SUMMARY_FILE).is_file()
+
+
+def save_table(table, summary, repo_dir):
+    """
+    Saves the enriched commits of a repository as one .npy file per array and its summary as JSON.
+
+    The files are written to a temporary directory that replaces the previous result, so readers never see a
+    partially written repository.
+
+    Args:
+        table (CommitTable): The enriched commits.
+        summary (dict): The analysis summary.
+        repo_dir (Path): Directory of the repository.
+    """
+    repo_dir = Path(repo_dir)
+    tmp_dir = repo_dir.with_name(repo_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    arrays = {'timestamps': table.timestamps, **table.stats, 'author_codes': table.author_codes,
+              'message_codes': table.message_codes, 'hashes': table.hashes, 'type_codes': table.type_codes,
+              'type_classes': table.type_classes}
+    for name, array in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", array)
+    for name in POOL_FILES:
+        with open(tmp_dir / f"{name}.json", 'w', encoding='utf-8') as f:
+            json.dump(getattr(table, name), f)
+    with open(tmp_dir / EXTRA_FILE, 'w', encoding='utf-8') as f:
+        json.dump(table.extra, f)
+    with open(tmp_dir / SUMMARY_FILE, 'w', encoding='utf-8') as f:
+        json.dump({
+            "keys": table.keys,
+            "size": len(table),
+            "custom_types": list(summary['custom_type_distribution'].keys()),
+            "cc_types": list(summary['cc_type_distribution'].keys()),
+            "analysis_summary": summary
+        }, f)
+
+    old_dir = repo_dir.with_name(repo_dir.name + ".old")
+    if repo_dir.exists():
+        os.replace(repo_dir, old_dir)
+    os.replace(tmp_dir, repo_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def load_summary(repo_dir):
+    """
+    Loads the summary file of a repository directory (keys, size, types and analysis summary).
+    """
+    with open(Path(repo_dir) / SUMMARY_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_table(repo_dir, columns=None):
+    """
+    Loads a repository saved with save_table, reading only the files of the requested commit keys.
+
+    Args:
+        repo_dir (Path): Directory of the repository.
+        columns (Iterable[str]): Commit keys to load, all if None.
+
+    Returns:
+        dict: Repository data like load_repository_data with as_table=True ('commits' is a CommitTable).
+    """
+    repo_dir = Path(repo_dir)
+    data = load_summary(repo_dir)
+    keys = data.pop("keys")
+    size = data.pop("size")
+    if columns is not None:
+        columns = set(columns)
+        # The classification keys share their files, so they are loaded together like in CommitTable.from_columns
+        if columns & set(CLASSIFICATION_KEYS):
+            columns |= set(CLASSIFICATION_KEYS)
+        keys = [key for key in keys if key in columns]
+
+    table = CommitTable(keys, size)
+    for name, holds in ARRAY_FILES.items():
+        if any(key in keys for key in holds):
+            array = np.load(repo_dir / f"{name}.npy")
+            if name in STAT_KEYS:
+                table.stats[name] = array
+            else:
+                setattr(table, name, array)
+    for name, holds in POOL_FILES.items():
+        if any(key in keys for key in holds):
+            with open(repo_dir / f"{name}.json", 'r', encoding='utf-8') as f:
+                setattr(table, name, json.load(f))
+    if any(key not in FILE_KEYS for key in keys):
+        with open(repo_dir / EXTRA_FILE, 'r', encoding='utf-8') as f:
+            table.extra = {key: values for key, values in json.load(f).items() if key in keys}
+
+    data['commits'] = table
+    return data
+
+
+def list_repository_dirs(results_dir):
+    """
+    Returns the names (repository IDs) of the repository directories in a results directory.
+    """
+    # Skips the temporary directories of save_table ('<id>.tmp', '<id>.old')
+    return [entry.name for entry in os.scandir(results_dir)
+            if entry.is_dir() and '.' not in entry.name and is_repository_dir(entry.path)]
@@ -1,10 +1,39 @@
 # commit_loader.py
+import gzip
+import io
+import json
 import logging
 import re
 
 from git import GitCommandError
 import datetime
 
+from commit_table import CommitTable
+from constants import COMMIT_LOGS, LOG_FORMAT
+
+BOT_NAMES = [
+    'travis-ci',
+    'coveralls',
+    'appveyor',
+    'hubot',
+    'circleci',
+    'waffle.io',
+    'gitter-badger',
+    'gitlab-ci',
+    'scrutinizer-auto-fixer',
+]
+# Reguläre Ausdrücke für typische Bot-Muster
+BOT_PATTERN = re.compile(r'([\W\d_]bot$|^bot[\W\d_]|[\W\d_]bot[\W\d])', re.IGNORECASE)
+
+# Record layout of the 'numstat' log format: every commit starts with an ASCII record separator followed by
+# NUL-terminated header fields; with -z the numstat entries that follow are NUL-terminated as well
+RECORD_SEPARATOR = b"\x1e"
+NUMSTAT_PRETTY = "format:%x1e%H%x00%ct%x00%an%x00%s%x00"
+READ_CHUNK_SIZE = 1 << 20
+
+# Keys of the commit data produced by the loaders, in their order
+COMMIT_KEYS = ('hash', 'committed_datetime', 'message', 'author', 'insertions', 'deletions', 'files_changed')
+
 
 # Running BIMAN https://github.com/ssc-oscar/BIMAN_bot_detection
 # Running BIN (name based detection) approach:
@@ -18,26 +47,12 @@ def is_bot(author_name):
     Returns:
         bool: True, wenn der Autor ein Bot ist, sonst False.
     """
-    bot_list = [
-        'travis-ci',
-        'coveralls',
-        'appveyor',
-        'Hubot',
-        'circleci',
-        'waffle.io',
-        'gitter-badger',
-        'gitlab-ci',
-        'scrutinizer-auto-fixer',
-    ]
-
     lower_name = author_name.lower()
-    for bot_name in bot_list:
-        if bot_name.lower() in lower_name:
+    for bot_name in BOT_NAMES:
+        if bot_name in lower_name:
             return True
 
-    # Reguläre Ausdrücke für typische Bot-Muster
-    pattern = re.compile(r'([\W\d_]bot$|^bot[\W\d_]|[\W\d_]bot[\W\d])', re.IGNORECASE)
-    return bool(pattern.search(author_name))
+    return bool(BOT_PATTERN.search(author_name))
 
 
 def load_commits(repo):
@@ -50,61 +65,335 @@ def load_commits(repo):
     Returns:
         list: Liste von Commit-Daten.
     """
-    commits = []
+    return list(iter_commits(repo))
+
+
+def load_commit_table(repo, log_format=LOG_FORMAT):
+    """
+    Loads the commits of a repository into a compact CommitTable.
+
+    Args:
+        repo (Repo): GitPython repository object.
+        log_format (str): Format of the parsed log, see iter_commits.
+
+    Returns:
+        CommitTable: The commits, newest first.
+    """
+    return CommitTable.from_commits(iter_commits(repo, log_format=log_format))
+
+
+def iter_commits(repo, log_format=LOG_FORMAT, revision_range=None):
+    """
+    Streams commit data from a repository.
+
+    The output of 'git log' is read incrementally from the subprocess pipe and each commit is yielded as soon as
+    its stats have been parsed, so memory stays flat regardless of the history length and consumers can
+    start before the log finishes. Consumers that stop early should close the generator, which kills git.
+
+    Args:
+        repo (Repo): GitPython repository object.
+        log_format (str): 'shortstat' parses semicolon-separated headers and '--shortstat' lines,
+            'numstat' parses NUL-delimited records with '--numstat -z' (robust against any subject or author),
+            'messages' loads hash, time, author and subject only; diff stats are computed later on demand
+            (see diff_stats.attach_diff_stats). All formats skip merge, empty and bot commits.
+        revision_range (str): Optional range such as '<old>..<new>' to load only part of the history;
+            defaults to the whole default branch.
+
+    Yields:
+        dict: Commit data.
+    """
     try:
         default_branch = repo.active_branch.name
     except (TypeError, AttributeError):
         default_branch = "HEAD"
+    if revision_range:
+        default_branch = revision_range
 
+    process = None
     try:
-        git_log_output = repo.git.log(
-            default_branch,
-            pretty="%H;%ct;%an;%s",
-            shortstat=True
-        )
-
-        lines = git_log_output.split('\n')
-        current_commit = None
-
-        stats_regex = re.compile(r"(\d+) files? changed(, (\d+) insertions?\(\+\))?(, (\d+) deletions?\(-\))?")
-
-        for line in lines:
-            if ';' in line:
-                parts = line.strip().split(';')
-                if len(parts) >= 4:
-                    timestamp = int(parts[1])
-                    committed_datetime = datetime.datetime.utcfromtimestamp(timestamp).isoformat()
-                    author = parts[2]
-                    message = parts[3]
-
-                    current_commit = {
-                        'committed_datetime': committed_datetime,
-                        'message': message.strip(),
-                        'author': author.strip(),
-                        'insertions': 0,
-                        'deletions': 0,
-                        'files_changed': 0
-                    }
-            elif line.strip() and current_commit:
-                match = stats_regex.search(line.strip())
-                if match:
-                    files_changed = int(match.group(1)) if match.group(1) else 0
-                    insertions = int(match.group(3)) if match.group(3) else 0
-                    deletions = int(match.group(5)) if match.group(5) else 0
-                    current_commit['insertions'] += insertions
-                    current_commit['deletions'] += deletions
-                    current_commit['files_changed'] += files_changed
-
-                    if is_bot(author):
-                        logging.debug(
-                            f"Überspringe Bot-Commit von {author}: {message}, files_changed: {files_changed},"
-                            f"insertions: {insertions}, deletions: {deletions}")
-                        continue
-
-                    if current_commit['files_changed'] > 0:
-                        commits.append(current_commit)
-                    current_commit = None
-        return commits
+        if log_format == "numstat":
+            process = repo.git.log(
+                default_branch,
+                pretty=NUMSTAT_PRETTY,
+                numstat=True,
+                z=True,
+                as_process=True
+            )
+            chunks = iter(lambda: process.stdout.read(READ_CHUNK_SIZE), b"")
+            yield from parse_numstat_records(chunks)
+        elif log_format == "messages":
+            # Without stats merge and empty commits cannot be recognized by their missing diff, so exclude them
+            # explicitly like the other formats: merges with --no-merges, and empty commits by limiting the history
+            # to the whole tree ('-- .'), which drops commits with the same tree as their parent. --full-history
+            # keeps the side branches that history simplification would prune.
+            process = repo.git.log(
+                default_branch,
+                "--",
+                ".",
+                pretty=NUMSTAT_PRETTY,
+                no_merges=True,
+                full_history=True,
+                z=True,
+                as_process=True
+            )
+            chunks = iter(lambda: process.stdout.read(READ_CHUNK_SIZE), b"")
+            yield from parse_message_records(chunks)
+        else:
+            process = repo.git.log(
+                default_branch,
+                pretty="%H;%ct;%an;%s",
+                shortstat=True,
+                as_process=True
+            )
+            lines = io.TextIOWrapper(process.stdout, encoding="utf-8", errors="replace")
+            yield from parse_log_lines(lines)
+        # Raises GitCommandError if git exited with an error
+        process.wait()
     except GitCommandError as e:
         logging.error(f"Fehler beim Laden der Commits: {e}")
-        return []
+    finally:
+        # Kills and reaps git if the consumer stopped early (e.g. closed the generator) or parsing failed
+        if process is not None and process.proc is not None and process.proc.poll() is None:
+            process.proc.kill()
+            process.proc.wait()
+
+
+def parse_log_lines(lines):
+    """
+    Parses the lines of 'git log --pretty=%H;%ct;%an;%s --shortstat' into commit data.
+
+    Args:
+        lines (Iterable[str]): Lines of the log output.
+
+    Yields:
+        dict: Commit data; bot commits and commits without changed files are skipped.
+    """
+    current_commit = None
+    author = None
+
+    stats_regex = re.compile(r"(\d+) files? changed(, (\d+) insertions?\(\+\))?(, (\d+) deletions?\(-\))?")
+
+    for line in lines:
+        if ';' in line:
+            parts = line.strip().split(';')
+            if len(parts) >= 4:
+                timestamp = int(parts[1])
+                committed_datetime = datetime.datetime.utcfromtimestamp(timestamp).isoformat()
+                author = parts[2]
+                message = parts[3]
+
+                current_commit = {
+                    'committed_datetime': committed_datetime,
+                    'message': message.strip(),
+                    'author': author.strip(),
+                    'insertions': 0,
+                    'deletions': 0,
+                    'files_changed': 0
+                }
+        elif line.strip() and current_commit:
+            match = stats_regex.search(line.strip())
+            if match:
+                files_changed = int(match.group(1)) if match.group(1) else 0
+                insertions = int(match.group(3)) if match.group(3) else 0
+                deletions = int(match.group(5)) if match.group(5) else 0
+                current_commit['insertions'] += insertions
+                current_commit['deletions'] += deletions
+                current_commit['files_changed'] += files_changed
+
+                if is_bot(author):
+                    logging.debug(
+                        f"Überspringe Bot-Commit von {author}: {current_commit['message']}, "
+                        f"files_changed: {files_changed}, insertions: {insertions}, deletions: {deletions}")
+                    continue
+
+                if current_commit['files_changed'] > 0:
+                    yield current_commit
+                current_commit = None
+
+
+def iter_records(chunks):
+    """
+    Splits consecutive pieces of log output into the records of the NUL-delimited log formats.
+
+    Args:
+        chunks (Iterable[bytes]): Consecutive pieces of the log output.
+
+    Yields:
+        bytes: Records without their leading separator.
+    """
+    buffer = b""
+    for chunk in chunks:
+        records = (buffer + chunk).split(RECORD_SEPARATOR)
+        buffer = records.pop()
+        yield from records
+    yield buffer
+
+
+def parse_numstat_records(chunks):
+    """
+    Parses the output of 'git log -z --numstat --pretty=NUMSTAT_PRETTY' in a single pass.
+
+    Chunks are split on the record separator and every record is split on NUL bytes; the stats are summed
+    from the numstat fields without any regular expression. Only the header fields are decoded.
+
+    Args:
+        chunks (Iterable[bytes]): Consecutive pieces of the log output.
+
+    Yields:
+        dict: Commit data; bot commits and commits without changed files are skipped.
+    """
+    bot_authors = {}
+    for record in iter_records(chunks):
+        commit = parse_numstat_record(record, bot_authors)
+        if commit:
+            yield commit
+
+
+def parse_message_records(chunks):
+    """
+    Parses the output of 'git log -z --pretty=NUMSTAT_PRETTY' without stats.
+
+    Args:
+        chunks (Iterable[bytes]): Consecutive pieces of the log output.
+
+    Yields:
+        dict: Commit data with the commit hash instead of diff stats; bot commits are skipped.
+    """
+    bot_authors = {}
+    for record in iter_records(chunks):
+        fields = record.split(b"\0")
+        if len(fields) < 4:
+            continue
+        author = fields[2].decode("utf-8", errors="replace")
+        if author not in bot_authors:
+            bot_authors[author] = is_bot(author)
+        if bot_authors[author]:
+            continue
+        yield {
+            'hash': fields[0].decode("ascii"),
+            'committed_datetime': datetime.datetime.utcfromtimestamp(int(fields[1])).isoformat(),
+            'message': fields[3].decode("utf-8", errors="replace").strip(),
+            'author': author.strip()
+        }
+
+
+def parse_numstat_fields(fields):
+    """
+    Sums the numstat entries of a commit record.
+
+    Args:
+        fields (list): NUL-separated fields following the header of a record.
+
+    Returns:
+        tuple: (files_changed, insertions, deletions).
+    """
+    files_changed = 0
+    insertions = 0
+    deletions = 0
+    skip = 0
+    for field in fields:
+        if skip:
+            # Source and destination path of a rename
+            skip -= 1
+            continue
+        added, tab, rest = field.lstrip(b"\n").partition(b"\t")
+        if not tab:
+            continue
+        deleted, _, path = rest.partition(b"\t")
+        files_changed += 1
+        if added != b"-":  # binary files have no line counts
+            insertions += int(added)
+            deletions += int(deleted)
+        if not path:
+            skip = 2
+    return files_changed, insertions, deletions
+
+
+def parse_numstat_record(record, bot_authors):
+    """
+    Parses a single commit record of the 'numstat' log format.
+
+    Args:
+        record (bytes): The record without its leading separator.
+        bot_authors (dict): Cache of is_bot results per author name.
+
+    Returns:
+        dict: Commit data, or None for incomplete, bot and empty commits.
+    """
+    fields = record.split(b"\0")
+    if len(fields) < 4:
+        return None
+
+    files_changed, insertions, deletions = parse_numstat_fields(fields[4:])
+    if files_changed == 0:
+        return None
+
+    author = fields[2].decode("utf-8", errors="replace")
+    if author not in bot_authors:
+        bot_authors[author] = is_bot(author)
+    if bot_authors[author]:
+        return None
+
+    return {
+        'committed_datetime': datetime.datetime.utcfromtimestamp(int(fields[1])).isoformat(),
+        'message': fields[3].decode("utf-8", errors="replace").strip(),
+        'author': author.strip(),
+        'insertions': insertions,
+        'deletions': deletions,
+        'files_changed': files_changed
+    }
+
+
+def save_commit_log(commits, repo_id, head_sha, cc_indication):
+    """
+    Saves a compact copy of the loaded commits of a repository, so it can be re-analyzed without its clone.
+
+    The commit data is stored column-wise (every key once) in a gzip-compressed JSON file; keys added by the
+    enrichment are dropped.
+
+    Args:
+        commits (list or CommitTable): Loaded or enriched commits.
+        repo_id (int): ID of the repository.
+        head_sha (str): Hash of the analyzed head.
+        cc_indication (bool): Result of the CC indicator search, which needs the repository files.
+    """
+    keys = [key for key in COMMIT_KEYS if len(commits) and key in commits[0]]
+    if isinstance(commits, CommitTable):
+        columns = {key: commits.column(key) for key in keys}
+    else:
+        columns = {key: [commit.get(key) for commit in commits] for key in keys}
+    commit_log = {
+        'head_sha': head_sha,
+        'cc_indication': cc_indication,
+        'commits': columns
+    }
+    COMMIT_LOGS.mkdir(parents=True, exist_ok=True)
+    with gzip.open(get_commit_log_path(repo_id), 'wt', encoding='utf-8') as f:
+        json.dump(commit_log, f)
+
+
+def get_commit_log_path(repo_id):
+    """
+    Returns the path of the compact commit log of a repository.
+    """
+    return COMMIT_LOGS / f"{repo_id}.json.gz"
+
+
+def load_commit_log(repo_id):
+    """
+    Loads the compact commit log of a repository saved by save_commit_log.
+
+    Args:
+        repo_id (int): ID of the repository.
+
+    Returns:
+        dict: 'head_sha', 'cc_indication' and the list of 'commits', or None if no commit log exists.
+    """
+    log_file = get_commit_log_path(repo_id)
+    if not log_file.is_file():
+        return None
+    with gzip.open(log_file, 'rt', encoding='utf-8') as f:
+        commit_log = json.load(f)
+    columns = commit_log['commits']
+    commit_log['commits'] = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    return commit_log
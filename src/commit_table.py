@@ -0,0 +1,387 @@
+# commit_table.py
+# Standard library imports
+import sys
+from itertools import chain
+from operator import itemgetter
+
+# Third-party library imports
+import numpy as np
+import pandas as pd
+
+# Classes stored in CommitTable.type_classes
+UNCONVENTIONAL = 0
+CC_TYPE = 1
+CUSTOM_TYPE = 2
+
+STAT_KEYS = ('insertions', 'deletions', 'files_changed')
+CLASSIFICATION_KEYS = ('is_conventional', 'cc_type', 'custom_type')
+HASH_BYTES = 20
+
+
+class CommitTable:
+    """
+    Compact, array-backed storage of commits.
+
+    Instead of a dict per commit, every field is kept in a typed array: commit times as datetime64, diff stats as
+    int32 (-1 if unknown), commit types as codes into a type pool with their class (UNCONVENTIONAL, CC_TYPE or
+    CUSTOM_TYPE), and authors and messages as codes into pools that store every distinct string once. Hashes are
+    stored as 20 raw bytes. Fields without a dedicated column are kept as plain lists.
+
+    Rows are exposed as CommitRow views that behave like the commit dicts, so code written for lists of commit
+    dicts (iteration, len, indexing, commit.get(...)) works unchanged.
+    """
+
+    def __init__(self, keys, size):
+        self.keys = list(keys)
+        self.size = size
+        self.timestamps = np.zeros(size, dtype='datetime64[s]')
+        self.stats = {key: np.full(size, -1, dtype=np.int32) for key in STAT_KEYS}
+        self.type_codes = np.full(size, -1, dtype=np.int32)
+        self.type_classes = np.zeros(size, dtype=np.int8)
+        self.type_pool = []
+        self.author_codes = np.zeros(size, dtype=np.int32)
+        self.author_pool = []
+        self.message_codes = np.zeros(size, dtype=np.int32)
+        self.message_pool = []
+        self.hashes = np.zeros((size, HASH_BYTES), dtype=np.uint8)
+        self.extra = {}
+
+    @classmethod
+    def from_commits(cls, commits):
+        """
+        Builds a table from commit dicts, e.g. the commits streamed by commit_loader.iter_commits or the enriched
+        commits of a saved result. The table has the keys of all commits in order of their first occurrence; commits
+        without a key hold None (see from_columns).
+
+        Args:
+            commits (Iterable[dict]): The commits.
+
+        Returns:
+            CommitTable: The table.
+        """
+        if isinstance(commits, list):
+            return cls.from_columns({key: get_column(commits, key) for key in get_keys(commits)})
+
+        # Streamed commits are collected column-wise so that their dicts can be freed right away
+        columns = {}
+        keys = columns.keys()
+        appenders = []
+        for size, commit in enumerate(commits):
+            if commit.keys() != keys:
+                for key in [key for key in commit if key not in columns]:
+                    columns[key] = [None] * size
+                    appenders.append((key, columns[key].append))
+            for key, append in appenders:
+                append(commit.get(key))
+        if not columns:
+            return cls([], 0)
+        return cls.from_columns(columns)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Builds a table from columns such as the columns of a saved JSON result (see data_saver.load_repository_data).
+
+        Args:
+            columns (dict): Lists of equal length by commit key.
+
+        Returns:
+            CommitTable: The table.
+        """
+        size = len(next(iter(columns.values()), []))
+        table = cls(columns, size)
+        for key, values in columns.items():
+            if key == 'committed_datetime':
+                table.timestamps = np.array(values, dtype='datetime64[s]')
+            elif key in STAT_KEYS:
+                table.stats[key] = np.array([-1 if value is None else value for value in values], dtype=np.int32)
+            elif key == 'author':
+                table.author_codes, table.author_pool = intern_strings(values)
+            elif key == 'message':
+                table.message_codes, table.message_pool = intern_strings(values)
+            elif key == 'hash':
+                # Missing hashes are stored as zero bytes
+                table.hashes = np.frombuffer(b"".join(bytes.fromhex(value) if value else bytes(HASH_BYTES)
+                                                      for value in values),
+                                             dtype=np.uint8).reshape(size, HASH_BYTES).copy()
+            elif key not in CLASSIFICATION_KEYS:
+                table.extra[key] = list(values)
+
+        if 'cc_type' in columns or 'custom_type' in columns:
+            cc_types = columns.get('cc_type', [None] * size)
+            custom_types = columns.get('custom_type', [None] * size)
+            types = [cc_type or custom_type for cc_type, custom_type in zip(cc_types, custom_types)]
+            type_codes, type_pool = intern_strings(types)
+            table.set_classification(type_codes, type_pool, [
+                CC_TYPE if cc_type else CUSTOM_TYPE if custom_type else UNCONVENTIONAL
+                for cc_type, custom_type in zip(cc_types, custom_types)])
+        return table
+
+    @classmethod
+    def concat(cls, tables):
+        """
+        Concatenates tables with the same keys into a new table.
+        """
+        tables = [table for table in tables if len(table)]
+        if not tables:
+            return cls([], 0)
+        table = cls(tables[0].keys, sum(len(part) for part in tables))
+        table.timestamps = np.concatenate([part.timestamps for part in tables])
+        table.stats = {key: np.concatenate([part.stats[key] for part in tables]) for key in STAT_KEYS}
+        table.hashes = np.concatenate([part.hashes for part in tables])
+        for codes, pool in (('author_codes', 'author_pool'), ('message_codes', 'message_pool'),
+                            ('type_codes', 'type_pool')):
+            merged_codes, merged_pool = merge_pools([getattr(part, codes) for part in tables],
+                                                    [getattr(part, pool) for part in tables])
+            setattr(table, codes, merged_codes.astype(getattr(tables[0], codes).dtype))
+            setattr(table, pool, merged_pool)
+        table.type_classes = np.concatenate([part.type_classes for part in tables])
+        table.extra = {key: list(chain.from_iterable(part.extra[key] for part in tables)) for key in tables[0].extra}
+        return table
+
+    def set_classification(self, type_codes, type_pool, type_classes):
+        """
+        Stores the classification of all commits and adds the classification keys to the rows.
+
+        Args:
+            type_codes (Sequence[int]): Code of the commit type in type_pool, -1 for unconventional commits.
+            type_pool (list): The commit types.
+            type_classes (Sequence[int]): UNCONVENTIONAL, CC_TYPE or CUSTOM_TYPE per commit.
+        """
+        self.type_codes = np.asarray(type_codes, dtype=np.int32)
+        self.type_pool = list(type_pool)
+        self.type_classes = np.asarray(type_classes, dtype=np.int8)
+        self.keys += [key for key in CLASSIFICATION_KEYS if key not in self.keys]
+
+    def column(self, key):
+        """
+        Returns the values of a commit key for all commits as a list, as they would appear in the commit dicts.
+        """
+        if key == 'committed_datetime':
+            return np.datetime_as_string(self.timestamps, unit='s').tolist()
+        if key in STAT_KEYS:
+            values = self.stats[key].tolist()
+            return values if values and min(values) >= 0 else [None if value < 0 else value for value in values]
+        if key == 'author':
+            return decode_strings(self.author_codes, self.author_pool)
+        if key == 'message':
+            return decode_strings(self.message_codes, self.message_pool)
+        if key == 'hash':
+            hex_hashes = self.hashes.tobytes().hex()
+            return [hex_hashes[start:start + 2 * HASH_BYTES] for start in range(0, len(hex_hashes), 2 * HASH_BYTES)]
+        if key in CLASSIFICATION_KEYS:
+            if key == 'is_conventional':
+                return (self.type_classes != UNCONVENTIONAL).tolist()
+            type_class = CC_TYPE if key == 'cc_type' else CUSTOM_TYPE
+            return decode_strings(np.where(self.type_classes == type_class, self.type_codes, -1), self.type_pool)
+        return list(self.extra[key])
+
+    def to_columns(self):
+        """
+        Returns all commit keys as columns (see column).
+        """
+        return {key: self.column(key) for key in self.keys}
+
+    def to_commits(self):
+        """
+        Returns the commits as a list of dicts, e.g. to save them as JSON.
+        """
+        columns = self.to_columns()
+        keys = list(columns)
+        commits = [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+        # Diff stats are optional: commits loaded without them do not have the keys instead of None values
+        for key in STAT_KEYS:
+            if key in columns:
+                for index in np.flatnonzero(self.stats[key] < 0).tolist():
+                    del commits[index][key]
+        return commits
+
+    def value(self, index, key):
+        if key == 'committed_datetime':
+            return str(self.timestamps[index])
+        if key in STAT_KEYS:
+            value = int(self.stats[key][index])
+            if value < 0:
+                raise KeyError(key)
+            return value
+        if key == 'author':
+            return decode_string(self.author_codes[index], self.author_pool)
+        if key == 'message':
+            return decode_string(self.message_codes[index], self.message_pool)
+        if key == 'hash':
+            return self.hashes[index].tobytes().hex()
+        if key in CLASSIFICATION_KEYS:
+            commit_class = self.type_classes[index]
+            if key == 'is_conventional':
+                return bool(commit_class != UNCONVENTIONAL)
+            if commit_class == (CC_TYPE if key == 'cc_type' else CUSTOM_TYPE):
+                return self.type_pool[self.type_codes[index]]
+            return None
+        return self.extra[key][index]
+
+    def has_value(self, index, key):
+        if key not in self.keys:
+            return False
+        return key not in STAT_KEYS or self.stats[key][index] >= 0
+
+    def set_value(self, index, key, value):
+        if key in STAT_KEYS:
+            self.stats[key][index] = value
+            if key not in self.keys:
+                self.keys.append(key)
+        elif key in self.extra:
+            self.extra[key][index] = value
+        else:
+            raise TypeError(f"Commit key '{key}' cannot be changed in a CommitTable.")
+
+    def nbytes(self):
+        """
+        Estimates the memory used by the table in bytes: its arrays and the strings of its pools and extra lists.
+        """
+        arrays = [self.timestamps, *self.stats.values(), self.type_codes, self.type_classes, self.author_codes,
+                  self.message_codes, self.hashes]
+        strings = chain(self.type_pool, self.author_pool, self.message_pool, *self.extra.values())
+        return sum(array.nbytes for array in arrays) + sum(map(sys.getsizeof, strings))
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (CommitRow(self, index) for index in range(self.size))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CommitRow(self, i) for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("CommitTable index out of range")
+        return CommitRow(self, index)
+
+    def __add__(self, other):
+        return CommitTable.concat([self, other])
+
+
+class CommitRow:
+    """
+    Read-mostly view of one commit of a CommitTable that behaves like the commit dict. Diff stats can be set, e.g.
+    by diff_stats.attach_diff_stats.
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key):
+        if not self.table.has_value(self.index, key):
+            raise KeyError(key)
+        return self.table.value(self.index, key)
+
+    def __setitem__(self, key, value):
+        self.table.set_value(self.index, key, value)
+
+    def __contains__(self, key):
+        return self.table.has_value(self.index, key)
+
+    def get(self, key, default=None):
+        if not self.table.has_value(self.index, key):
+            return default
+        return self.table.value(self.index, key)
+
+    def keys(self):
+        return [key for key in self.table.keys if self.table.has_value(self.index, key)]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def items(self):
+        return [(key, self.table.value(self.index, key)) for key in self.keys()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"CommitRow({self.to_dict()!r})"
+
+
+class CommitChain:
+    """
+    Concatenated view of several commit tables (or lists of commits) without copying them, so that changes made
+    through the rows of one repository, e.g. attached diff stats, are visible in the chain.
+    """
+
+    def __init__(self, parts):
+        self.parts = list(parts)
+
+    def __iter__(self):
+        return chain.from_iterable(self.parts)
+
+    def __len__(self):
+        return sum(len(part) for part in self.parts)
+
+
+def intern_strings(values):
+    """
+    Stores every distinct value once.
+
+    Args:
+        values (Iterable): The values; None is encoded as -1.
+
+    Returns:
+        tuple: Codes of the values (np.ndarray) and the pool of distinct values in order of first occurrence.
+    """
+    codes, pool = pd.factorize(np.array(values, dtype=object))
+    return codes.astype(np.int32), pool.tolist()
+
+
+def get_keys(commits):
+    """
+    Returns the keys of all commit dicts in order of their first occurrence.
+    """
+    keys = list(commits[0]) if commits else []
+    # Commits with other keys than the first one are rare, so the ordered union is only built if needed
+    if len(set().union(*commits)) != len(keys):
+        keys = list(dict.fromkeys(key for commit in commits for key in commit))
+    return keys
+
+
+def get_column(commits, key):
+    """
+    Returns the values of a key for all commit dicts, None where it is missing.
+    """
+    try:
+        return list(map(itemgetter(key), commits))
+    except KeyError:
+        return [commit.get(key) for commit in commits]
+
+
+def decode_strings(codes, pool):
+    """
+    Returns the values of the given codes (see intern_strings).
+    """
+    pool = pool + [None]
+    return [pool[code] for code in codes.tolist()]
+
+
+def decode_string(code, pool):
+    return None if code < 0 else pool[code]
+
+
+def merge_pools(code_arrays, pools):
+    """
+    Merges the pools of several tables and remaps their codes to the merged pool.
+    """
+    merged = {}
+    remapped = []
+    for codes, pool in zip(code_arrays, pools):
+        mapping = np.array([merged.setdefault(value, len(merged)) for value in pool] + [-1], dtype=np.int32)
+        remapped.append(mapping[codes])
+    return np.concatenate(remapped), list(merged)
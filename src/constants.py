@@ -4,6 +4,11 @@ from pathlib import Path
 
 MIN_COMMITS_AFTER_CP = 50
 MIN_CC_RATE = 0.5
+# Overall CC rate in percent from which a repository is consistently conventional (adopted since its creation)
+CONSISTENT_CC_RATE = 80
+# The adoption date is only analyzed from this overall CC rate or number of CC-type commits on
+MIN_CC_RATE_FOR_ANALYSIS = 0.10
+MIN_CC_COMMITS_FOR_ANALYSIS = 500
 
 FILE = Path(__file__).resolve()
 ROOT = FILE.parents[0]
@@ -13,4 +18,60 @@ RESULTS = ROOT / "results"
 ERROR = ROOT / "results" / "error_log.txt"
 TEMP = ROOT / "data" / "temp"
 PLOTS = ROOT / "results" / "final_plots"
+LOGS = ROOT / "results" / "logs"
+DIFF_STATS = ROOT / "results" / "diff_stats"
+CHANGE_POINTS = ROOT / "results" / "change_points"
+COMMIT_LOGS = ROOT / "data" / "commit_logs"
+COMMIT_COUNTS = ROOT / "results" / "commit_counts.json"
+SENSITIVITY_SWEEP = ROOT / "results" / "sensitivity_sweep.csv"
+CLASSIFICATION_CACHE = ROOT / "data" / "classification_cache.json"
+ZSTD_DICTIONARY = ROOT / "data" / "zstd_dictionary"
+ZSTD_DICTIONARIES = ROOT / "data" / "zstd_dictionaries"
 GITHUB_TOKEN = os.getenv('GITHUB_ACCESS_TOKEN')
+
+# Clone strategy: 'full', 'blobless' (partial clone, only indicator files are checked out) or 'bare'
+# (partial clone without working tree)
+CLONE_STRATEGY = os.getenv('CC_CLONE_STRATEGY', 'full')
+# Source of the CC indicator files: 'worktree' (checked-out files) or 'object_db' (HEAD tree in the git objects)
+INDICATOR_BACKEND = os.getenv('CC_INDICATOR_BACKEND', 'worktree')
+# Format of the parsed git log: 'shortstat' (semicolon-separated headers), 'numstat' (NUL-delimited records) or
+# 'messages' (no diff stats; they are computed on demand for the analyses that need them)
+LOG_FORMAT = os.getenv('CC_LOG_FORMAT', 'shortstat')
+# Local mirrors: directory of bare mirrors ('<owner>/<name>.git') or bundles ('<owner>/<name>.bundle') that are
+# cloned from instead of GitHub, and an optional repository whose objects are shared via alternates
+MIRROR_DIR = os.getenv('CC_MIRROR_DIR')
+MIRROR_REFERENCE = os.getenv('CC_MIRROR_REFERENCE')
+# Offline mode: only clone from local mirrors and skip homepage checks
+OFFLINE = os.getenv('CC_OFFLINE', '0') == '1'
+# Incremental mode: update existing results with the commits added since their last analysis
+INCREMENTAL = os.getenv('CC_INCREMENTAL', '0') == '1'
+# Disk budget for the clones in TEMP in GB (0 = unlimited); least recently used clones whose results are saved
+# are deleted once it is exceeded. Optionally a compact commit log is kept so they can be re-analyzed without a clone
+DISK_BUDGET_GB = float(os.getenv('CC_DISK_BUDGET_GB', 0))
+KEEP_COMMIT_LOG = os.getenv('CC_KEEP_COMMIT_LOG', '0') == '1'
+# Classification memo cache: maximum number of entries and whether it is persisted to CLASSIFICATION_CACHE to warm
+# up later runs
+CLASSIFICATION_CACHE_SIZE = int(os.getenv('CC_CLASSIFICATION_CACHE_SIZE', 100000))
+WARM_CLASSIFICATION_CACHE = os.getenv('CC_WARM_CLASSIFICATION_CACHE', '0') == '1'
+# Change point engine of the adoption date detection: 'prefix_sum' (exact linear-time split of the binary CC
+# sequence) or 'ruptures' (Binseg with l2 cost)
+CHANGE_POINT_ENGINE = os.getenv('CC_CHANGE_POINT_ENGINE', 'prefix_sum')
+# Change point mode: 'single' (one change point, binary segmentation) or 'multi' (penalized segmentation with PELT,
+# dating projects that abandoned and re-adopted CC at the re-adoption) and the PELT penalty per change point
+CHANGE_POINT_MODE = os.getenv('CC_CHANGE_POINT_MODE', 'single')
+PELT_PENALTY = float(os.getenv('CC_PELT_PENALTY', 10))
+# Format of the saved results: 'json' (one <id>.json file per repository) or 'columnar' (one <id>/ directory of
+# NumPy column files per repository, see columnar_store.py)
+RESULT_STORE = os.getenv('CC_RESULT_STORE', 'json')
+# Memory cap of the repository cache (see repository_cache.py) in MB (0 = unlimited); least recently used
+# repositories are evicted and decoded again when needed
+REPOSITORY_CACHE_MB = float(os.getenv('CC_REPOSITORY_CACHE_MB', 0))
+# Compression of the JSON result files: 'none' (<id>.json), 'gzip' (<id>.json.gz) or 'zstd' (<id>.json.zst, needs the
+# zstandard package; uses the dictionary in ZSTD_DICTIONARY if it exists and reads each file with the dictionary it
+# was written with from ZSTD_DICTIONARIES, see result_compression.py)
+RESULT_COMPRESSION = os.getenv('CC_RESULT_COMPRESSION', 'none')
+
+# Parallel processing (opt-in): threads clone repositories, processes parse and enrich them; with 1 of each the
+# repositories are processed sequentially
+CLONE_WORKERS = int(os.getenv('CC_CLONE_WORKERS', 1))
+PROCESS_WORKERS = int(os.getenv('CC_PROCESS_WORKERS', 1))
@@ -1,11 +1,30 @@
 # Standard library imports
+import json
 import logging
 import re
-from collections import Counter
-from typing import List, Dict, Tuple, Any
+from collections import Counter, OrderedDict
+from typing import List, Dict, Tuple, Any, Iterable, Callable, Optional
+
+# Third-party library imports
+import numpy as np
+import pandas as pd
 
 # Local module imports
-from change_point_detection import binary_segmentation_date_analysis
+from change_point_detection import (JUMP, MIN_SEGMENT_SIZE, PeltSegmenter, binary_segmentation_date_analysis,
+                                    detect_adoption_batch, detect_adoption_date)
+from commit_table import CC_TYPE, CUSTOM_TYPE, UNCONVENTIONAL, CommitTable
+from constants import (CHANGE_POINT_MODE, CHANGE_POINTS, CLASSIFICATION_CACHE, CLASSIFICATION_CACHE_SIZE,
+                       CONSISTENT_CC_RATE, MIN_CC_COMMITS_FOR_ANALYSIS, MIN_CC_RATE_FOR_ANALYSIS, PELT_PENALTY,
+                       WARM_CLASSIFICATION_CACHE)
+
+
+# Types defined by the Conventional Commits specification
+CC_TYPES = frozenset({"feat", "fix", "docs", "style", "refactor", "perf", "test", "build", "ci", "chore", "revert"})
+COMMIT_MESSAGE_PATTERN = re.compile(r"^([a-zA-Z]+)(?:\(([\w\-\.\s]+)\))?(!)?: (.+)")
+
+# Classes returned by classify_commit_message
+CC_CLASS = "cc"
+CUSTOM_CLASS = "custom"
 
 
 def identify_consistent_custom_types(custom_type_counter, total_commits, min_absolute=3, min_percentage=0.00):
@@ -29,12 +48,132 @@ def identify_consistent_custom_types(custom_type_counter, total_commits, min_abs
     return consistent_custom_types
 
 
+def classify_commit_message(message):
+    """
+    Parses a commit message once and classifies it.
+
+    Args:
+        message (str): The commit message.
+
+    Returns:
+        tuple: (type, scope, breaking, class) where class is CC_CLASS for CC types, CUSTOM_CLASS for custom types
+        and None (with all other fields None/False) for unconventional messages.
+    """
+    match = COMMIT_MESSAGE_PATTERN.match(message.lower())
+    if not match:
+        return None, None, False, None
+    commit_type, scope, breaking, _ = match.groups()
+    if scope:
+        scope = scope.strip()
+    return commit_type, scope, breaking == '!', CC_CLASS if commit_type in CC_TYPES else CUSTOM_CLASS
+
+
+def get_classification_prefix(message):
+    """
+    Returns the part of a commit message that decides its classification: everything up to the first colon and the
+    two characters after it. Neither type nor scope can contain a colon, so the prefix classifies like the whole
+    message while commit bodies are never lowercased or scanned.
+    """
+    return message[:message.find(':') + 3]
+
+
+class ClassificationCache:
+    """
+    Bounded memo of classify_commit_message results with least-recently-used eviction.
+
+    Entries are keyed by the classification prefix of a message (see get_classification_prefix), so repeated
+    subjects such as "Update README.md" or "chore(deps): bump ..." are parsed once. Worker processes report their
+    counters and new entries with export_delta; the main process merges them and can persist the cache to warm up
+    later runs. New entries are only recorded if they are persisted and are dropped again when evicted, so the
+    cache never holds more than maxsize entries.
+    """
+
+    def __init__(self, maxsize=CLASSIFICATION_CACHE_SIZE, record_new_entries=WARM_CLASSIFICATION_CACHE):
+        self.maxsize = maxsize
+        self.record_new_entries = record_new_entries
+        self.entries = OrderedDict()
+        self.new_entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def classify(self, prefix):
+        """
+        Classifies a classification prefix like classify_commit_message, using the memo when possible.
+        """
+        classification = self.entries.get(prefix)
+        if classification is not None:
+            self.hits += 1
+            self.entries.move_to_end(prefix)
+            return classification
+        self.misses += 1
+        classification = classify_commit_message(prefix)
+        if self.record_new_entries:
+            self.new_entries[prefix] = classification
+        self.add(prefix, classification)
+        return classification
+
+    def add(self, prefix, classification):
+        self.entries[prefix] = classification
+        self.entries.move_to_end(prefix)
+        if len(self.entries) > self.maxsize:
+            evicted, _ = self.entries.popitem(last=False)
+            self.new_entries.pop(evicted, None)
+
+    def export_delta(self, with_entries=True):
+        """
+        Returns and resets the counters and the entries added since the last export.
+
+        Args:
+            with_entries (bool): Whether to include the new entries (only needed to persist the cache).
+
+        Returns:
+            dict: 'hits', 'misses' and the new 'entries' as (prefix, classification) pairs.
+        """
+        entries = list(self.new_entries.items()) if with_entries else []
+        delta = {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+        self.hits = self.misses = 0
+        self.new_entries = {}
+        return delta
+
+    def merge_delta(self, delta):
+        """
+        Adds the counters and entries exported by another process.
+        """
+        self.hits += delta['hits']
+        self.misses += delta['misses']
+        for prefix, classification in delta['entries']:
+            self.add(prefix, tuple(classification))
+
+    def log_statistics(self):
+        lookups = self.hits + self.misses
+        if lookups:
+            logging.info(f"Classification cache: {self.hits} hits, {self.misses} misses "
+                         f"({self.hits / lookups:.1%} hit rate), {len(self.entries)} entries.")
+
+    def load(self, path=CLASSIFICATION_CACHE):
+        """
+        Warms up the cache with the entries persisted by an earlier run.
+        """
+        if not path.is_file():
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for prefix, *classification in json.load(f):
+                self.add(prefix, tuple(classification))
+
+    def save(self, path=CLASSIFICATION_CACHE):
+        """
+        Persists the cache, least recently used entries first.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([[prefix, *classification] for prefix, classification in self.entries.items()], f)
+
+
 def parse_commit_message(message):
     """
     Parses a commit message and returns its type, scope, breaking-change indicator, and description.
     """
-    pattern = r"^([a-zA-Z]+)(?:\(([\w\-\.\s]+)\))?(!)?: (.+)"
-    match = re.match(pattern, message.lower())
+    match = COMMIT_MESSAGE_PATTERN.match(message.lower())
     if match:
         commit_type = match.group(1)
         scope = match.group(2)
@@ -50,34 +189,25 @@ def is_conventional_commit(commit_message):
     """
     Checks if a commit message conforms to the Conventional Commit (CC) standard.
     """
-    cc_types = ["feat", "fix", "docs", "style", "refactor", "perf",
-                "test", "build", "ci", "chore", "revert"]
-    parsed = parse_commit_message(commit_message)
-    if parsed and parsed['type'] in cc_types:
-        return True
-    return False
+    return classify_commit_message(commit_message)[3] == CC_CLASS
 
 
 def is_conventional_custom(commit_message):
     """
     Checks if a commit message conforms to the CC standard but uses custom types.
     """
-    cc_types = ["feat", "fix", "docs", "style", "refactor", "perf",
-                "test", "build", "ci", "chore", "revert"]
-    parsed = parse_commit_message(commit_message)
-    if parsed and parsed['type'] not in cc_types:
-        return True
-    return False
+    return classify_commit_message(commit_message)[3] == CUSTOM_CLASS
 
 
 def get_commit_type(message):
     """
     Extracts the commit type from a commit message.
     """
-    parsed = parse_commit_message(message)
-    if parsed:
-        return parsed['type']
-    return None
+    return classify_commit_message(message)[0]
+
+
+# Shared by all classifications of a process
+classification_cache = ClassificationCache()
 
 
 def should_analyze_cc_adoption(analysis_summary):
@@ -92,39 +222,76 @@ def should_analyze_cc_adoption(analysis_summary):
 
     cc_rate = cc_type_commits / total_commits
 
-    return cc_rate >= 0.10 or cc_type_commits >= 500
+    return cc_rate >= MIN_CC_RATE_FOR_ANALYSIS or cc_type_commits >= MIN_CC_COMMITS_FOR_ANALYSIS
 
 
 def enrich_commits(
-        commits: List[Dict[str, Any]], summary: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        commits: Iterable[Dict[str, Any]], summary: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Enriches commits with metadata and creates a summary of the data.
 
     Args:
-        commits (List[Dict[str, Any]]): List of commits.
+        commits (Iterable[Dict[str, Any]]): List of commits or a commit stream such as commit_loader.iter_commits.
         summary (Dict[str, Any]): Summary dictionary to be updated.
 
     Returns:
         Tuple[List[Dict[str, Any]], Dict[str, Any]]: A list of enriched commits and an updated summary.
     """
-    logger = logging.getLogger(__name__)
+    logging.info("Starting enrichment of commits.")
+    enriched_commits, cc_type_counter, custom_type_counter = classify_commits(commits)
+    logging.info(f"Enriched {len(enriched_commits)} commits.")
 
-    total_commits = len(commits)
-    cc_type_commits = 0
-    custom_type_commits = 0
+    summary = summarize_enriched_commits(enriched_commits, summary, cc_type_counter, custom_type_counter)
+    return enriched_commits, summary
+
+
+def merge_enriched_commits(
+        new_commits: Iterable[Dict[str, Any]], enriched_commits: List[Dict[str, Any]],
+        summary: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Enriches commits added since the last analysis and merges them into an existing result.
 
+    Only the new commits are classified; the counters of the existing summary are extended and the adoption
+    date is recomputed from the merged, already classified commit sequence.
+
+    Args:
+        new_commits (Iterable[Dict[str, Any]]): New commits, newest first.
+        enriched_commits (List[Dict[str, Any]]): Previously enriched commits, newest first.
+        summary (Dict[str, Any]): Previous summary.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, Any]]: The merged enriched commits and the updated summary.
+    """
+    new_enriched_commits, cc_type_counter, custom_type_counter = classify_commits(new_commits)
+    logging.info(f"Merging {len(new_enriched_commits)} new commits into {len(enriched_commits)} analyzed commits.")
+
+    cc_type_counter.update(summary.get('cc_type_distribution', {}))
+    custom_type_counter.update(summary.get('custom_type_distribution', {}))
+
+    merged_commits = new_enriched_commits + enriched_commits
+    summary = summarize_enriched_commits(merged_commits, summary, cc_type_counter, custom_type_counter)
+    return merged_commits, summary
+
+
+def classify_commits(commits: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Counter, Counter]:
+    """
+    Classifies commits as CC-type, custom-type or unconventional.
+
+    Args:
+        commits (Iterable[Dict[str, Any]]): Commits to classify.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Counter, Counter]: The enriched commits and the frequencies of CC and custom
+        types.
+    """
     cc_type_counter = Counter()
     custom_type_counter = Counter()
 
     enriched_commits = []
 
-    logging.info(f"Starting enrichment of {total_commits} commits.")
-
     for commit in commits:
-        message = commit.get("message", "")
-        commit_type = get_commit_type(message)
-        is_cc = is_conventional_commit(message)
-        is_custom = is_conventional_custom(message)
+        prefix = get_classification_prefix(commit.get("message", ""))
+        commit_type, _, _, commit_class = classification_cache.classify(prefix)
 
         enriched_commit = {
             **commit,
@@ -133,21 +300,130 @@ def enrich_commits(
             'custom_type': None
         }
 
-        if commit_type:
-            if is_cc:
-                enriched_commit['is_conventional'] = True
-                enriched_commit['cc_type'] = commit_type
-                cc_type_commits += 1
-                cc_type_counter[commit_type] += 1
-            elif is_custom:
-                enriched_commit['is_conventional'] = True
-                enriched_commit['custom_type'] = commit_type
-                custom_type_commits += 1
-                custom_type_counter[commit_type] += 1
-            # Otherwise, the commit is considered unconventional
+        if commit_class == CC_CLASS:
+            enriched_commit['is_conventional'] = True
+            enriched_commit['cc_type'] = commit_type
+            cc_type_counter[commit_type] += 1
+        elif commit_class == CUSTOM_CLASS:
+            enriched_commit['is_conventional'] = True
+            enriched_commit['custom_type'] = commit_type
+            custom_type_counter[commit_type] += 1
+        # Otherwise, the commit is considered unconventional
 
         enriched_commits.append(enriched_commit)
 
+    return enriched_commits, cc_type_counter, custom_type_counter
+
+
+def classify_messages(messages: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Classifies all commit messages of a repository at once.
+
+    Messages are reduced to their classification prefix (see get_classification_prefix). Identical prefixes are
+    classified only once, through classification_cache, and types are mapped to integer codes so that all further
+    steps work on arrays.
+
+    Args:
+        messages (List[str]): The commit messages.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Type code of every message (-1 for unconventional messages),
+        the types in order of their first occurrence and whether each type is a CC type.
+    """
+    prefix_codes, prefixes = pd.factorize(np.array([message[:message.find(':') + 3] for message in messages],
+                                                   dtype=object))
+    prefix_types = np.array([classification_cache.classify(prefix)[0] for prefix in prefixes], dtype=object)
+    prefix_type_codes, types = pd.factorize(prefix_types)
+    type_codes = prefix_type_codes[prefix_codes] if len(messages) else np.empty(0, dtype=np.intp)
+    is_cc_type = np.array([commit_type in CC_TYPES for commit_type in types], dtype=bool)
+    return type_codes, np.asarray(types, dtype=object), is_cc_type
+
+
+def count_types(type_codes: np.ndarray, types: np.ndarray, is_cc_type: np.ndarray) -> Tuple[Counter, Counter]:
+    """
+    Aggregates the frequencies of CC and custom types from the type codes of all commits (see classify_messages).
+
+    Returns:
+        Tuple[Counter, Counter]: Frequencies of CC types and of custom types, in order of first occurrence.
+    """
+    counts = np.bincount(type_codes[type_codes >= 0], minlength=len(types))
+    cc_type_counter = Counter({types[code]: int(counts[code]) for code in np.flatnonzero(is_cc_type & (counts > 0))})
+    custom_type_counter = Counter({types[code]: int(counts[code])
+                                   for code in np.flatnonzero(~is_cc_type & (counts > 0))})
+    return cc_type_counter, custom_type_counter
+
+
+def enrich_commit_table(table: CommitTable, summary: Dict[str, Any]) -> Tuple[CommitTable, Dict[str, Any]]:
+    """
+    Enriches the commits of a CommitTable in place and creates the summary, like enrich_commits.
+
+    Each distinct message of the table's message pool is classified once and the types are stored as codes.
+
+    Args:
+        table (CommitTable): Commits of a repository, newest first.
+        summary (Dict[str, Any]): Summary dictionary to be updated.
+
+    Returns:
+        Tuple[CommitTable, Dict[str, Any]]: The enriched table and the updated summary.
+    """
+    pool_type_codes, types, is_cc_type = classify_messages(table.message_pool)
+    type_codes = np.append(pool_type_codes, -1)[table.message_codes] if len(table) else pool_type_codes[:0]
+    # Code -1 (unconventional) selects the appended last entry
+    type_classes = np.append(np.where(is_cc_type, CC_TYPE, CUSTOM_TYPE), UNCONVENTIONAL)[type_codes]
+    table.set_classification(type_codes, types.tolist(), type_classes)
+    logging.info(f"Enriched {len(table)} commits.")
+
+    def analyze_adoption_date(segmenter):
+        commit_sequence = (type_classes[::-1] == CC_TYPE).astype(int).tolist()
+        return detect_adoption_date(commit_sequence, table.column('committed_datetime')[::-1], segmenter)
+
+    cc_type_counter, custom_type_counter = count_types(type_codes, types, is_cc_type)
+    summary = summarize_classification(len(table), summary, cc_type_counter, custom_type_counter,
+                                       analyze_adoption_date)
+    return table, summary
+
+
+def summarize_enriched_commits(
+        enriched_commits: List[Dict[str, Any]], summary: Dict[str, Any],
+        cc_type_counter: Counter, custom_type_counter: Counter) -> Dict[str, Any]:
+    """
+    Creates the summary of enriched commits and determines the CC adoption date.
+
+    Args:
+        enriched_commits (List[Dict[str, Any]]): Enriched commits, newest first.
+        summary (Dict[str, Any]): Summary dictionary to be updated.
+        cc_type_counter (Counter): Frequencies of CC types.
+        custom_type_counter (Counter): Frequencies of custom types.
+
+    Returns:
+        Dict[str, Any]: The updated summary.
+    """
+    return summarize_classification(len(enriched_commits), summary, cc_type_counter, custom_type_counter,
+                                    lambda segmenter: binary_segmentation_date_analysis(enriched_commits, segmenter))
+
+
+def summarize_classification(
+        total_commits: int, summary: Dict[str, Any], cc_type_counter: Counter, custom_type_counter: Counter,
+        analyze_adoption_date: Callable[[Optional[PeltSegmenter]], Any]) -> Dict[str, Any]:
+    """
+    Creates the summary from the classification counts and determines the CC adoption date.
+
+    Args:
+        total_commits (int): Number of enriched commits.
+        summary (Dict[str, Any]): Summary dictionary to be updated.
+        cc_type_counter (Counter): Frequencies of CC types.
+        custom_type_counter (Counter): Frequencies of custom types.
+        analyze_adoption_date (Callable[[Optional[PeltSegmenter]], Any]): Runs the change point analysis with the
+            segmenter of restore_segmenter; only called when the adoption criteria are met.
+
+    Returns:
+        Dict[str, Any]: The updated summary.
+    """
+    logger = logging.getLogger(__name__)
+    segmenter = restore_segmenter(summary)
+
+    cc_type_commits = sum(cc_type_counter.values())
+    custom_type_commits = sum(custom_type_counter.values())
     conventional_commits = cc_type_commits + custom_type_commits
     unconventional_commits = total_commits - conventional_commits
 
@@ -169,15 +445,147 @@ def enrich_commits(
     }
 
     # Determine if the repository is consistently conventional based on the overall adoption rate
-    if overall_cc_adoption_rate >= 80:
+    if overall_cc_adoption_rate >= CONSISTENT_CC_RATE:
         logger.info("Repository is consistently conventional.")
         summary['is_consistently_conventional'] = True
         summary['cc_adoption_date'] = summary.get('created_at')
     elif should_analyze_cc_adoption(summary):
         logger.info("Analyzing CC adoption date.")
-        cc_adoption_date = binary_segmentation_date_analysis(enriched_commits)
+        cc_adoption_date = analyze_adoption_date(segmenter)
         summary['cc_adoption_date'] = cc_adoption_date
     else:
         logger.info("Criteria for CC adoption date analysis not met.")
 
-    return enriched_commits, summary
+    # The segmentation state is kept in a sidecar file instead of the summary, which is loaded by every analysis
+    summary.pop('change_point_state', None)
+    if segmenter is not None and segmenter.n_samples == total_commits:
+        save_change_point_state(summary.get('id'), segmenter.to_dict())
+    else:
+        delete_change_point_state(summary.get('id'))
+    return summary
+
+
+def load_change_point_state(repo_id) -> Optional[Dict[str, Any]]:
+    """
+    Loads the PELT segmentation state of a repository (see PeltSegmenter.to_dict), or None if none was saved.
+
+    Args:
+        repo_id (int): ID of the repository.
+    """
+    state_file = CHANGE_POINTS / f"{repo_id}.json"
+    if repo_id is None or not state_file.is_file():
+        return None
+    with open(state_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_change_point_state(repo_id, state: Dict[str, Any]):
+    """
+    Saves the PELT segmentation state of a repository to its sidecar file in CHANGE_POINTS.
+
+    Args:
+        repo_id (int): ID of the repository (nothing is saved if None).
+        state (Dict[str, Any]): The state returned by PeltSegmenter.to_dict.
+    """
+    if repo_id is None:
+        return
+    CHANGE_POINTS.mkdir(parents=True, exist_ok=True)
+    with open(CHANGE_POINTS / f"{repo_id}.json", 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+
+def delete_change_point_state(repo_id):
+    """
+    Deletes the saved PELT segmentation state of a repository, which no longer matches its result.
+    """
+    if repo_id is not None:
+        (CHANGE_POINTS / f"{repo_id}.json").unlink(missing_ok=True)
+
+
+def restore_segmenter(summary: Dict[str, Any]) -> Optional[PeltSegmenter]:
+    """
+    Returns the segmenter for the change point analysis in CHANGE_POINT_MODE 'multi' (None otherwise).
+
+    The state saved by the previous analysis (see save_change_point_state; results saved before it was moved out of
+    the summary hold it in 'change_point_state') is continued if it covers all previously analyzed commits and was
+    created with the current settings, so that merged results only segment their new commits.
+
+    Args:
+        summary (Dict[str, Any]): Summary of the previous analysis or the metadata of a new repository.
+
+    Returns:
+        Optional[PeltSegmenter]: The segmenter.
+    """
+    if CHANGE_POINT_MODE != 'multi':
+        return None
+    state = load_change_point_state(summary.get('id')) or summary.get('change_point_state')
+    if (state and state['n_samples'] == summary.get('total_commits')
+            and (state['penalty'], state['min_size'], state['jump']) == (PELT_PENALTY, MIN_SEGMENT_SIZE, JUMP)):
+        return PeltSegmenter.from_dict(state)
+    return PeltSegmenter()
+
+
+# Commit keys the adoption analyses read (see get_cc_sequence), e.g. to load only these columns of saved results
+ADOPTION_COLUMNS = ('committed_datetime', 'cc_type')
+
+
+def get_cc_sequence(commits) -> np.ndarray:
+    """
+    Returns the binary CC sequence (1 = CC type, 0 otherwise) of enriched commits, oldest first.
+
+    Args:
+        commits: Enriched commits, newest first, as list of dicts or CommitTable.
+    """
+    if isinstance(commits, CommitTable):
+        return (commits.type_classes[::-1] == CC_TYPE).astype(np.int8)
+    return np.fromiter((1 if commit.get('cc_type') else 0 for commit in reversed(commits)), dtype=np.int8,
+                       count=len(commits))
+
+
+def redetect_adoption_dates(repos: List[Dict[str, Any]]) -> int:
+    """
+    Re-derives the CC adoption dates of saved results without re-enriching their commits.
+
+    The adoption criteria of summarize_classification are applied to the stored summaries and the change points of
+    all repositories that need one are detected in a single batch (see change_point_detection.detect_adoption_batch),
+    or segmented one by one in CHANGE_POINT_MODE 'multi'. The summaries are updated in place.
+
+    Args:
+        repos (List[Dict[str, Any]]): Repository data as loaded by load_all_repositories_data.
+
+    Returns:
+        int: Number of repositories whose adoption date changed.
+    """
+    adoption_dates = {}
+    to_detect = []
+    for position, repo in enumerate(repos):
+        summary = repo['analysis_summary']
+        total_commits = summary.get('total_commits', 0)
+        overall_cc_adoption_rate = summary.get('cc_type_commits', 0) / total_commits * 100 if total_commits else 0
+        summary['is_consistently_conventional'] = overall_cc_adoption_rate >= CONSISTENT_CC_RATE
+        if summary['is_consistently_conventional']:
+            adoption_dates[position] = summary.get('created_at')
+        elif should_analyze_cc_adoption(summary):
+            to_detect.append(position)
+        else:
+            adoption_dates[position] = None
+
+    sequences = (get_cc_sequence(repos[position]['commits']) for position in to_detect)
+    if CHANGE_POINT_MODE == 'multi':
+        adoption_indices = [PeltSegmenter().append(sequence).adoption_index() for sequence in sequences]
+    else:
+        adoption_indices = detect_adoption_batch(sequences)[2].tolist()
+    for position, adoption_index in zip(to_detect, adoption_indices):
+        commits = repos[position]['commits']
+        adoption_dates[position] = (commits[len(commits) - 1 - adoption_index]['committed_datetime'][:10]
+                                    if adoption_index >= 0 else None)
+
+    changed = 0
+    for position, adoption_date in adoption_dates.items():
+        summary = repos[position]['analysis_summary']
+        if summary.get('cc_adoption_date') != adoption_date:
+            changed += 1
+        summary['cc_adoption_date'] = adoption_date
+    logging.info(f"Re-derived the adoption dates of {len(repos)} repositories ({len(to_detect)} change point "
+                 f"analyses, {changed} changed).")
+    return changed
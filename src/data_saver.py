@@ -1,9 +1,27 @@
 # data_saver.py
 import json
+import logging
+import multiprocessing
 import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 
-from constants import DATA
+import ijson
+
+import columnar_store
+from commit_table import CommitTable, get_column, get_keys
+from constants import COMMIT_ANALYSIS_RESULTS, DATA, RESULT_COMPRESSION, RESULT_STORE
+from result_compression import RESULT_SUFFIXES, get_compression, open_result, strip_result_suffix
+
+# Journal of the summaries of the saved results of a directory, one JSON line per saved result (not named *.json, so
+# that the result loaders skip it)
+SUMMARY_INDEX_FILE = "summaries.index"
+_summary_index_lock = threading.Lock()
 
 
 def load_dataset():
@@ -17,7 +35,7 @@ def save_to_json(enriched_commits, summary, file_path):
     Speichert die angereicherten Commits und die Zusammenfassung als JSON.
 
     Args:
-        enriched_commits (list): Liste der angereicherten Commits.
+        enriched_commits (list): Liste der angereicherten Commits (oder CommitTable).
         summary (dict): Zusammenfassung der Analyse.
         repo_name (str): Name des Repositories.
         results_dir (str): Verzeichnis für die Ergebnisse.
@@ -27,28 +45,393 @@ def save_to_json(enriched_commits, summary, file_path):
         :param enriched_commits:
         :param file_path:
     """
+    if isinstance(enriched_commits, CommitTable):
+        enriched_commits = enriched_commits.to_commits()
+    # The summary precedes the commits so that streaming readers (see read_summary) find it at the start of the file
     json_data = {
-        "commits": enriched_commits,
         "custom_types": list(summary['custom_type_distribution'].keys()),
         "cc_types": list(summary['cc_type_distribution'].keys()),
-        "analysis_summary": summary
+        "analysis_summary": summary,
+        "commits": enriched_commits
     }
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(json_data, f, indent=2)
+    # Compressed results are written without indentation, which only matters for reading the files
+    with open_result(file_path, "w") as f:
+        json.dump(json_data, f, indent=2 if get_compression(file_path) == 'none' else None)
+    index_summary(file_path, summary)
     return file_path
 
 
-def load_repository_data(json_file_path):
-    with open(json_file_path, 'r') as file:
+def save_result(enriched_commits, summary, result_path):
+    """
+    Saves the result of a repository in the format of its result path: a (compressed) JSON file (see save_to_json)
+    or a directory of column files (see columnar_store.save_table).
+
+    Args:
+        enriched_commits (list): The enriched commits (or CommitTable).
+        summary (dict): The analysis summary.
+        result_path (Path): Path returned by get_result_path.
+    """
+    if get_compression(result_path):
+        return save_to_json(enriched_commits, summary, result_path)
+    if not isinstance(enriched_commits, CommitTable):
+        enriched_commits = CommitTable.from_commits(enriched_commits)
+    columnar_store.save_table(enriched_commits, summary, result_path)
+    index_summary(result_path, summary)
+    return result_path
+
+
+def set_summary_index_lock(lock):
+    """
+    Replaces the lock guarding the summary index, e.g. with a lock shared between worker processes.
+
+    Args:
+        lock: A lock object supporting the context manager protocol (e.g. multiprocessing.Lock).
+    """
+    global _summary_index_lock
+    _summary_index_lock = lock
+
+
+def get_result_stat(result_path):
+    """
+    Returns the modification time (ns) and size of a saved result, which invalidate its summary index entry.
+    """
+    if os.path.isdir(result_path):
+        result_path = os.path.join(result_path, columnar_store.SUMMARY_FILE)
+    stat = os.stat(result_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def index_summary(result_path, summary):
+    """
+    Appends the summary of a saved result to the summary index of its directory. Safe to call from several threads
+    and processes.
+
+    Args:
+        result_path (Path): Path of the saved result.
+        summary (dict): Its analysis summary.
+    """
+    result_path = Path(result_path)
+    line = json.dumps({'result': result_path.name, 'stat': get_result_stat(result_path), 'summary': summary})
+    with _summary_index_lock:
+        with open(result_path.parent / SUMMARY_INDEX_FILE, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+
+
+def load_summaries(json_directory_path=COMMIT_ANALYSIS_RESULTS, repo_ids=None):
+    """
+    Loads the analysis summaries of the saved results from the summary index, without opening the commit files.
+
+    Entries whose result was modified since it was indexed (or that are missing, e.g. for results saved before the
+    index existed) are read from their result (see read_summary). Afterwards the index is compacted to one entry per
+    existing result.
+
+    Args:
+        json_directory_path (str): Directory of the results.
+        repo_ids (Iterable): Repository IDs to load, all if None.
+
+    Returns:
+        list: The summaries, sorted by repository ID like iter_repositories_data.
+    """
+    index_path = Path(json_directory_path) / SUMMARY_INDEX_FILE
+    with _summary_index_lock:
+        entries = {}
+        lines = 0
+        if index_path.is_file():
+            with open(index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Line cut off by an interrupted run
+                        continue
+                    entries[entry['result']] = entry
+
+        summaries = []
+        indexed = {}
+        for path in iter_result_paths(json_directory_path, repo_ids):
+            name = os.path.basename(path)
+            stat = get_result_stat(path)
+            entry = entries.get(name)
+            if entry is None or entry['stat'] != stat:
+                entry = {'result': name, 'stat': stat, 'summary': read_summary(path)}
+            indexed[name] = entry
+            summaries.append(entry['summary'])
+
+        if repo_ids is not None:
+            indexed = {**entries, **indexed}
+        if lines != len(indexed) or any(entries.get(name) is not entry for name, entry in indexed.items()):
+            tmp_path = index_path.with_name(SUMMARY_INDEX_FILE + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in indexed.values())
+            os.replace(tmp_path, index_path)
+            logging.info(f"Updated the summary index of {len(indexed)} results in {json_directory_path}.")
+    return summaries
+
+
+def get_result_path(repo_id, results_dir=COMMIT_ANALYSIS_RESULTS, store=RESULT_STORE, compression=RESULT_COMPRESSION):
+    """
+    Returns the path the result of a repository is saved to: '<id>.json' ('<id>.json.gz' or '<id>.json.zst' if
+    compressed) or the directory '<id>' for the columnar store.
+    """
+    return Path(results_dir) / (str(repo_id) if store == 'columnar' else f"{repo_id}{RESULT_SUFFIXES[compression]}")
+
+
+def find_result_path(repo_id, results_dir=COMMIT_ANALYSIS_RESULTS):
+    """
+    Returns the path of the saved result of a repository in any format (the first by get_result_priority if
+    several exist), or None if the repository has no result.
+    """
+    for path in (Path(results_dir) / str(repo_id),
+                 *(Path(results_dir) / f"{repo_id}{suffix}" for suffix in RESULT_SUFFIXES.values())):
+        if path.is_file() or columnar_store.is_repository_dir(path):
+            return path
+    return None
+
+
+def get_result_priority(result_path):
+    """
+    Returns the sort key of a result path among the results of the same repository: columnar results first, then
+    the JSON files in the order of RESULT_SUFFIXES.
+    """
+    compression = get_compression(result_path)
+    return list(RESULT_SUFFIXES).index(compression) + 1 if compression else 0
+
+
+def load_repository_data(json_file_path, as_table=False, columns=None):
+    """
+    Loads the saved result of a repository.
+
+    Args:
+        json_file_path (str): Path of the result file or of the directory of a columnar result.
+        as_table (bool): Whether to store the commits in a compact CommitTable instead of a list of dicts.
+        columns (Iterable[str]): Commit keys to load, all if None. Columnar results only read the files of these keys.
+    """
+    if os.path.isdir(json_file_path):
+        data = columnar_store.load_table(json_file_path, columns)
+        if not as_table:
+            data['commits'] = data['commits'].to_commits()
+        return data
+
+    with open_result(json_file_path) as file:
         data = json.load(file)
+    commits = data.get('commits', [])
+    if columns is not None:
+        columns = set(columns)
+        keys = [key for key in get_keys(commits) if key in columns]
+        if as_table:
+            data['commits'] = CommitTable.from_columns({key: get_column(commits, key) for key in keys})
+            return data
+        data['commits'] = [{key: commit[key] for key in keys if key in commit} for commit in commits]
+    if as_table:
+        data['commits'] = CommitTable.from_commits(data['commits'])
     return data
 
 
-def load_all_repositories_data(json_directory_path):
-    repository_data_list = []
+def iter_result_paths(json_directory_path, repo_ids=None):
+    """
+    Returns the paths of the saved results in a directory, sorted by repository ID: the (compressed) result files
+    and the directories of the columnar results.
+
+    Args:
+        json_directory_path (str): Directory of the results.
+        repo_ids (Iterable): Repository IDs to select, all if None.
+    """
+    found = {}
     for filename in os.listdir(json_directory_path):
-        if filename.endswith('.json'):
-            json_file_path = os.path.join(json_directory_path, filename)
-            repo_data = load_repository_data(json_file_path)
-            repository_data_list.append(repo_data)
-    return repository_data_list
+        if get_compression(filename):
+            found.setdefault(strip_result_suffix(filename), []).append(os.path.join(json_directory_path, filename))
+    for repo_id in columnar_store.list_repository_dirs(json_directory_path):
+        found.setdefault(repo_id, []).append(os.path.join(json_directory_path, repo_id))
+
+    # A repository saved in several formats (e.g. after changing RESULT_STORE or RESULT_COMPRESSION) is loaded from
+    # the same one as find_result_path
+    paths = {}
+    for repo_id, candidates in found.items():
+        paths[repo_id] = min(candidates, key=get_result_priority)
+        if len(candidates) > 1:
+            logging.warning(f"Repository {repo_id} has results in several formats, using {paths[repo_id]}: "
+                            f"{sorted(candidates, key=get_result_priority)}")
+    if repo_ids is not None:
+        selected = {str(repo_id) for repo_id in repo_ids}
+        paths = {repo_id: path for repo_id, path in paths.items() if repo_id in selected}
+    return [paths[repo_id] for repo_id in sorted(paths)]
+
+
+def get_result_size(result_path):
+    """
+    Returns the size of a saved result in bytes (of all files of a columnar result).
+    """
+    if os.path.isdir(result_path):
+        return sum(entry.stat().st_size for entry in os.scandir(result_path))
+    return os.path.getsize(result_path)
+
+
+def load_results_chunk(paths, as_table=False, columns=None):
+    """
+    Loads a chunk of saved results, in a worker process of iter_repositories_data.
+    """
+    return [load_repository_data(path, as_table=as_table, columns=columns) for path in paths]
+
+
+def iter_repositories_data(json_directory_path, as_table=False, repo_ids=None, columns=None, workers=1,
+                           chunk_size=4):
+    """
+    Yields the saved results one repository at a time, e.g. for analyses that only keep a few figures per
+    repository.
+
+    With more than one worker, the results are decoded in a process pool in chunks of chunk_size results. At most
+    two chunks per worker are in flight, and the results are yielded in the same order as with one worker. The load
+    throughput is logged at the end. Decoding into CommitTables (as_table) pays off most, since the compact tables
+    are much cheaper to send back than lists of commit dicts.
+
+    Args:
+        json_directory_path (str): Directory of the results.
+        as_table (bool): Whether to store the commits in a compact CommitTable instead of a list of dicts.
+        repo_ids (Iterable): Repository IDs to load, all if None.
+        columns (Iterable[str]): Commit keys to load, all if None.
+        workers (int): Number of decoding processes.
+        chunk_size (int): Number of results decoded per task.
+    """
+    paths = iter_result_paths(json_directory_path, repo_ids)
+    if workers <= 1:
+        for path in paths:
+            yield load_repository_data(path, as_table=as_table, columns=columns)
+        return
+
+    start = time.perf_counter()
+    chunks = iter([paths[offset:offset + chunk_size] for offset in range(0, len(paths), chunk_size)])
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque(pool.submit(load_results_chunk, chunk, as_table, columns)
+                        for chunk in islice(chunks, 2 * workers))
+        while pending:
+            repos = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(pool.submit(load_results_chunk, chunk, as_table, columns))
+            yield from repos
+
+    seconds = time.perf_counter() - start
+    size = sum(get_result_size(path) for path in paths) / 1e6
+    logging.info(f"Loaded {len(paths)} results ({size:,.0f} MB) with {workers} processes in {seconds:.1f}s "
+                 f"({size / seconds:,.0f} MB/s).")
+
+
+def load_all_repositories_data(json_directory_path, as_table=False, repo_ids=None, columns=None, workers=1):
+    """
+    Loads the saved results of all (or the selected) repositories, see iter_repositories_data.
+    """
+    return list(iter_repositories_data(json_directory_path, as_table=as_table, repo_ids=repo_ids, columns=columns,
+                                       workers=workers))
+
+
+def read_summary(json_file_path):
+    """
+    Reads the analysis summary of a saved result without loading its commits.
+
+    Result files are parsed incrementally with ijson, which stops after the summary if it precedes the commits (as
+    written by save_to_json) and otherwise skips the commits without building them.
+
+    Args:
+        json_file_path (str): Path of the result file or of the directory of a columnar result.
+
+    Returns:
+        dict: The analysis summary.
+    """
+    if os.path.isdir(json_file_path):
+        return columnar_store.load_summary(json_file_path)['analysis_summary']
+    with open_result(json_file_path, 'rb') as f:
+        return next(ijson.items(f, 'analysis_summary', use_float=True), {})
+
+
+class CommitStream:
+    """
+    Lazy, re-iterable view of the commits of a saved result.
+
+    Every iteration reads the result again: result files are decompressed and parsed incrementally with ijson so that
+    only one commit dict is alive at a time, columnar results are loaded one repository at a time (see
+    columnar_store.load_table). Code that iterates the commits of a repository once per loop, like the CC
+    proportion aggregations of RQ1 and RQ2, thereby runs in memory bounded by the largest repository.
+    """
+
+    def __init__(self, json_file_path, size, columns=None):
+        self.path = json_file_path
+        self.size = size
+        self.columns = None if columns is None else set(columns)
+
+    def __iter__(self):
+        if os.path.isdir(self.path):
+            yield from columnar_store.load_table(self.path, self.columns)['commits']
+            return
+        with open_result(self.path, 'rb') as f:
+            for commit in ijson.items(f, 'commits.item', use_float=True):
+                if self.columns is not None:
+                    commit = {key: value for key, value in commit.items() if key in self.columns}
+                yield commit
+
+    def __len__(self):
+        return self.size
+
+    def to_table(self):
+        """
+        Collects the commits column-wise into a CommitTable, without holding all commit dicts at once.
+        """
+        if os.path.isdir(self.path):
+            return columnar_store.load_table(self.path, self.columns)['commits']
+        return CommitTable.from_commits(iter(self))
+
+
+def stream_repositories_data(json_directory_path, repo_ids=None, columns=None):
+    """
+    Yields the saved results one repository at a time with the summary read up front and the commits streamed on
+    demand (see CommitStream).
+
+    The yielded dicts have the keys of load_repository_data, so analyses over repository data accept them as long
+    as they only iterate the commits.
+
+    Args:
+        json_directory_path (str): Directory of the results.
+        repo_ids (Iterable): Repository IDs to load, all if None.
+        columns (Iterable[str]): Commit keys to stream, all if None.
+    """
+    for path in iter_result_paths(json_directory_path, repo_ids):
+        summary = read_summary(path)
+        yield {
+            "custom_types": list(summary.get('custom_type_distribution', {}).keys()),
+            "cc_types": list(summary.get('cc_type_distribution', {}).keys()),
+            "analysis_summary": summary,
+            "commits": CommitStream(path, summary.get('total_commits', 0), columns)
+        }
+
+
+def convert_results(json_directory_path=COMMIT_ANALYSIS_RESULTS, store=RESULT_STORE, compression=RESULT_COMPRESSION):
+    """
+    Converts the saved results of a directory to the given store ('json' or 'columnar') and compression (of JSON
+    results) and deletes the results in the other formats once they are converted. The sizes before and after are
+    logged.
+
+    Args:
+        json_directory_path (str): Directory of the results.
+        store (str): Target format.
+        compression (str): Target compression of JSON results ('none', 'gzip' or 'zstd').
+
+    Returns:
+        int: Number of converted results.
+    """
+    converted = 0
+    old_size = new_size = 0
+    for path in iter_result_paths(json_directory_path):
+        data = load_repository_data(path, as_table=True)
+        target = get_result_path(data['analysis_summary']['id'], json_directory_path, store, compression)
+        if Path(path) == target:
+            continue
+        old_size += get_result_size(path)
+        save_result(data['commits'], data['analysis_summary'], target)
+        new_size += get_result_size(target)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+        converted += 1
+    logging.info(f"Converted {converted} results in {json_directory_path} to the {store} store "
+                 f"({old_size / 1e6:,.1f} MB -> {new_size / 1e6:,.1f} MB, ratio {old_size / max(new_size, 1):.1f}).")
+    return converted
@@ -0,0 +1,163 @@
+# diff_stats.py
+# Standard library imports
+import json
+import logging
+
+# Third-party library imports
+from git import GitCommandError
+
+# Local imports
+from commit_loader import NUMSTAT_PRETTY, iter_records, parse_numstat_fields
+from constants import DIFF_STATS
+from repository_manager import open_repository
+
+# Number of commit hashes passed to a single 'git log --no-walk' call
+HASHES_PER_CALL = 500
+
+
+def has_diff_stats(commit):
+    """
+    Checks whether a commit already carries its diff stats (commits loaded with LOG_FORMAT 'messages' do not).
+    """
+    return 'files_changed' in commit
+
+
+def load_diff_stats_cache(repo_id):
+    """
+    Loads the cached diff stats of a repository.
+
+    Args:
+        repo_id (int): ID of the repository.
+
+    Returns:
+        dict: Mapping of commit hashes to [files_changed, insertions, deletions].
+    """
+    cache_file = DIFF_STATS / f"{repo_id}.json"
+    if not cache_file.is_file():
+        return {}
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_diff_stats_cache(repo_id, cache):
+    """
+    Saves the diff stats of a repository to its cache file.
+
+    Args:
+        repo_id (int): ID of the repository.
+        cache (dict): Mapping of commit hashes to [files_changed, insertions, deletions].
+    """
+    DIFF_STATS.mkdir(parents=True, exist_ok=True)
+    with open(DIFF_STATS / f"{repo_id}.json", 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+
+
+def compute_diff_stats(repo, hashes):
+    """
+    Computes the diff stats of the given commits with 'git log --no-walk --numstat'.
+
+    Args:
+        repo (Repo): GitPython repository object.
+        hashes (list): Hashes of the commits.
+
+    Returns:
+        dict: Mapping of commit hashes to [files_changed, insertions, deletions].
+    """
+    stats = {}
+    for start in range(0, len(hashes), HASHES_PER_CALL):
+        output = repo.git.log(
+            "--no-walk=unsorted",
+            *hashes[start:start + HASHES_PER_CALL],
+            pretty=NUMSTAT_PRETTY,
+            numstat=True,
+            z=True,
+            stdout_as_string=False
+        )
+        for record in iter_records([output]):
+            fields = record.split(b"\0")
+            if len(fields) < 4:
+                continue
+            stats[fields[0].decode("ascii")] = list(parse_numstat_fields(fields[4:]))
+    return stats
+
+
+def attach_diff_stats(repos, repo_filter=None, commit_filter=None):
+    """
+    Adds diff stats to commits that were loaded without them, computing only what an analysis needs.
+
+    Stats are looked up in the per-repository cache first; missing ones are computed from the existing clone
+    and added to the cache. Commits are updated in place.
+
+    Args:
+        repos (list): Repository data as loaded by load_all_repositories_data.
+        repo_filter (callable): Optional predicate selecting the repositories that need stats.
+        commit_filter (callable): Optional predicate selecting the commits that need stats.
+
+    Raises:
+        FileNotFoundError: If stats are missing and the repository has no clone to compute them from, since the
+            analyses would otherwise silently use commits without stats.
+        GitCommandError: If computing the stats failed.
+    """
+    for repo_data in repos:
+        if repo_filter and not repo_filter(repo_data):
+            continue
+        commits = [commit for commit in repo_data.get('commits', [])
+                   if not has_diff_stats(commit) and (commit_filter is None or commit_filter(commit))]
+        if not commits:
+            continue
+
+        summary = repo_data['analysis_summary']
+        cache = load_diff_stats_cache(summary['id'])
+        missing = [commit['hash'] for commit in commits if commit['hash'] not in cache]
+        if missing:
+            logging.info(f"Computing diff stats of {len(missing)} commits for {summary['name']}.")
+            repo = open_repository(summary)
+            if repo is None:
+                raise FileNotFoundError(
+                    f"Diff stats of {len(missing)} commits of {summary['name']} are neither cached nor computable "
+                    f"without a clone; keep the clones (CC_DISK_BUDGET_GB=0) when using CC_LOG_FORMAT=messages.")
+            try:
+                cache.update(compute_diff_stats(repo, missing))
+            except GitCommandError as e:
+                logging.error(f"Error computing diff stats for {summary['name']}: {e}")
+                raise
+            save_diff_stats_cache(summary['id'], cache)
+
+        set_diff_stats(commits, cache)
+
+
+def set_diff_stats(commits, cache):
+    """
+    Sets the diff stats of the given commits from a diff stats cache.
+
+    Args:
+        commits (Iterable): Commits (dicts or CommitRows), updated in place.
+        cache (dict): Mapping of commit hashes to [files_changed, insertions, deletions].
+
+    Returns:
+        int: Number of commits whose stats were set.
+    """
+    updated = 0
+    for commit in commits:
+        stats = cache.get(commit['hash'])
+        if stats:
+            commit['files_changed'], commit['insertions'], commit['deletions'] = stats
+            updated += 1
+    return updated
+
+
+def apply_cached_diff_stats(repo_data):
+    """
+    Re-applies the cached diff stats of a repository to its commits that were loaded without them, e.g. after the
+    repository was evicted from the repository cache and decoded again. Nothing is computed.
+
+    Args:
+        repo_data (dict): Repository data, updated in place.
+
+    Returns:
+        int: Number of commits whose stats were set.
+    """
+    cache = load_diff_stats_cache(repo_data['analysis_summary']['id'])
+    if not cache:
+        return 0
+    return set_diff_stats((commit for commit in repo_data.get('commits', []) if not has_diff_stats(commit)), cache)
@@ -0,0 +1,92 @@
+# heatmap_report.py
+# Standard library imports
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Third-party library imports
+import numpy as np
+
+# Local imports
+from change_point_detection import HEATMAP_COLUMNS, bin_sequence, render_heatmap
+from commit_table import CommitTable
+from constants import COMMIT_ANALYSIS_RESULTS, PLOTS, PROCESS_WORKERS
+from data_enricher import ADOPTION_COLUMNS, get_cc_sequence
+from data_saver import iter_repositories_data
+
+
+def get_adoption_index(commits, adoption_date):
+    """
+    Returns the index (oldest first) of the first commit on or after the adoption date.
+
+    Args:
+        commits: Enriched commits, newest first, as list of dicts or CommitTable.
+        adoption_date (str): Adoption date ('YYYY-MM-DD...').
+
+    Returns:
+        int: The index, 0 if all commits are older.
+    """
+    if isinstance(commits, CommitTable):
+        days = commits.timestamps[::-1].astype('datetime64[D]')
+    else:
+        days = np.array([commit['committed_datetime'][:10] for commit in reversed(commits)], dtype='datetime64[D]')
+    after_adoption = np.flatnonzero(days >= np.datetime64(adoption_date[:10], 'D'))
+    return int(after_adoption[0]) if len(after_adoption) else 0
+
+
+def prepare_heatmap(repo, max_columns=HEATMAP_COLUMNS):
+    """
+    Bins the CC sequence of an adopting repository for render_heatmap.
+
+    Args:
+        repo (dict): Repository data as loaded by data_saver.load_repository_data.
+        max_columns (int): Maximum number of heatmap columns.
+
+    Returns:
+        tuple: Arguments of render_heatmap, or None if the repository did not adopt CC.
+    """
+    summary = repo['analysis_summary']
+    adoption_date = summary.get('cc_adoption_date')
+    if not adoption_date or not len(repo['commits']):
+        return None
+    columns, scale = bin_sequence(get_cc_sequence(repo['commits']), max_columns)
+    change_point_x = get_adoption_index(repo['commits'], adoption_date) * scale
+    return columns, change_point_x, adoption_date[:10], summary.get('name', str(summary.get('id'))).replace("/", "_")
+
+
+def generate_heatmap_report(results_dir=COMMIT_ANALYSIS_RESULTS, workers=PROCESS_WORKERS,
+                            max_columns=HEATMAP_COLUMNS):
+    """
+    Generates the heatmaps of all repositories that adopted CC in parallel.
+
+    The saved results are read one at a time and only the binned sequences are passed to the rendering processes.
+
+    Args:
+        results_dir (Path): Directory of the saved results.
+        workers (int): Number of rendering processes.
+        max_columns (int): Maximum number of heatmap columns.
+
+    Returns:
+        list: Paths of the generated heatmaps.
+    """
+    PLOTS.mkdir(parents=True, exist_ok=True)
+    paths = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {}
+        for repo in iter_repositories_data(results_dir, as_table=True, columns=ADOPTION_COLUMNS):
+            heatmap = prepare_heatmap(repo, max_columns)
+            if heatmap is not None:
+                futures[pool.submit(render_heatmap, *heatmap)] = heatmap[3]
+
+        for future in as_completed(futures):
+            try:
+                paths.append(future.result())
+            except Exception as e:
+                logging.error(f"Rendering the heatmap of {futures[future]} failed: {e}")
+    logging.info(f"Generated {len(paths)} heatmaps in {PLOTS}.")
+    return paths
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    generate_heatmap_report()
@@ -3,9 +3,14 @@ import colorlog
 
 from RQ1 import analyze_rq1
 from RQ2 import analyze_rq2
-from constants import COMMIT_ANALYSIS_RESULTS
-from data_saver import load_all_repositories_data, load_dataset
+from constants import CLONE_WORKERS, COMMIT_ANALYSIS_RESULTS, PROCESS_WORKERS, WARM_CLASSIFICATION_CACHE
+from data_enricher import classification_cache
+from data_saver import load_dataset
+from parallel_processor import process_repositories_parallel
 from process_repository import process_repository
+from repository_cache import CachedCommits, repository_cache
+from repository_manager import clone_cache
+from scheduler import ProgressTracker, schedule_repositories
 
 
 def main():
@@ -27,6 +32,7 @@ def main():
 
     # Research Question 2 Analysis
     analyze_rq2(repos)
+    repository_cache.log_statistics()
 
 
 def set_logging():
@@ -69,29 +75,46 @@ def setup_environment():
     set_logging()
 
 
-def process_repositories(dataset):
+def process_repositories(dataset, clone_workers=CLONE_WORKERS, process_workers=PROCESS_WORKERS):
     """
     Processes each repository in the dataset.
+
+    With more than one worker, repositories are cloned in a thread pool and analyzed in a process pool;
+    otherwise they are processed one after another, largest first.
+    The classification cache is warmed up from and saved to disk if WARM_CLASSIFICATION_CACHE is set. Existing
+    clones are added to the clone cache, which is kept within the disk budget at the end.
     """
-    for repo_data in dataset:
-        process_repository(repo_data)
+    if WARM_CLASSIFICATION_CACHE:
+        classification_cache.load()
+    clone_cache.seed(dataset)
+
+    if clone_workers > 1 or process_workers > 1:
+        process_repositories_parallel(dataset, clone_workers, process_workers)
+    else:
+        dataset, costs = schedule_repositories(dataset)
+        progress = ProgressTracker(costs)
+        for repo_data in dataset:
+            progress.update(repo_data, process_repository(repo_data))
+    # The clone processed last is kept by clone_repository
+    clone_cache.enforce_budget()
+
+    classification_cache.log_statistics()
+    if WARM_CLASSIFICATION_CACHE:
+        classification_cache.save()
 
 
 def load_enriched_data():
     """
     Loads all enriched repository data and returns summaries and commits.
+
+    The repositories are served by the shared repository cache, which RQ1, RQ2 and the report compiler iterate, so
+    every result file is decoded once per run (as long as the cache's memory cap is not exceeded). The result files
+    are decoded up front by PROCESS_WORKERS processes and the commits of every repository are kept in a compact
+    CommitTable; all commits are returned as one iterable over these tables.
     """
-    repos = load_all_repositories_data(COMMIT_ANALYSIS_RESULTS)
-    summaries = []
-    commits = []
-    for repo in repos:
-        summary = repo.get('analysis_summary')
-        repo_commits = repo.get('commits')
-        if summary:
-            summaries.append(summary)
-        if repo_commits:
-            commits.extend(repo_commits)
-    return repos, summaries, commits
+    repository_cache.clear()
+    repository_cache.preload(workers=PROCESS_WORKERS)
+    return repository_cache, repository_cache.summaries(), CachedCommits(repository_cache)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+# parallel_processor.py
+# Standard library imports
+import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, ProcessPoolExecutor, wait
+
+# Third-party library imports
+import colorlog
+from git import Repo
+
+# Local imports
+from commit_loader import get_commit_log_path, load_commit_log
+from constants import INCREMENTAL, LOGS, WARM_CLASSIFICATION_CACHE
+from data_enricher import classification_cache
+from data_saver import set_summary_index_lock
+from process_repository import analyze_commit_log, analyze_repository, find_result, update_repository
+from repository_manager import (clone_cache, clone_repository, fetch_repository, get_repository_dir, log_error,
+                                set_error_log_lock)
+from scheduler import ProgressTracker, schedule_repositories
+
+
+def configure_worker_logging(worker_name):
+    """
+    Configures logging for a worker so that every line carries the worker name and is written to its own log file.
+
+    Args:
+        worker_name (str): Name used as log prefix and as log file name.
+    """
+    logger = logging.getLogger()
+    logger.setLevel(logging.INFO)
+
+    log_colors = {
+        'DEBUG': 'cyan',
+        'INFO': 'green',
+        'WARNING': 'yellow',
+        'ERROR': 'red',
+        'CRITICAL': 'bold_red',
+    }
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(colorlog.ColoredFormatter(
+        '%(log_color)s [%(levelname)s] [%(processName)s/%(threadName)s] %(message)s', log_colors=log_colors))
+
+    LOGS.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.FileHandler(LOGS / f"{worker_name}.log", encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] [%(threadName)s] %(message)s'))
+
+    logger.handlers = [console_handler, file_handler]
+
+
+def init_analysis_worker(error_log_lock, summary_index_lock):
+    """
+    Initializer of the analysis processes: shares the locks of the error file and the summary index, sets up
+    per-worker logging and warms up the classification cache.
+
+    Args:
+        error_log_lock: Multiprocessing lock guarding the error file.
+        summary_index_lock: Multiprocessing lock guarding the summary index of the results.
+    """
+    set_error_log_lock(error_log_lock)
+    set_summary_index_lock(summary_index_lock)
+    configure_worker_logging(f"worker-{os.getpid()}")
+    if WARM_CLASSIFICATION_CACHE:
+        classification_cache.load()
+
+
+def analyze_cloned_repository(repo_data, repo_path):
+    """
+    Reopens a cloned repository inside a worker process and analyzes it, or updates its existing results.
+
+    Args:
+        repo_data (dict): The metadata of the repository.
+        repo_path (str): Path of the cloned repository.
+
+    Returns:
+        tuple: Number of commits of the repository and the classification cache delta of the worker.
+    """
+    if find_result(repo_data) is not None:
+        commit_count = update_repository(repo_data, Repo(repo_path))
+    else:
+        commit_count = analyze_repository(repo_data, Repo(repo_path))
+    return commit_count, classification_cache.export_delta(with_entries=WARM_CLASSIFICATION_CACHE)
+
+
+def analyze_saved_commit_log(repo_data):
+    """
+    Analyzes a repository whose clone was deleted from its saved commit log inside a worker process.
+
+    Args:
+        repo_data (dict): The metadata of the repository.
+
+    Returns:
+        tuple: Number of commits of the repository (None if no commit log exists) and the classification cache
+        delta of the worker.
+    """
+    commit_log = load_commit_log(repo_data.get("id", 0))
+    commit_count = analyze_commit_log(repo_data, commit_log) if commit_log else None
+    return commit_count, classification_cache.export_delta(with_entries=WARM_CLASSIFICATION_CACHE)
+
+
+def clone_for_analysis(repo_data):
+    """
+    Clones a repository in a cloning thread and returns the path to hand over to an analysis process.
+    Repositories with existing results are fetched instead (incremental mode). The clone is pinned in the clone
+    cache so that it is not evicted before its analysis finished; the caller unpins it unless cloning failed.
+
+    Args:
+        repo_data (dict): The metadata of the repository.
+
+    Returns:
+        str: Path of the cloned repository or None if cloning or fetching failed.
+    """
+    repo_dir = get_repository_dir(repo_data)
+    clone_cache.pin(repo_dir)
+    try:
+        repo = clone_repository(repo_data, show_progress=False)
+        if not repo or (find_result(repo_data) is not None and not fetch_repository(repo)):
+            if not repo:
+                logging.warning(f"Could not clone or load repository {repo_data.get('name')}.")
+            clone_cache.unpin(repo_dir)
+            return None
+        return repo.working_tree_dir or repo.git_dir
+    except BaseException:
+        # No analysis will unpin the clone
+        clone_cache.unpin(repo_dir)
+        raise
+
+
+def process_repositories_parallel(dataset, clone_workers, process_workers, incremental=INCREMENTAL):
+    """
+    Processes the repositories of the dataset in parallel.
+
+    Cloning is network-bound and runs in a thread pool; each finished clone is handed to a process pool that
+    parses and enriches its commits. Repositories are submitted largest first (see scheduler.schedule_repositories)
+    and the throughput and ETA are logged after every processed repository.
+
+    Clones stay pinned in the clone cache until their analysis finished, so at most clone_workers + process_workers
+    repositories are cloned or waiting for their analysis at a time; the next clone is only submitted when one of
+    them is done. This keeps the pinned clones within the disk budget of the clone cache.
+
+    Args:
+        dataset (list): Repository metadata entries.
+        clone_workers (int): Number of cloning threads.
+        process_workers (int): Number of analysis processes.
+        incremental (bool): Whether to update existing results with new commits instead of skipping them.
+    """
+    # Spawn instead of fork: forking while cloning threads hold locks can deadlock the workers
+    mp_context = multiprocessing.get_context("spawn")
+    error_log_lock = mp_context.Lock()
+    set_error_log_lock(error_log_lock)
+    summary_index_lock = mp_context.Lock()
+    set_summary_index_lock(summary_index_lock)
+    configure_worker_logging("main")
+
+    pending = [repo_data for repo_data in dataset if incremental or find_result(repo_data) is None]
+    logging.info(f"{len(dataset) - len(pending)} repositories already processed, {len(pending)} remaining.")
+    pending, costs = schedule_repositories(pending)
+    progress = ProgressTracker(costs)
+
+    # Repositories without results whose clone was evicted are re-analyzed from their commit log
+    from_log = [repo_data for repo_data in pending
+                if find_result(repo_data) is None and not get_repository_dir(repo_data).exists()
+                and get_commit_log_path(repo_data.get("id", 0)).is_file()]
+    from_log_ids = {repo_data.get("id", 0) for repo_data in from_log}
+    pending = [repo_data for repo_data in pending if repo_data.get("id", 0) not in from_log_ids]
+
+    with ProcessPoolExecutor(max_workers=process_workers, mp_context=mp_context, initializer=init_analysis_worker,
+                             initargs=(error_log_lock, summary_index_lock)) as process_pool, \
+            ThreadPoolExecutor(max_workers=clone_workers, thread_name_prefix="clone") as clone_pool:
+        analysis_futures = {process_pool.submit(analyze_saved_commit_log, repo_data): repo_data
+                            for repo_data in from_log}
+        running = set(analysis_futures)
+        clone_futures = {}
+        cloned_analyses = set()
+        to_clone = iter(pending)
+
+        def submit_next_clone():
+            repo_data = next(to_clone, None)
+            if repo_data is not None:
+                future = clone_pool.submit(clone_for_analysis, repo_data)
+                clone_futures[future] = repo_data
+                running.add(future)
+
+        for _ in range(clone_workers + process_workers):
+            submit_next_clone()
+
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            running -= finished
+            for future in finished:
+                if future in clone_futures:
+                    repo_data = clone_futures[future]
+                    try:
+                        repo_path = future.result()
+                    except Exception as e:
+                        logging.error(f"Cloning {repo_data.get('name')} failed: {e}")
+                        log_error(repo_data.get("name"), repo_data.get("clone_url"), str(e),
+                                  repo_data.get("language"))
+                        repo_path = None
+                    if not repo_path:
+                        progress.update(repo_data, None)
+                        submit_next_clone()
+                        continue
+                    analysis_future = process_pool.submit(analyze_cloned_repository, repo_data, repo_path)
+                    analysis_future.add_done_callback(lambda _, repo_dir=get_repository_dir(repo_data):
+                                                      clone_cache.unpin(repo_dir))
+                    analysis_futures[analysis_future] = repo_data
+                    cloned_analyses.add(analysis_future)
+                    running.add(analysis_future)
+                    continue
+
+                repo_data = analysis_futures[future]
+                if future in cloned_analyses:
+                    submit_next_clone()
+                try:
+                    commit_count, cache_delta = future.result()
+                    classification_cache.merge_delta(cache_delta)
+                    progress.update(repo_data, commit_count)
+                except Exception as e:
+                    logging.error(f"Analysis of {repo_data.get('name')} failed: {e}")
+                    log_error(repo_data.get("name"), repo_data.get("clone_url"), str(e), repo_data.get("language"))
+                    progress.update(repo_data, None)
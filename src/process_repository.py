@@ -1,12 +1,16 @@
-from constants import COMMIT_ANALYSIS_RESULTS
-from repository_manager import clone_repository
-from commit_loader import load_commits
-from data_enricher import enrich_commits
-from data_saver import save_to_json
+from constants import INCREMENTAL, KEEP_COMMIT_LOG
+from repository_manager import clone_repository, fetch_repository, get_head_sha, get_repository_dir
+from commit_loader import iter_commits, load_commit_log, save_commit_log
+from commit_table import CommitTable
+from data_enricher import enrich_commit_table, merge_enriched_commits
+from data_saver import find_result_path, get_result_path as get_repository_result_path, load_repository_data, \
+    save_result
+from git import GitCommandError
 from analyzer import search_for_cc_indications
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 from datetime import datetime
+from pathlib import Path
 
 
 def convert_date_format(original_date_str):
@@ -22,7 +26,29 @@ def convert_date_format(original_date_str):
     return formatted_date
 
 
-def process_repository(repo_data: Dict[str, Any]) -> None:
+def get_result_path(repo_data: Dict[str, Any]) -> Path:
+    """
+    Returns the path of the JSON file (or columnar directory, see constants.RESULT_STORE) holding the analysis
+    results of a repository.
+
+    Args:
+        repo_data (Dict[str, Any]): The metadata of the repository.
+    """
+    return get_repository_result_path(repo_data.get('id', 0))
+
+
+def find_result(repo_data: Dict[str, Any]) -> Optional[Path]:
+    """
+    Returns the path of the saved result of a repository in any result format (not only the current one, see
+    get_result_path), or None if the repository was not analyzed yet.
+
+    Args:
+        repo_data (Dict[str, Any]): The metadata of the repository.
+    """
+    return find_result_path(repo_data.get('id', 0))
+
+
+def process_repository(repo_data: Dict[str, Any], incremental: bool = INCREMENTAL) -> Optional[int]:
     """
     Processes a repository by loading, analyzing, and classifying its data.
 
@@ -35,34 +61,101 @@ def process_repository(repo_data: Dict[str, Any]) -> None:
 
     Args:
         repo_data (Dict[str, Any]): The metadata of the repository.
+        incremental (bool): Whether to update existing results with new commits instead of skipping them.
+
+    Returns:
+        Optional[int]: Number of commits of the analyzed repository or None if nothing was analyzed.
     """
     repo_name = repo_data.get("name", "Unknown").replace("/", "_")
-    language = repo_data.get("language", "Unknown")
-    size = repo_data.get("size", 0)
-    repo_id = repo_data.get("id", 0)
-    owner = repo_data.get("owner", {})
-    created_at = convert_date_format(repo_data.get("created_at", ""))
-    homepage = repo_data.get("homepage")
-
-    json_file_path = COMMIT_ANALYSIS_RESULTS / f"{repo_id}.json"
+    json_file_path = get_result_path(repo_data)
 
     logging.info(f"Processing repository {repo_name}...")
 
-    if json_file_path.exists():
-        return
+    if find_result(repo_data) is not None:
+        if incremental:
+            repo = clone_repository(repo_data)
+            if repo and fetch_repository(repo):
+                return update_repository(repo_data, repo)
+        return None
+
+    # Re-analyze from the compact commit log if the clone was deleted to stay within the disk budget
+    if not get_repository_dir(repo_data).exists():
+        commit_log = load_commit_log(repo_data.get("id", 0))
+        if commit_log:
+            return analyze_commit_log(repo_data, commit_log)
 
     logging.info(f"Cloning repository {repo_name}..., {json_file_path} hat nicht existiert")
     # Try to load or clone the repository
     repo = clone_repository(repo_data)
     if not repo:
         logging.warning(f"Could not clone or load repository {repo_name}.")
-        return
+        return None
+
+    return analyze_repository(repo_data, repo)
+
+
+def analyze_repository(repo_data: Dict[str, Any], repo) -> int:
+    """
+    Analyzes an already cloned repository and saves the enriched commits and summary.
+
+    Args:
+        repo_data (Dict[str, Any]): The metadata of the repository.
+        repo (Repo): GitPython repository object of the cloned repository.
+
+    Returns:
+        int: Number of analyzed commits.
+    """
+    repo_name = repo_data.get("name", "Unknown").replace("/", "_")
+    homepage = repo_data.get("homepage")
 
     # Search for indications of Conventional Commits usage
     using_cc = search_for_cc_indications(repo, homepage)
 
     logging.info(f"Loading and analyzing commits for {repo_name}...")
-    commits = load_commits(repo)
+    head_sha = get_head_sha(repo)
+    commits = iter_commits(repo)
+    return analyze_commits(repo_data, commits, using_cc, head_sha, keep_commit_log=KEEP_COMMIT_LOG)
+
+
+def analyze_commit_log(repo_data: Dict[str, Any], commit_log: Dict[str, Any]) -> int:
+    """
+    Analyzes a repository from its compact commit log instead of its clone.
+
+    Args:
+        repo_data (Dict[str, Any]): The metadata of the repository.
+        commit_log (Dict[str, Any]): Commit log loaded by commit_loader.load_commit_log.
+
+    Returns:
+        int: Number of analyzed commits.
+    """
+    logging.info(f"Analyzing commits of {repo_data.get('name')} from its commit log...")
+    return analyze_commits(repo_data, commit_log["commits"], commit_log["cc_indication"], commit_log["head_sha"])
+
+
+def analyze_commits(repo_data: Dict[str, Any], commits, using_cc: bool, head_sha: str,
+                    keep_commit_log: bool = False) -> int:
+    """
+    Enriches the loaded commits of a repository and saves them together with the summary.
+
+    Args:
+        repo_data (Dict[str, Any]): The metadata of the repository.
+        commits (Iterable[Dict[str, Any]]): Loaded commits, newest first.
+        using_cc (bool): Whether indications of Conventional Commits usage were found.
+        head_sha (str): Hash of the analyzed head.
+        keep_commit_log (bool): Whether to also save a compact commit log for re-analysis without the clone.
+
+    Returns:
+        int: Number of analyzed commits.
+    """
+    repo_name = repo_data.get("name", "Unknown").replace("/", "_")
+    language = repo_data.get("language", "Unknown")
+    size = repo_data.get("size", 0)
+    repo_id = repo_data.get("id", 0)
+    owner = repo_data.get("owner", {})
+    created_at = convert_date_format(repo_data.get("created_at", ""))
+
+    json_file_path = get_result_path(repo_data)
+
     summary = {
         "language": language,
         "size": size,
@@ -74,13 +167,64 @@ def process_repository(repo_data: Dict[str, Any]) -> None:
         "overall_cc_adoption_rate": 0,
         "is_consistently_conventional": False,
         "cc_indication": using_cc,
+        "head_sha": head_sha,
     }
 
     # Add additional metadata to the summary
-    enriched_commits, enriched_summary = enrich_commits(commits, summary)
+    enriched_commits, enriched_summary = enrich_commit_table(CommitTable.from_commits(commits), summary)
 
     # Save the data for further analysis
-    save_to_json(enriched_commits, enriched_summary, json_file_path)
+    save_result(enriched_commits, enriched_summary, json_file_path)
+    if keep_commit_log:
+        save_commit_log(enriched_commits, repo_id, head_sha, using_cc)
+    return len(enriched_commits)
+
+
+def update_repository(repo_data: Dict[str, Any], repo) -> int:
+    """
+    Updates the saved results of a repository with the commits added since its last analysis.
+
+    Only '<last analyzed head>..<current head>' is loaded and enriched; the new commits and counters are merged
+    into the existing result and the adoption date is recomputed from the merged commit sequence. Results without
+    a stored head and rewritten histories are analyzed from scratch.
+
+    Args:
+        repo_data (Dict[str, Any]): The metadata of the repository.
+        repo (Repo): GitPython repository object, already fetched.
+
+    Returns:
+        int: Number of commits in the updated result.
+    """
+    repo_name = repo_data.get("name", "Unknown").replace("/", "_")
+    # The result is updated in the format it was saved in
+    json_file_path = find_result(repo_data)
+    result = load_repository_data(json_file_path)
+    summary = result["analysis_summary"]
+
+    old_sha = summary.get("head_sha")
+    new_sha = get_head_sha(repo)
+    if new_sha is None or old_sha == new_sha:
+        logging.info(f"Repository {repo_name} is up to date.")
+        return len(result["commits"])
+
+    try:
+        is_fast_forward = old_sha is not None and repo.is_ancestor(old_sha, new_sha)
+    except GitCommandError:
+        is_fast_forward = False
+    if not is_fast_forward:
+        logging.info(f"Cannot update {repo_name} incrementally, analyzing the whole history.")
+        return analyze_repository(repo_data, repo)
+
+    logging.info(f"Loading commits {old_sha[:8]}..{new_sha[:8]} for {repo_name}...")
+    summary["cc_indication"] = search_for_cc_indications(repo, repo_data.get("homepage"))
+    new_commits = iter_commits(repo, revision_range=f"{old_sha}..{new_sha}")
+    enriched_commits, enriched_summary = merge_enriched_commits(new_commits, result["commits"], summary)
+    enriched_summary["head_sha"] = new_sha
+
+    save_result(enriched_commits, enriched_summary, json_file_path)
+    if KEEP_COMMIT_LOG:
+        save_commit_log(enriched_commits, summary["id"], new_sha, summary["cc_indication"])
+    return len(enriched_commits)
 
 
 # def process_repository(repo_data: Dict[str, Any]) -> None:
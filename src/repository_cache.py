@@ -0,0 +1,151 @@
+# repository_cache.py
+# Standard library imports
+import logging
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+# Local imports
+from constants import COMMIT_ANALYSIS_RESULTS, REPOSITORY_CACHE_MB
+from data_saver import find_result_path, iter_repositories_data, iter_result_paths, load_repository_data, load_summaries
+from diff_stats import apply_cached_diff_stats
+from result_compression import strip_result_suffix
+
+
+class RepositoryCache:
+    """
+    Process-wide registry of the saved results, keyed by repository ID, so that RQ1, RQ2 and the report compiler
+    share one decoded copy of every result.
+
+    Repositories are decoded on first access, with their commits in a CommitTable, and kept until the memory cap is
+    exceeded; then the least recently used ones are evicted (and decoded again if they are needed later). Summaries
+    are loaded from the summary index (see data_saver.load_summaries) without decoding any commits and are never
+    evicted. Iterating the cache yields all repositories in the order of data_saver.iter_repositories_data.
+    """
+
+    def __init__(self, results_dir=COMMIT_ANALYSIS_RESULTS, max_mb=REPOSITORY_CACHE_MB):
+        self.results_dir = Path(results_dir)
+        self.max_bytes = max_mb * 1e6
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.total_bytes = 0
+        self.repo_ids = None
+        self.summary_list = None
+        self.decodes = Counter()
+        self.hits = 0
+        self.misses = 0
+
+    def ids(self):
+        """
+        Returns the IDs (as strings) of all saved results, sorted like data_saver.iter_result_paths.
+        """
+        if self.repo_ids is None:
+            self.repo_ids = [strip_result_suffix(Path(path).name) for path in iter_result_paths(self.results_dir)]
+        return self.repo_ids
+
+    def summaries(self):
+        """
+        Returns the analysis summaries of all saved results, loaded once from the summary index.
+        """
+        if self.summary_list is None:
+            self.summary_list = load_summaries(self.results_dir)
+        return self.summary_list
+
+    def get(self, repo_id):
+        """
+        Returns the repository data of a repository, decoding its result on first access.
+
+        Args:
+            repo_id: ID of the repository.
+
+        Returns:
+            dict: Repository data like data_saver.load_repository_data with as_table=True, None without a result.
+        """
+        repo_id = str(repo_id)
+        repo = self.entries.get(repo_id)
+        if repo is not None:
+            self.hits += 1
+            self.entries.move_to_end(repo_id)
+            return repo
+        self.misses += 1
+        path = find_result_path(repo_id, self.results_dir)
+        if path is None:
+            return None
+        repo = load_repository_data(path, as_table=True)
+        self.add(repo_id, repo)
+        return repo
+
+    def add(self, repo_id, repo):
+        # Diff stats attached by an analysis (see diff_stats.attach_diff_stats) are not part of the result file, so
+        # they are restored from their cache when an evicted repository is decoded again
+        apply_cached_diff_stats(repo)
+        self.decodes[repo_id] += 1
+        self.entries[repo_id] = repo
+        self.sizes[repo_id] = repo['commits'].nbytes()
+        self.total_bytes += self.sizes[repo_id]
+        # The added repository itself is kept even if it exceeds the cap on its own
+        while self.max_bytes and self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            evicted, _ = self.entries.popitem(last=False)
+            self.total_bytes -= self.sizes.pop(evicted)
+
+    def preload(self, workers=1):
+        """
+        Decodes the results that are not cached yet in parallel (see data_saver.iter_repositories_data), as many as
+        fit under the memory cap.
+
+        Args:
+            workers (int): Number of decoding processes.
+        """
+        missing = [repo_id for repo_id in self.ids() if repo_id not in self.entries]
+        if not missing:
+            return
+        repos = iter_repositories_data(self.results_dir, as_table=True, repo_ids=missing, workers=workers)
+        for repo_id, repo in zip(missing, repos):
+            self.add(repo_id, repo)
+            if self.max_bytes and self.total_bytes >= self.max_bytes:
+                repos.close()
+                logging.info(f"Repository cache full after preloading {len(self.entries)} repositories.")
+                break
+
+    def clear(self):
+        """
+        Forgets all repositories and summaries, e.g. after the results were updated.
+        """
+        self.entries.clear()
+        self.sizes.clear()
+        self.total_bytes = 0
+        self.repo_ids = None
+        self.summary_list = None
+
+    def log_statistics(self):
+        decoded_again = sum(1 for count in self.decodes.values() if count > 1)
+        logging.info(f"Repository cache: {self.hits} hits, {self.misses} misses, {len(self.entries)} repositories "
+                     f"({self.total_bytes / 1e6:,.0f} MB), {decoded_again} decoded more than once.")
+
+    def __iter__(self):
+        for repo_id in self.ids():
+            repo = self.get(repo_id)
+            if repo is not None:
+                yield repo
+
+    def __len__(self):
+        return len(self.ids())
+
+
+class CachedCommits:
+    """
+    All commits of the repositories of a RepositoryCache as one iterable, like commit_table.CommitChain but loading
+    the repositories through the cache.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __iter__(self):
+        for repo in self.cache:
+            yield from repo['commits']
+
+    def __len__(self):
+        return sum(summary.get('total_commits', 0) for summary in self.cache.summaries())
+
+
+repository_cache = RepositoryCache()
@@ -1,18 +1,34 @@
 # Standard library imports
+import json
 import logging
 import os
 import shutil
 import stat
+import threading
+import time
 from pathlib import Path
 
 # Third-party library imports
 import requests
-from git import Repo, GitCommandError
+from git import Repo, GitCommandError, InvalidGitRepositoryError
 from git.remote import RemoteProgress
 from tqdm import tqdm
 
 # Local imports
-from constants import ERROR, GITHUB_TOKEN, TEMP
+from analyzer import HUSKY_DIR, INDICATOR_PATHS
+from constants import (CLONE_STRATEGY, DISK_BUDGET_GB, ERROR, GITHUB_TOKEN, MIRROR_DIR, MIRROR_REFERENCE, OFFLINE,
+                       TEMP)
+from data_saver import find_result_path
+
+# Additional 'git clone' options per clone strategy:
+# - full: complete clone with a checked-out working tree
+# - blobless: partial clone with commit and tree objects only; blobs are fetched on demand
+# - bare: blobless partial clone without a working tree; indicator files are read from the object database
+CLONE_OPTIONS = {
+    'full': [],
+    'blobless': ['--filter=blob:none', '--no-checkout'],
+    'bare': ['--bare', '--filter=blob:none'],
+}
 
 
 class CloneProgress(RemoteProgress):
@@ -31,6 +47,136 @@ class CloneProgress(RemoteProgress):
         self.pbar.refresh()  # Refresh to display the current progress
 
 
+class CloneCache:
+    """
+    Keeps the clones in TEMP within a disk budget.
+
+    The size and last use of every clone are tracked in an index file. Once the budget is exceeded, the least
+    recently used clones whose results are already saved are deleted. Pinned clones (e.g. clones still being
+    analyzed) are never deleted.
+    """
+
+    def __init__(self, budget_bytes, index_path):
+        self.budget_bytes = budget_bytes
+        self.index_path = Path(index_path)
+        self.lock = threading.Lock()
+        self.pinned = set()
+        self.entries = self.load_index()
+
+    def load_index(self):
+        """Loads the index and drops clones that no longer exist."""
+        if not self.index_path.is_file():
+            return {}
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        return {repo_dir: entry for repo_dir, entry in entries.items() if Path(repo_dir).exists()}
+
+    def save_index(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+
+    def touch(self, repo_dir, repo_id):
+        """
+        Records the current size and the use of a clone.
+
+        Args:
+            repo_dir (Path): Directory of the clone.
+            repo_id (int): ID of the repository, used to check whether its results are saved.
+        """
+        size = get_directory_size(repo_dir)
+        with self.lock:
+            self.entries[str(repo_dir)] = {'repo_id': repo_id, 'size': size, 'last_used': time.time()}
+            self.save_index()
+
+    def pin(self, repo_dir):
+        with self.lock:
+            self.pinned.add(str(repo_dir))
+
+    def unpin(self, repo_dir):
+        """
+        Releases a pinned clone, e.g. after its analysis finished, and deletes clones over the budget (which may
+        include it now).
+        """
+        with self.lock:
+            self.pinned.discard(str(repo_dir))
+        self.enforce_budget()
+
+    def seed(self, repos):
+        """
+        Adds the existing clones of repositories that are not in the index yet, e.g. clones made before the disk
+        budget was set, so that they count towards the budget. Their last use is the modification time of the clone.
+
+        Args:
+            repos (Iterable[dict]): Repository metadata containing "id", "name" and "language".
+        """
+        if not self.budget_bytes:
+            return
+        added = {}
+        for repo in repos:
+            repo_dir = get_repository_dir(repo)
+            if str(repo_dir) not in self.entries and repo_dir.is_dir():
+                added[str(repo_dir)] = {'repo_id': repo.get("id"), 'size': get_directory_size(repo_dir),
+                                        'last_used': repo_dir.stat().st_mtime}
+        if added:
+            with self.lock:
+                self.entries.update(added)
+                self.save_index()
+            logging.info(f"Added {len(added)} existing clones to the clone cache.")
+
+    def total_size(self):
+        return sum(entry['size'] for entry in self.entries.values())
+
+    def enforce_budget(self, keep=()):
+        """
+        Deletes least recently used clones with saved results until the total size fits the budget.
+
+        Args:
+            keep (Iterable[Path]): Clones that must not be deleted in addition to the pinned ones.
+
+        Returns:
+            list: Directories of the deleted clones.
+        """
+        if not self.budget_bytes:
+            return []
+        evicted = []
+        with self.lock:
+            protected = self.pinned | {str(repo_dir) for repo_dir in keep}
+            total_size = self.total_size()
+            for repo_dir, entry in sorted(self.entries.items(), key=lambda item: item[1]['last_used']):
+                if total_size <= self.budget_bytes:
+                    break
+                if repo_dir in protected or find_result_path(entry['repo_id']) is None:
+                    continue
+                logging.info(f"Disk budget exceeded. Deleting clone {repo_dir} ({entry['size'] / 1e6:.1f} MB).")
+                if Path(repo_dir).exists():
+                    shutil.rmtree(repo_dir, onerror=handle_remove_readonly)
+                total_size -= entry['size']
+                evicted.append(repo_dir)
+            for repo_dir in evicted:
+                del self.entries[repo_dir]
+            self.save_index()
+        return evicted
+
+
+def get_directory_size(path):
+    """
+    Returns the total size in bytes of all files below a directory.
+    """
+    total_size = 0
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            try:
+                total_size += os.lstat(os.path.join(root, file)).st_size
+            except OSError:
+                pass  # File removed while walking
+    return total_size
+
+
+# Shared by all cloning threads of a run
+clone_cache = CloneCache(DISK_BUDGET_GB * 1024 ** 3, Path(TEMP) / "clone_cache.json")
+
+
 def handle_remove_readonly(func, path):
     """
     Remove the 'read-only' attribute from files or directories to allow deletion.
@@ -43,10 +189,25 @@ def handle_remove_readonly(func, path):
     func(path)  # Attempt to remove the file or directory
 
 
+# Lock guarding the error file; replaced by a multiprocessing lock in worker processes
+_error_log_lock = threading.Lock()
+
+
+def set_error_log_lock(lock):
+    """
+    Replaces the lock guarding the error file, e.g. with a lock shared between worker processes.
+
+    Args:
+        lock: A lock object supporting the context manager protocol (e.g. multiprocessing.Lock).
+    """
+    global _error_log_lock
+    _error_log_lock = lock
+
+
 # Function to log errors during the cloning or processing of repositories
 def log_error(repo_name, repo_url, error_message, language):
     """
-    Logs errors to a predefined error file.
+    Logs errors to a predefined error file. Safe to call from several threads and processes.
 
     Args:
         repo_name (str): Name of the repository.
@@ -54,8 +215,10 @@ def log_error(repo_name, repo_url, error_message, language):
         error_message (str): Error message to be logged.
         language (str): Programming language of the repository.
     """
-    with ERROR.open("a") as f:
-        f.write(f"Repository: {repo_name}, URL: {repo_url}, Error: {error_message}, Language: {language}\n")
+    line = f"Repository: {repo_name}, URL: {repo_url}, Error: {error_message}, Language: {language}\n"
+    with _error_log_lock:
+        with ERROR.open("a") as f:
+            f.write(line)
 
 
 def clone_wiki_repository(repo, repo_dir, repo_name):
@@ -72,8 +235,17 @@ def clone_wiki_repository(repo, repo_dir, repo_name):
         wiki_url = repo["clone_url"].replace(".git", ".wiki.git")  # Generate the wiki URL
         wiki_dir = repo_dir / ".wiki"  # Define directory for the cloned wiki
 
+        wiki_mirror = find_mirror(wiki_url)
         if wiki_dir.exists():
             logging.info(f"Wiki repository for {repo['name']} already exists.")
+        elif wiki_mirror:
+            logging.info(f"Cloning wiki for {repo['name']} from mirror {wiki_mirror}")
+            try:
+                Repo.clone_from(str(wiki_mirror), wiki_dir, multi_options=local_clone_options(wiki_mirror))
+            except GitCommandError as e:
+                logging.warning(f"Error cloning the wiki mirror for {repo_name}: {e}")
+        elif OFFLINE:
+            logging.info(f"No wiki mirror for {repo['name']} found. Skipping wiki in offline mode.")
         else:
             logging.info(f"Attempting to clone wiki for {repo['name']} from {wiki_url}")
             try:
@@ -102,27 +274,229 @@ def clone_wiki_repository(repo, repo_dir, repo_name):
                 # Continue processing even if wiki cloning fails
 
 
-def clone_repository(repo):
+def get_mirror_name(repo_url):
+    """
+    Derives the '<owner>/<name>' path of a repository from its clone URL.
+
+    Args:
+        repo_url (str): Clone URL, e.g. https://github.com/owner/name.git.
+
+    Returns:
+        str: Relative mirror path without suffix, e.g. 'owner/name'.
+    """
+    path = repo_url.rstrip("/")
+    if path.endswith(".git"):
+        path = path[:-len(".git")]
+    return "/".join(path.replace("\\", "/").split("/")[-2:])
+
+
+def find_mirror(repo_url):
+    """
+    Looks up a local mirror of a repository in MIRROR_DIR.
+
+    A mirror is either a bare repository '<owner>/<name>.git' (e.g. created by mirror_repository or
+    'git clone --mirror') or a bundle '<owner>/<name>.bundle' (created by 'git bundle create ... --all').
+
+    Args:
+        repo_url (str): Clone URL of the repository.
+
+    Returns:
+        Path: Path of the mirror, or None if no mirror directory is configured or no mirror exists.
+    """
+    if not MIRROR_DIR:
+        return None
+    mirror_name = get_mirror_name(repo_url)
+    for candidate in (Path(MIRROR_DIR) / f"{mirror_name}.git", Path(MIRROR_DIR) / f"{mirror_name}.bundle"):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def local_clone_options(mirror):
+    """
+    Returns the clone options for cloning from a local mirror.
+
+    Clones of bare mirrors use '--shared', so they store no objects of their own and borrow them from the
+    mirror through git alternates. Bundles are unpacked into the clone.
+
+    Args:
+        mirror (Path): Path of the mirror.
+    """
+    return [] if mirror.suffix == ".bundle" else ["--shared"]
+
+
+def mirror_repository(repo, reference=MIRROR_REFERENCE):
+    """
+    Creates or updates the local mirror of a repository in MIRROR_DIR.
+
+    With a reference repository, objects it already contains are neither downloaded nor stored again, so
+    forks and repositories with shared histories store their common objects once.
+
+    Args:
+        repo (dict): Repository metadata including "clone_url".
+        reference (str): Optional path of a repository whose objects are borrowed via alternates.
+
+    Returns:
+        Path: Path of the mirror, or None if mirroring failed.
+    """
+    if not MIRROR_DIR:
+        raise ValueError("MIRROR_DIR is not configured (set CC_MIRROR_DIR).")
+    mirror_dir = Path(MIRROR_DIR) / f"{get_mirror_name(repo['clone_url'])}.git"
+    try:
+        if mirror_dir.exists():
+            logging.info(f"Updating mirror {mirror_dir}")
+            Repo(mirror_dir).git.remote("update", "--prune")
+        else:
+            logging.info(f"Mirroring {repo['clone_url']} into {mirror_dir}")
+            options = ["--mirror"] + (["--reference-if-able", str(reference)] if reference else [])
+            Repo.clone_from(repo["clone_url"], mirror_dir, multi_options=options)
+        return mirror_dir
+    except GitCommandError as e:
+        logging.warning(f"Error mirroring repository {repo['name']}: {e}")
+        log_error(repo["name"], repo["clone_url"], str(e), repo.get("language"))
+        return None
+
+
+def resolve_clone_source(repo_url, clone_strategy):
+    """
+    Determines where to clone a repository from and with which options.
+
+    Local mirrors are preferred over the network. Partial clone filters are dropped for them, since clones
+    of bare mirrors share the mirror's objects anyway.
+
+    Args:
+        repo_url (str): Clone URL of the repository.
+        clone_strategy (str): One of CLONE_OPTIONS.
+
+    Returns:
+        Tuple[str, list]: The clone source and the clone options, or (None, None) if the repository has no
+        mirror in offline mode.
+    """
+    options = list(CLONE_OPTIONS[clone_strategy])
+    mirror = find_mirror(repo_url)
+    if mirror:
+        options = [option for option in options if not option.startswith("--filter")]
+        return str(mirror), options + local_clone_options(mirror)
+    if OFFLINE:
+        return None, None
+    if MIRROR_REFERENCE:
+        options += ["--reference-if-able", str(MIRROR_REFERENCE)]
+    return repo_url, options
+
+
+def checkout_indicator_files(repo_instance):
+    """
+    Checks out only the files needed to detect Conventional Commit indications in a partial clone.
+
+    A sparse checkout restricted to the indicator files makes git fetch just their blobs from the remote.
+
+    Args:
+        repo_instance (Repo): Repository cloned with the 'blobless' strategy.
+    """
+    patterns = [f"/{path}/" if path == HUSKY_DIR else f"/{path}" for path in INDICATOR_PATHS]
+    repo_instance.git.sparse_checkout("set", "--no-cone", *patterns)
+    repo_instance.git.read_tree("-mu", "HEAD")
+
+
+def get_repository_dir(repo):
+    """
+    Returns the directory a repository is cloned into.
+
+    Args:
+        repo (dict): Repository metadata or analysis summary containing "name" and "language".
+
+    Returns:
+        Path: Directory of the clone, organized by language.
+    """
+    # If language is specified, use it in the directory name; otherwise, use "Language_Unknown" as fallback
+    repo_language = f"Language-{repo['language']}" if repo["language"] else "Language_Unknown"
+    return Path(TEMP) / repo_language / repo["name"]
+
+
+def open_repository(repo):
+    """
+    Opens an existing clone of a repository without cloning it.
+
+    Args:
+        repo (dict): Repository metadata or analysis summary containing "name" and "language".
+
+    Returns:
+        Repo instance if the clone exists and can be loaded; None otherwise.
+    """
+    repo_dir = get_repository_dir(repo)
+    if not repo_dir.exists():
+        logging.warning(f"No clone of {repo['name']} found in {repo_dir}.")
+        return None
+    try:
+        repo_instance = Repo(repo_dir)
+        clone_cache.touch(repo_dir, repo.get("id"))
+        return repo_instance
+    except (GitCommandError, InvalidGitRepositoryError) as e:
+        logging.warning(f"Error loading repository {repo['name']}: {e}")
+        return None
+
+
+def get_head_sha(repo_instance):
+    """
+    Returns the hash of the commit the checked-out branch points to, or None for empty repositories.
+    """
+    try:
+        return repo_instance.head.commit.hexsha
+    except ValueError:
+        return None
+
+
+def fetch_repository(repo_instance):
+    """
+    Fetches new commits of the checked-out branch and moves the local branch to the fetched head.
+
+    Partial clones keep their filter, so only commit and tree objects are transferred. Histories rewritten on
+    the remote are taken over as well; the caller detects them by comparing hashes.
+
+    Args:
+        repo_instance (Repo): Repository instance to update.
+
+    Returns:
+        bool: True if the repository was updated, False otherwise.
+    """
+    try:
+        branch = repo_instance.active_branch.name
+        repo_instance.git.fetch("origin", branch)
+        if repo_instance.bare:
+            repo_instance.git.update_ref(f"refs/heads/{branch}", "FETCH_HEAD")
+        else:
+            repo_instance.git.reset("--hard", "FETCH_HEAD")
+        return True
+    except (GitCommandError, TypeError) as e:
+        logging.warning(f"Error fetching repository {repo_instance.git_dir}: {e}")
+        return False
+
+
+def clone_repository(repo, show_progress=True, clone_strategy=CLONE_STRATEGY):
     """
     Clones a repository or loads it if it already exists.
 
     Args:
         repo (dict): A dictionary containing repository metadata, including "name", "clone_url", and "language".
+        show_progress (bool): Whether to display a progress bar while cloning (disabled for parallel runs).
+        clone_strategy (str): One of CLONE_OPTIONS; 'blobless' avoids downloading file contents.
 
     Returns:
         Repo instance if successful; None if cloning/loading fails.
     """
+    if clone_strategy not in CLONE_OPTIONS:
+        raise ValueError(f"Unknown clone strategy '{clone_strategy}', expected one of {list(CLONE_OPTIONS)}")
+
     repo_name = repo["name"]
     repo_url = repo["clone_url"]
-    # If language is specified, use it in the directory name; otherwise, use "Language_Unknown" as fallback
-    repo_language = f"Language-{repo['language']}" if repo["language"] else "Language_Unknown"
+    # Define the final directory for the cloned repository and a temporary directory for cloning
+    repo_dir = get_repository_dir(repo)
+    repo_language = repo_dir.parent.name
 
     # Create a subfolder for each language, organizing repos by language
-    language_dir = Path(TEMP) / repo_language
+    language_dir = repo_dir.parent
     language_dir.mkdir(parents=True, exist_ok=True)
 
-    # Define the final directory for the cloned repository and a temporary directory for cloning
-    repo_dir = language_dir / repo_name
     repo_dir_temp = language_dir / f"{repo_name}_temp"
 
     if repo_dir.exists():
@@ -142,7 +516,13 @@ def clone_repository(repo):
             logging.warning(f"Incomplete repository found. Deleting temporary directory {repo_dir_temp}")
             shutil.rmtree(repo_dir_temp, onerror=handle_remove_readonly)
 
-        logging.info(f"Cloning {repo_name} from {repo_url} into {language_dir}")
+        clone_source, clone_options = resolve_clone_source(repo_url, clone_strategy)
+        if clone_source is None:
+            logging.warning(f"No mirror of {repo_name} found in {MIRROR_DIR}. Skipping in offline mode.")
+            log_error(repo_name, repo_url, "No local mirror in offline mode", repo_language)
+            return None
+
+        logging.info(f"Cloning {repo_name} from {clone_source} into {language_dir}")
         try:
             # Set environment variables to ensure UTF-8 encoding is handled properly
             env = os.environ.copy()
@@ -150,7 +530,12 @@ def clone_repository(repo):
             env['PYTHONIOENCODING'] = 'utf-8'
 
             # Clone the repository into the temporary directory
-            Repo.clone_from(repo_url, repo_dir_temp, progress=CloneProgress(), env=env)
+            progress = CloneProgress() if show_progress else None
+            cloned = Repo.clone_from(clone_source, repo_dir_temp, progress=progress, env=env,
+                                     multi_options=clone_options)
+            if clone_strategy == 'blobless':
+                checkout_indicator_files(cloned)
+            cloned.close()
             # Rename the temporary directory to the final directory
             os.rename(repo_dir_temp, repo_dir)
             # Reload the cloned repository as a Repo instance
@@ -158,7 +543,7 @@ def clone_repository(repo):
         except GitCommandError as e:
             # Catch Git errors, such as repository unavailability or cloning failures
             logging.warning(f"Error cloning repository {repo_name}: {e}")
-            log_error(repo_name, repo_url, repo_language, str(e))
+            log_error(repo_name, repo_url, str(e), repo_language)
             if "Repository not found" in str(e) or "Repository disabled" in str(e):
                 logging.warning(f"The repository {repo_name} is either disabled or no longer available.")
             else:
@@ -168,4 +553,9 @@ def clone_repository(repo):
     # Attempt to clone the repository's wiki if it exists
     clone_wiki_repository(repo, repo_dir, repo_name)
 
+    # Keep the clones within the disk budget
+    if repo_instance is not None:
+        clone_cache.touch(repo_dir, repo.get("id"))
+        clone_cache.enforce_budget(keep=[repo_dir])
+
     return repo_instance  # Return the Repo instance, whether cloned or loaded
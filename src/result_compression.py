@@ -0,0 +1,172 @@
+# result_compression.py
+# Standard library imports
+import gzip
+import io
+import json
+import logging
+import random
+from functools import lru_cache
+
+# Third-party library imports
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Local imports
+from constants import COMMIT_ANALYSIS_RESULTS, ZSTD_DICTIONARIES, ZSTD_DICTIONARY
+
+# File name suffix of the JSON results per compression
+RESULT_SUFFIXES = {'none': '.json', 'gzip': '.json.gz', 'zstd': '.json.zst'}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+# Size of the trained zstd dictionary in bytes
+ZSTD_DICTIONARY_SIZE = 112640
+# Maximum size of a zstd frame header, which holds the ID of the dictionary a result was compressed with
+ZSTD_FRAME_HEADER_SIZE = 18
+
+
+def get_compression(file_path):
+    """
+    Returns the compression of a JSON result from its file name, or None if it is no JSON result.
+    """
+    name = str(file_path)
+    for compression, suffix in sorted(RESULT_SUFFIXES.items(), key=lambda item: -len(item[1])):
+        if name.endswith(suffix):
+            return compression
+    return None
+
+
+def strip_result_suffix(file_name):
+    """
+    Returns the file name of a JSON result without its suffix, i.e. the repository ID.
+    """
+    compression = get_compression(file_name)
+    return file_name[:-len(RESULT_SUFFIXES[compression])] if compression else file_name
+
+
+def require_zstandard():
+    if zstandard is None:
+        raise ImportError("Results compressed with zstd need the zstandard package (pip install zstandard).")
+
+
+@lru_cache(maxsize=1)
+def load_zstd_dictionary():
+    """
+    Returns the current zstd dictionary in ZSTD_DICTIONARY, which new results are compressed with, or None if no
+    dictionary was trained.
+    """
+    require_zstandard()
+    if not ZSTD_DICTIONARY.is_file():
+        return None
+    return zstandard.ZstdCompressionDict(ZSTD_DICTIONARY.read_bytes())
+
+
+@lru_cache(maxsize=None)
+def load_zstd_dictionary_by_id(dict_id):
+    """
+    Returns the zstd dictionary with the given ID from ZSTD_DICTIONARIES, where every trained dictionary is kept.
+
+    Raises:
+        FileNotFoundError: If the dictionary is missing, since results compressed with it cannot be read without it.
+    """
+    require_zstandard()
+    path = ZSTD_DICTIONARIES / f"{dict_id}.dict"
+    if not path.is_file():
+        raise FileNotFoundError(f"The zstd dictionary {dict_id} is missing ({path}).")
+    return zstandard.ZstdCompressionDict(path.read_bytes())
+
+
+def read_zstd_dictionary(file):
+    """
+    Returns the dictionary a zstd compressed file was written with (None if it was written without one), read from
+    the dictionary ID in its frame header. The file position is reset to the start.
+    """
+    dict_id = zstandard.get_frame_parameters(file.read(ZSTD_FRAME_HEADER_SIZE)).dict_id
+    file.seek(0)
+    return load_zstd_dictionary_by_id(dict_id) if dict_id else None
+
+
+def open_result(file_path, mode='r'):
+    """
+    Opens a JSON result for reading or writing, compressing and decompressing it on the fly according to its suffix.
+
+    Reading decompresses the file as a stream, so result files can be parsed incrementally (e.g. with ijson) without
+    holding the decompressed file in memory.
+
+    Args:
+        file_path (Path): Path of the result file.
+        mode (str): 'r' or 'w' (text) or 'rb' (bytes, e.g. for ijson).
+
+    Returns:
+        A file object.
+    """
+    compression = get_compression(file_path)
+    if compression == 'gzip':
+        return gzip.open(file_path, mode if 'b' in mode else mode + 't', encoding=None if 'b' in mode else 'utf-8',
+                         **({'compresslevel': GZIP_LEVEL} if 'w' in mode else {}))
+    if compression == 'zstd':
+        require_zstandard()
+        if 'w' in mode:
+            # The ID of the dictionary is written to the frame header, so the file is read with the same dictionary
+            # after a new one was trained
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=load_zstd_dictionary(),
+                                                  write_dict_id=True)
+            return io.TextIOWrapper(compressor.stream_writer(open(file_path, 'wb')), encoding='utf-8')
+        file = open(file_path, 'rb')
+        try:
+            dictionary = read_zstd_dictionary(file)
+        except Exception:
+            file.close()
+            raise
+        reader = zstandard.ZstdDecompressor(dict_data=dictionary).stream_reader(file, closefd=True)
+        return reader if 'b' in mode else io.TextIOWrapper(reader, encoding='utf-8')
+    return open(file_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'}))
+
+
+def train_zstd_dictionary(repos, path=ZSTD_DICTIONARY, dict_size=ZSTD_DICTIONARY_SIZE, max_samples=100_000, seed=42,
+                          archive_dir=ZSTD_DICTIONARIES):
+    """
+    Trains the zstd dictionary of the result files on commit records sampled evenly from saved results.
+
+    The dictionary replaces the current one for the results written afterwards. Results compressed with a dictionary
+    can only be decompressed with it, so every dictionary is also kept as '<dict_id>.dict' in archive_dir, from
+    where open_result loads it by the ID in the frame header.
+
+    Args:
+        repos (Iterable[dict]): Repository data, e.g. from data_saver.stream_repositories_data.
+        path (Path): Path of the current dictionary.
+        dict_size (int): Size of the dictionary in bytes.
+        max_samples (int): Maximum number of sampled commits.
+        seed (int): Seed of the sampling.
+        archive_dir (Path): Directory of all trained dictionaries.
+
+    Returns:
+        Path: Path of the dictionary.
+    """
+    require_zstandard()
+    repos = list(repos)
+    per_repo = max(1, max_samples // max(1, len(repos)))
+    rng = random.Random(seed)
+    samples = []
+    for repo in repos:
+        commits = list(repo['commits'])
+        for commit in rng.sample(commits, min(per_repo, len(commits))):
+            samples.append(json.dumps(dict(commit)).encode('utf-8'))
+
+    dictionary = zstandard.train_dictionary(dict_size, samples)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    (archive_dir / f"{dictionary.dict_id()}.dict").write_bytes(dictionary.as_bytes())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(dictionary.as_bytes())
+    load_zstd_dictionary.cache_clear()
+    logging.info(f"Trained the zstd dictionary {dictionary.dict_id()} of {len(dictionary.as_bytes())} bytes on "
+                 f"{len(samples)} commits.")
+    return path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    # Imported here because data_saver reads and writes its results through this module
+    from data_saver import stream_repositories_data
+    train_zstd_dictionary(stream_repositories_data(COMMIT_ANALYSIS_RESULTS))
@@ -0,0 +1,142 @@
+# scheduler.py
+# Standard library imports
+import json
+import logging
+import statistics
+import threading
+import time
+from datetime import timedelta
+
+# Local imports
+from constants import COMMIT_COUNTS
+
+# Commits per KB of repository size assumed before any commit counts are known
+DEFAULT_COMMITS_PER_KB = 0.1
+
+
+def load_commit_counts():
+    """
+    Loads the commit counts recorded by earlier runs.
+
+    Returns:
+        dict: Mapping of repository IDs (as strings) to their number of commits.
+    """
+    if not COMMIT_COUNTS.is_file():
+        return {}
+    with open(COMMIT_COUNTS, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_commit_counts(commit_counts):
+    """
+    Saves the commit counts of the processed repositories for the cost estimates of later runs.
+
+    Args:
+        commit_counts (dict): Mapping of repository IDs (as strings) to their number of commits.
+    """
+    COMMIT_COUNTS.parent.mkdir(parents=True, exist_ok=True)
+    with open(COMMIT_COUNTS, 'w', encoding='utf-8') as f:
+        json.dump(commit_counts, f)
+
+
+def fit_commits_per_kb(dataset, commit_counts):
+    """
+    Estimates the number of commits per KB of repository size from the repositories with known commit counts.
+
+    Args:
+        dataset (list): Repository metadata entries.
+        commit_counts (dict): Known commit counts by repository ID.
+
+    Returns:
+        float: Median ratio of commits to size, or DEFAULT_COMMITS_PER_KB if no ratio is known.
+    """
+    ratios = [commit_counts[str(repo_data.get("id"))] / repo_data["size"] for repo_data in dataset
+              if str(repo_data.get("id")) in commit_counts and repo_data.get("size")]
+    return statistics.median(ratios) if ratios else DEFAULT_COMMITS_PER_KB
+
+
+def estimate_cost(repo_data, commit_counts, commits_per_kb):
+    """
+    Predicts the processing cost of a repository as its number of commits.
+
+    The commit count of an earlier run is used when known, otherwise it is extrapolated from the repository size.
+
+    Args:
+        repo_data (dict): The metadata of the repository.
+        commit_counts (dict): Known commit counts by repository ID.
+        commits_per_kb (float): Commits per KB of repository size.
+
+    Returns:
+        float: Predicted number of commits.
+    """
+    known_count = commit_counts.get(str(repo_data.get("id")))
+    if known_count is not None:
+        return known_count
+    return (repo_data.get("size") or 0) * commits_per_kb
+
+
+def schedule_repositories(dataset, commit_counts=None):
+    """
+    Orders the repositories by predicted cost, largest first (longest-processing-time-first), so that the
+    largest repositories do not end up alone at the end of a parallel run.
+
+    Args:
+        dataset (list): Repository metadata entries.
+        commit_counts (dict): Known commit counts by repository ID; loaded from COMMIT_COUNTS if not given.
+
+    Returns:
+        tuple: (ordered list of repository metadata, dict of predicted costs by repository ID)
+    """
+    if commit_counts is None:
+        commit_counts = load_commit_counts()
+    commits_per_kb = fit_commits_per_kb(dataset, commit_counts)
+    costs = {repo_data.get("id"): estimate_cost(repo_data, commit_counts, commits_per_kb) for repo_data in dataset}
+    return sorted(dataset, key=lambda repo_data: costs[repo_data.get("id")], reverse=True), costs
+
+
+class ProgressTracker:
+    """
+    Reports the throughput and the estimated remaining time of a run and records the commit counts of the
+    processed repositories.
+
+    The ETA assumes that the remaining predicted cost is processed at the rate observed so far.
+    """
+
+    def __init__(self, costs, commit_counts=None):
+        self.costs = costs
+        self.commit_counts = load_commit_counts() if commit_counts is None else commit_counts
+        self.total_cost = sum(costs.values())
+        self.done_cost = 0
+        self.done_commits = 0
+        self.done = 0
+        self.start = time.monotonic()
+        self.lock = threading.Lock()
+
+    def update(self, repo_data, commit_count):
+        """
+        Records a processed repository and logs the progress.
+
+        Args:
+            repo_data (dict): The metadata of the processed repository.
+            commit_count (int): Number of commits of the repository, or None if it was not analyzed.
+        """
+        with self.lock:
+            self.done += 1
+            cost = self.costs.get(repo_data.get("id"), 0)
+            if commit_count is None:
+                # Skipped or failed repositories take no time and must not lower the ETA
+                self.total_cost -= cost
+            else:
+                self.done_cost += cost
+                self.done_commits += commit_count
+                self.commit_counts[str(repo_data.get("id"))] = commit_count
+                save_commit_counts(self.commit_counts)
+
+            elapsed = time.monotonic() - self.start
+            throughput = self.done_commits / elapsed if elapsed else 0
+            if self.done_cost:
+                eta = timedelta(seconds=round(elapsed * (self.total_cost - self.done_cost) / self.done_cost))
+            else:
+                eta = "unknown"
+            logging.info(f"[{self.done}/{len(self.costs)}] Processed {repo_data.get('name')} "
+                         f"({throughput:,.0f} commits/s, ETA {eta}).")
@@ -0,0 +1,182 @@
+# sensitivity.py
+# Standard library imports
+import itertools
+import logging
+
+# Third-party library imports
+import numpy as np
+import pandas as pd
+from ruptures.exceptions import BadSegmentationParameters
+
+# Local imports
+from change_point_detection import find_change_points
+from constants import (CHANGE_POINT_ENGINE, CHANGE_POINT_MODE, COMMIT_ANALYSIS_RESULTS, CONSISTENT_CC_RATE,
+                       MIN_CC_COMMITS_FOR_ANALYSIS, MIN_CC_RATE, MIN_CC_RATE_FOR_ANALYSIS, MIN_COMMITS_AFTER_CP,
+                       SENSITIVITY_SWEEP)
+from data_enricher import ADOPTION_COLUMNS, get_cc_sequence
+from data_saver import iter_repositories_data
+
+# Thresholds of the adoption detection, in the order of the columns of the sweep table
+THRESHOLDS = ("consistent_cc_rate", "min_cc_rate_for_analysis", "min_cc_commits_for_analysis",
+              "min_commits_after_cp", "min_cc_rate")
+BASELINE_THRESHOLDS = dict(zip(THRESHOLDS, (CONSISTENT_CC_RATE, MIN_CC_RATE_FOR_ANALYSIS, MIN_CC_COMMITS_FOR_ANALYSIS,
+                                            MIN_COMMITS_AFTER_CP, MIN_CC_RATE)))
+DEFAULT_SWEEP_GRID = {
+    "consistent_cc_rate": [70, 80, 90],
+    "min_cc_rate_for_analysis": [0.05, 0.10, 0.20],
+    "min_cc_commits_for_analysis": [250, 500, 1000],
+    "min_commits_after_cp": [25, 50, 100],
+    "min_cc_rate": [0.4, 0.5, 0.6],
+}
+
+
+def to_day(date_string):
+    """
+    Converts an ISO date or datetime string to a datetime64 day (NaT for None).
+    """
+    return np.datetime64(date_string[:10], 'D') if date_string else np.datetime64('NaT', 'D')
+
+
+def collect_adoption_statistics(repos, engine=CHANGE_POINT_ENGINE, mode=CHANGE_POINT_MODE):
+    """
+    Reduces every repository to the figures all adoption decisions are made from: its commit counts, its single
+    change point and the prefix sums at it. The change point does not depend on any threshold, so it is detected
+    once per repository, with the change point engine of the analysis.
+
+    Args:
+        repos (Iterable[dict]): Repository data, e.g. from data_saver.iter_repositories_data.
+        engine (str): Change point engine, 'prefix_sum' or 'ruptures' (see change_point_detection.find_change_points).
+        mode (str): Change point mode; only 'single' is supported, since with several change points the adoption
+            date itself depends on the thresholds (see change_point_detection.PeltSegmenter.adoption_index).
+
+    Returns:
+        pd.DataFrame: One row per repository.
+
+    Raises:
+        ValueError: If the change point mode is not 'single'.
+    """
+    if mode != 'single':
+        raise ValueError(f"The sensitivity sweep only supports CHANGE_POINT_MODE 'single', not '{mode}'.")
+    rows = []
+    for repo in repos:
+        summary = repo['analysis_summary']
+        commits = repo['commits']
+        sequence = get_cc_sequence(commits)
+        prefix_sums = np.concatenate(([0], np.cumsum(sequence, dtype=np.int64)))
+
+        try:
+            change_points = find_change_points(sequence, engine)
+        except BadSegmentationParameters:
+            # Like with the prefix sum engine, sequences too short for ruptures have no change point
+            change_points = [len(sequence)]
+        change_point = change_points[0] if len(change_points) > 1 else -1
+        rows.append({
+            'id': summary.get('id'),
+            'total_commits': len(sequence),
+            'cc_type_commits': int(prefix_sums[-1]),
+            'change_point': change_point,
+            'commits_after_cp': len(sequence) - change_point if change_point >= 0 else 0,
+            'cc_commits_after_cp': int(prefix_sums[-1] - prefix_sums[change_point]) if change_point >= 0 else 0,
+            'change_point_date': to_day(commits[len(commits) - 1 - change_point]['committed_datetime']
+                                        if change_point >= 0 else None),
+            'created_date': to_day(summary.get('created_at')),
+        })
+    logging.info(f"Collected the adoption statistics of {len(rows)} repositories.")
+    return pd.DataFrame(rows, columns=['id', 'total_commits', 'cc_type_commits', 'change_point', 'commits_after_cp',
+                                       'cc_commits_after_cp', 'change_point_date', 'created_date'])
+
+
+def decide_adoption(statistics, consistent_cc_rate, min_cc_rate_for_analysis, min_cc_commits_for_analysis,
+                    min_commits_after_cp, min_cc_rate):
+    """
+    Applies the adoption criteria of data_enricher.summarize_classification with the given thresholds to all
+    repositories at once.
+
+    Args:
+        statistics (dict): Columns of collect_adoption_statistics as NumPy arrays.
+
+    Returns:
+        tuple: Whether each repository is consistently conventional, whether it adopted CC and its adoption date.
+    """
+    total_commits = statistics['total_commits']
+    cc_type_commits = statistics['cc_type_commits']
+    commits_after_cp = statistics['commits_after_cp']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cc_rate = np.where(total_commits > 0, cc_type_commits / total_commits, 0.0)
+        cc_rate_after_cp = np.where(commits_after_cp > 0, statistics['cc_commits_after_cp'] / commits_after_cp, 0.0)
+
+    consistent = cc_rate * 100 >= consistent_cc_rate
+    analyzed = ~consistent & (total_commits > 0) & ((cc_rate >= min_cc_rate_for_analysis)
+                                                    | (cc_type_commits >= min_cc_commits_for_analysis))
+    adopted_after_cp = (analyzed & (statistics['change_point'] >= 0) & (cc_type_commits > 0)
+                        & (commits_after_cp >= min_commits_after_cp) & (cc_rate_after_cp >= min_cc_rate))
+
+    adoption_dates = np.where(consistent, statistics['created_date'], statistics['change_point_date'])
+    adopted = (consistent | adopted_after_cp) & ~np.isnat(adoption_dates)
+    return consistent, adopted, adoption_dates
+
+
+def sweep_thresholds(statistics, grid=None, baseline=None):
+    """
+    Evaluates the adoption decisions over a grid of thresholds and compares them with the baseline thresholds.
+
+    Args:
+        statistics (pd.DataFrame): Output of collect_adoption_statistics.
+        grid (dict): Values per threshold (see THRESHOLDS); missing thresholds keep their baseline value.
+        baseline (dict): Thresholds the date shifts refer to, by default the ones in constants.py.
+
+    Returns:
+        pd.DataFrame: One row per grid point with the number of adopting repositories, the repositories gained and
+        lost against the baseline and the shifts of the adoption dates (in days) of repositories adopting in both.
+    """
+    grid = {**{name: [value] for name, value in BASELINE_THRESHOLDS.items()}, **(grid or DEFAULT_SWEEP_GRID)}
+    baseline = {**BASELINE_THRESHOLDS, **(baseline or {})}
+    columns = {name: statistics[name].to_numpy() for name in statistics.columns}
+
+    _, base_adopted, base_dates = decide_adoption(columns, **baseline)
+    rows = []
+    for values in itertools.product(*(grid[name] for name in THRESHOLDS)):
+        thresholds = dict(zip(THRESHOLDS, values))
+        consistent, adopted, adoption_dates = decide_adoption(columns, **thresholds)
+
+        both = adopted & base_adopted
+        shifts = (adoption_dates[both] - base_dates[both]) // np.timedelta64(1, 'D')
+        rows.append({
+            **thresholds,
+            'adopted_repos': int(adopted.sum()),
+            'consistently_conventional': int((adopted & consistent).sum()),
+            'adopted_after_change_point': int((adopted & ~consistent).sum()),
+            'gained': int((adopted & ~base_adopted).sum()),
+            'lost': int((base_adopted & ~adopted).sum()),
+            'shifted': int(np.count_nonzero(shifts)),
+            'mean_shift_days': float(shifts.mean()) if len(shifts) else 0.0,
+            'median_shift_days': float(np.median(shifts)) if len(shifts) else 0.0,
+            'max_abs_shift_days': int(np.abs(shifts).max()) if len(shifts) else 0,
+        })
+    return pd.DataFrame(rows)
+
+
+def run_sensitivity_sweep(results_dir=COMMIT_ANALYSIS_RESULTS, grid=None, output_path=SENSITIVITY_SWEEP):
+    """
+    Reads the saved results once and writes the sensitivity table of the adoption thresholds to a CSV file.
+
+    Args:
+        results_dir (Path): Directory of the saved results.
+        grid (dict): Values per threshold, DEFAULT_SWEEP_GRID if None.
+        output_path (Path): Path of the CSV file.
+
+    Returns:
+        pd.DataFrame: The sweep table.
+    """
+    statistics = collect_adoption_statistics(iter_repositories_data(results_dir, as_table=True,
+                                                                         columns=ADOPTION_COLUMNS))
+    sweep = sweep_thresholds(statistics, grid)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    sweep.to_csv(output_path, index=False)
+    logging.info(f"Evaluated {len(sweep)} threshold combinations, saved to {output_path}.")
+    return sweep
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_sensitivity_sweep()
@@ -0,0 +1,60 @@
+# conftest.py
+# Standard library imports
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Third-party library imports
+import pytest
+
+# The modules live flat in src/ and import each other by name
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Local imports
+from data_enricher import CC_TYPES  # noqa: E402
+
+
+def build_commits(n_commits, repo_id=0, types=('feat', 'fix', 'docs'), enriched=True, stats=False):
+    """
+    Returns synthetic commits, newest first, one hour apart. The commit types are cycled through types (None for
+    unconventional commits); enriched commits carry the classification keys and stats adds diff stats.
+    """
+    commits = []
+    for index in range(n_commits):
+        commit_type = types[index % len(types)]
+        commit = {'hash': f"{repo_id:08x}{index:032x}",
+                  'committed_datetime': (datetime(2020, 1, 1) + timedelta(hours=n_commits - 1 - index)).isoformat(),
+                  'author': f"author{index % 7}",
+                  'message': f"{commit_type}: change {index}" if commit_type else f"Update file {index}"}
+        if stats:
+            commit.update({'insertions': index % 11, 'deletions': index % 5, 'files_changed': 1 + index % 3})
+        if enriched:
+            commit.update({'is_conventional': commit_type is not None,
+                           'cc_type': commit_type if commit_type in CC_TYPES else None,
+                           'custom_type': commit_type if commit_type and commit_type not in CC_TYPES else None})
+        commits.append(commit)
+    return commits
+
+
+def build_result(repo_id, n_commits=5, types=('feat', 'fix', 'docs')):
+    """
+    Returns synthetic enriched commits and a matching analysis summary, as passed to data_saver.save_result.
+    """
+    commits = build_commits(n_commits, repo_id, types)
+    cc_types = Counter(commit['cc_type'] for commit in commits if commit['cc_type'])
+    custom_types = Counter(commit['custom_type'] for commit in commits if commit['custom_type'])
+    summary = {'id': repo_id, 'name': f"owner/repo{repo_id}", 'language': "Python", 'created_at': "2020-01-01",
+               'total_commits': len(commits), 'cc_type_distribution': dict(cc_types),
+               'custom_type_distribution': dict(custom_types)}
+    return commits, summary
+
+
+@pytest.fixture
+def make_commits():
+    return build_commits
+
+
+@pytest.fixture
+def make_result():
+    return build_result
@@ -0,0 +1,87 @@
+# test_change_point_detection.py
+import numpy as np
+import pytest
+import ruptures as rpt
+from ruptures.exceptions import BadSegmentationParameters
+
+import data_enricher
+from change_point_detection import (JUMP, MIN_SEGMENT_SIZE, PeltSegmenter, detect_change_points_batch,
+                                    detect_single_change_point, find_change_points, pack_sequences)
+from constants import PELT_PENALTY
+
+
+def random_sequences(n_sequences=200, max_length=400, seed=0):
+    rng = np.random.default_rng(seed)
+    sequences = []
+    for _ in range(n_sequences):
+        length = int(rng.integers(2 * MIN_SEGMENT_SIZE + JUMP, max_length))
+        adoption = int(rng.integers(0, length))
+        rates = np.where(np.arange(length) < adoption, rng.random() * 0.5, 0.5 + rng.random() * 0.5)
+        sequences.append((rng.random(length) < rates).astype(int))
+    return sequences
+
+
+@pytest.mark.parametrize("sequence", random_sequences(), ids=lambda sequence: f"{len(sequence)}")
+def test_prefix_sum_matches_ruptures(sequence):
+    assert find_change_points(sequence, engine='prefix_sum') == find_change_points(sequence, engine='ruptures')
+
+
+@pytest.mark.parametrize("sequence", [
+    np.zeros(40, dtype=int),
+    np.ones(40, dtype=int),
+    np.ones(7, dtype=int),
+    # Ties: symmetric sequences with equal gains at several change points
+    np.array([0] * 10 + [1] * 10 + [0] * 10),
+    np.array([1] * 10 + [0] * 10 + [1] * 10),
+    np.tile([0, 1], 25),
+    np.tile([0, 0, 1, 1, 1], 20),
+], ids=["zeros", "ones", "shortest", "tie_0", "tie_1", "alternating", "periodic"])
+def test_prefix_sum_matches_ruptures_on_edge_cases(sequence):
+    assert find_change_points(sequence, engine='prefix_sum') == find_change_points(sequence, engine='ruptures')
+
+
+@pytest.mark.parametrize("length", range(2 * MIN_SEGMENT_SIZE + 2))
+def test_too_short_sequences_have_no_change_point(length):
+    sequence = np.arange(length) % 2
+    with pytest.raises(BadSegmentationParameters):
+        find_change_points(sequence, engine='ruptures')
+    assert find_change_points(sequence, engine='prefix_sum') == [length]
+
+
+@pytest.mark.parametrize("sequence", random_sequences(50), ids=lambda sequence: f"{len(sequence)}")
+def test_pelt_segmenter_matches_ruptures(sequence):
+    expected = rpt.Pelt(model="l2", min_size=MIN_SEGMENT_SIZE, jump=JUMP).fit(sequence).predict(pen=PELT_PENALTY)
+
+    assert PeltSegmenter().append(sequence).breakpoints() == expected
+
+
+@pytest.mark.parametrize("sequence", random_sequences(20, seed=1), ids=lambda sequence: f"{len(sequence)}")
+def test_restored_pelt_segmenter_matches_fresh_run(sequence, tmp_path, monkeypatch):
+    monkeypatch.setattr(data_enricher, 'CHANGE_POINTS', tmp_path)
+    monkeypatch.setattr(data_enricher, 'CHANGE_POINT_MODE', 'multi')
+    fresh = PeltSegmenter().append(sequence)
+
+    # Analyze the sequence in three runs that each continue the state saved by the previous one
+    splits = sorted(np.random.default_rng(len(sequence)).integers(0, len(sequence), 2).tolist())
+    segmenter = data_enricher.restore_segmenter({'id': 1})
+    for end in splits + [len(sequence)]:
+        segmenter.append(sequence[segmenter.n_samples:end])
+        data_enricher.save_change_point_state(1, segmenter.to_dict())
+        segmenter = data_enricher.restore_segmenter({'id': 1, 'total_commits': end})
+        assert segmenter.n_samples == end
+
+    assert segmenter.breakpoints() == fresh.breakpoints()
+    assert segmenter.adoption_index() == fresh.adoption_index()
+
+
+def test_batch_detection_matches_single_detection():
+    sequences = random_sequences() + [np.zeros(40, dtype=int), np.ones(40, dtype=int), np.tile([0, 1], 25),
+                                      np.array([0] * 10 + [1] * 10 + [0] * 10)]
+    sequences += [np.arange(length) % 2 for length in range(2 * MIN_SEGMENT_SIZE + JUMP + 1)]
+    sequences.insert(0, [])
+    expected = [detect_single_change_point(sequence) for sequence in sequences]
+
+    change_points = detect_change_points_batch(*pack_sequences(sequences))
+
+    assert change_points.tolist() == [points[0] if len(points) == 2 else -1 for points in expected]
+    assert detect_change_points_batch(*pack_sequences([])).tolist() == []
@@ -0,0 +1,134 @@
+# test_commit_loader.py
+import datetime
+
+import pytest
+from git import Git, Repo
+
+from commit_loader import iter_commits
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = Repo.init(tmp_path / "repo")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "author")
+        config.set_value("user", "email", "author@example.com")
+    path = tmp_path / "repo" / "file.txt"
+
+    def commit(message, content=None, **kwargs):
+        if content is not None:
+            path.write_text(content)
+            repo.git.add(path.name)
+        repo.git.commit(m=message, **kwargs)
+
+    commit("feat: first", "1\n")
+    commit("chore: empty", allow_empty=True)
+    default_branch = repo.active_branch.name
+    repo.git.checkout(b="side")
+    (tmp_path / "repo" / "side.txt").write_text("side\n")
+    repo.git.add("side.txt")
+    commit("fix: side")
+    repo.git.checkout(default_branch)
+    commit("feat: second", "1\n2\n")
+    repo.git.merge("side", no_edit=True)
+    commit("chore: empty again", allow_empty=True)
+    return repo
+
+
+@pytest.mark.parametrize("log_format", ["shortstat", "numstat", "messages"])
+def test_formats_skip_merge_and_empty_commits(repo, log_format):
+    messages = [commit['message'] for commit in iter_commits(repo, log_format=log_format)]
+
+    assert sorted(messages) == ["feat: first", "feat: second", "fix: side"]
+
+
+@pytest.mark.parametrize("log_format", ["shortstat", "numstat", "messages"])
+def test_closing_the_stream_kills_git(repo, log_format, monkeypatch):
+    processes = []
+    execute = Git.execute
+
+    def spy_execute(self, *args, **kwargs):
+        processes.append(execute(self, *args, **kwargs))
+        return processes[-1]
+
+    monkeypatch.setattr(Git, 'execute', spy_execute)
+    commits = iter_commits(repo, log_format=log_format)
+    next(commits)
+    commits.close()
+
+    assert processes[0].proc.poll() is not None
+
+
+@pytest.fixture
+def history(tmp_path):
+    repo = Repo.init(tmp_path / "history")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "author")
+        config.set_value("user", "email", "author@example.com")
+    root = tmp_path / "history"
+
+    def commit(message, files=None):
+        for name, content in (files or {}).items():
+            path = root / name
+            if content is None:
+                repo.git.rm(name)
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content)
+            repo.git.add(name)
+        repo.git.commit(m=message, allow_empty=not files)
+
+    commit("feat: first", {"a.txt": "1\n2\n3\n", "b.txt": "b\n"})
+    commit("feat: multi-line message\n\nWith a body\nover several lines.", {"a.txt": "1\n2\n4\n5\n"})
+    commit("chore: binary file", {"logo.png": b"\x89PNG\0\x01\x02" * 100})
+    commit("fix: binary and text file", {"logo.png": b"\x89PNG\0\x03" * 100, "b.txt": "b\nc\n"})
+    commit("chore: empty")
+    commit("refactor: move a file", {"b.txt": None, "docs/b.txt": "b\nc\n"})
+    commit("docs: ümlaut ✓ subject", {"docs/notes.md": "# Notes\n", "a.txt": None})
+    return repo
+
+
+def legacy_commits(repo):
+    """
+    Loads the commits with GitPython's repo.iter_commits and commit.stats, like the loader did before the log was
+    parsed directly.
+    """
+    commits = []
+    for commit in repo.iter_commits(no_merges=True):
+        total = commit.stats.total
+        if total['files'] == 0:
+            continue
+        commits.append({
+            'hash': commit.hexsha,
+            'committed_datetime': datetime.datetime.utcfromtimestamp(commit.committed_date).isoformat(),
+            'message': commit.summary.strip(),
+            'author': commit.author.name,
+            'insertions': total['insertions'],
+            'deletions': total['deletions'],
+            'files_changed': total['files'],
+        })
+    return commits
+
+
+@pytest.mark.parametrize("log_format", ["numstat", "messages"])
+def test_formats_match_legacy_loader(history, log_format):
+    # commit.stats never detects renames
+    with history.config_writer() as config:
+        config.set_value("diff", "renames", "false")
+    commits = list(iter_commits(history, log_format=log_format))
+
+    keys = commits[0].keys()
+    expected = [{key: commit[key] for key in keys} for commit in legacy_commits(history)]
+    assert commits == expected
+    assert [commit['message'] for commit in commits][-2:] == ["feat: multi-line message", "feat: first"]
+
+
+def test_numstat_counts_renames_like_shortstat(history):
+    commits = list(iter_commits(history, log_format="numstat"))
+
+    assert commits == list(iter_commits(history, log_format="shortstat"))
+    moved = next(commit for commit in commits if commit['message'] == "refactor: move a file")
+    assert (moved['files_changed'], moved['insertions'], moved['deletions']) == (1, 0, 0)
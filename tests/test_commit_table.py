@@ -0,0 +1,21 @@
+# test_commit_table.py
+import pytest
+
+from commit_table import CommitTable
+
+
+@pytest.mark.parametrize("as_stream", [False, True])
+def test_from_commits_uses_the_keys_of_all_commits(as_stream, make_commits):
+    commits = make_commits(3, enriched=False, stats=True)
+    # The newest commit was loaded without diff stats and hash, the oldest one has an extra key
+    commits[0] = {key: commits[0][key] for key in ('committed_datetime', 'message', 'author')}
+    commits[2]['branch'] = "main"
+    table = CommitTable.from_commits(iter(commits) if as_stream else commits)
+
+    assert table.keys == ['committed_datetime', 'message', 'author', 'hash', 'insertions', 'deletions',
+                          'files_changed', 'branch']
+    restored = table.to_commits()
+    assert restored[1:] == [{**commit, 'branch': commit.get('branch')} for commit in commits[1:]]
+    assert restored[0]['hash'] == "0" * 40
+    assert 'insertions' not in restored[0]
+    assert restored[0]['branch'] is None
@@ -0,0 +1,89 @@
+# test_data_enricher.py
+import pytest
+
+import change_point_detection
+import data_enricher
+from benchmarks import legacy_classify_commit_message
+from commit_table import CommitTable
+from data_enricher import (CC_CLASS, CUSTOM_CLASS, classify_commit_message, enrich_commit_table,
+                           get_classification_prefix, merge_enriched_commits)
+
+
+def test_change_point_state_is_saved_outside_the_summary(tmp_path, monkeypatch, make_commits):
+    monkeypatch.setattr(data_enricher, 'CHANGE_POINT_MODE', 'multi')
+    monkeypatch.setattr(change_point_detection, 'CHANGE_POINT_MODE', 'multi')
+    monkeypatch.setattr(data_enricher, 'CHANGE_POINTS', tmp_path)
+    commits = (make_commits(400, types=('feat',), enriched=False, stats=True)
+               + make_commits(200, types=(None,), enriched=False, stats=True))
+    metadata = {'id': 1, 'name': "owner/repo", 'created_at': "2020-01-01"}
+
+    enriched, summary = enrich_commit_table(CommitTable.from_commits(commits), metadata)
+
+    assert 'change_point_state' not in summary
+    state = data_enricher.load_change_point_state(1)
+    assert state['n_samples'] == summary['total_commits'] == 600
+
+    # An update continues the saved state with the new commits only
+    new_commits = make_commits(100, types=('fix',), enriched=False, stats=True)
+    _, merged_summary = merge_enriched_commits(new_commits, enriched.to_commits(), summary)
+    assert 'change_point_state' not in merged_summary
+    assert data_enricher.load_change_point_state(1)['n_samples'] == merged_summary['total_commits'] == 700
+    assert merged_summary['cc_adoption_date'] == summary['cc_adoption_date']
+
+
+def test_change_point_state_is_deleted_in_single_mode(tmp_path, monkeypatch, make_commits):
+    monkeypatch.setattr(data_enricher, 'CHANGE_POINTS', tmp_path)
+    data_enricher.save_change_point_state(1, {'n_samples': 10})
+    commits = make_commits(20, enriched=False, stats=True)
+
+    enrich_commit_table(CommitTable.from_commits(commits), {'id': 1, 'name': "owner/repo", 'created_at': "2020-01-01"})
+
+    assert data_enricher.load_change_point_state(1) is None
+
+
+def test_classification_cache_stays_bounded():
+    prefixes = [f"type{index}: a" for index in range(10)]
+    cache = data_enricher.ClassificationCache(maxsize=3, record_new_entries=True)
+    for prefix in prefixes:
+        cache.classify(prefix)
+    assert list(cache.entries) == list(cache.new_entries) == prefixes[-3:]
+    assert [prefix for prefix, _ in cache.export_delta()['entries']] == prefixes[-3:]
+
+    cache = data_enricher.ClassificationCache(maxsize=3, record_new_entries=False)
+    for prefix in prefixes:
+        cache.classify(prefix)
+    assert len(cache.entries) == 3
+    assert not cache.new_entries
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("feat: add option", ("feat", None, False, CC_CLASS)),
+    ("fix(parser): handle empty input", ("fix", "parser", False, CC_CLASS)),
+    ("feat(api)!: drop v1", ("feat", "api", True, CC_CLASS)),
+    ("refactor!: rename module", ("refactor", None, True, CC_CLASS)),
+    ("chore( deps ): bump lib", ("chore", "deps", False, CC_CLASS)),
+    ("docs(ui.button-x): describe", ("docs", "ui.button-x", False, CC_CLASS)),
+    ("feat: subject\n\nBody: with a colon", ("feat", None, False, CC_CLASS)),
+    # Uppercase types and scopes
+    ("FEAT: shout", ("feat", None, False, CC_CLASS)),
+    ("Fix(Core): mixed case", ("fix", "core", False, CC_CLASS)),
+    # Custom types
+    ("release: 1.0.0", ("release", None, False, CUSTOM_CLASS)),
+    ("WIP: stuff", ("wip", None, False, CUSTOM_CLASS)),
+    ("deps(npm)!: bump major", ("deps", "npm", True, CUSTOM_CLASS)),
+    # Unconventional messages
+    ("Update README.md", (None, None, False, None)),
+    ("feat:missing space", (None, None, False, None)),
+    ("feat: ", (None, None, False, None)),
+    ("feat(): empty scope", (None, None, False, None)),
+    ("feat(a/b): slash in scope", (None, None, False, None)),
+    ("fix 2: type with digits", (None, None, False, None)),
+    ("Merge branch 'main': sync", (None, None, False, None)),
+    ("", (None, None, False, None)),
+])
+def test_classify_commit_message(message, expected):
+    commit_type, _, _, commit_class = expected
+
+    assert classify_commit_message(message) == expected
+    assert classify_commit_message(get_classification_prefix(message)) == expected
+    assert legacy_classify_commit_message(message) == (commit_type, commit_class)
@@ -0,0 +1,38 @@
+# test_data_saver.py
+import logging
+
+from data_saver import find_result_path, get_result_path, iter_result_paths, load_repository_data, save_result
+
+
+def test_find_result_path_in_other_format(tmp_path, make_result):
+    save_result(*make_result(1), get_result_path(1, tmp_path, 'json', 'gzip'))
+
+    assert not get_result_path(1, tmp_path, 'json', 'none').exists()
+    assert find_result_path(1, tmp_path) == tmp_path / "1.json.gz"
+    assert find_result_path(2, tmp_path) is None
+
+
+def test_iter_result_paths_warns_about_several_formats(tmp_path, caplog, make_result):
+    for store, compression in (('json', 'gzip'), ('json', 'none'), ('columnar', 'none')):
+        save_result(*make_result(1), get_result_path(1, tmp_path, store, compression))
+    save_result(*make_result(2), get_result_path(2, tmp_path, 'json', 'gzip'))
+
+    with caplog.at_level(logging.WARNING):
+        paths = iter_result_paths(tmp_path)
+
+    assert paths == [str(find_result_path(1, tmp_path)), str(find_result_path(2, tmp_path))]
+    assert paths[0] == str(tmp_path / "1")
+    assert "Repository 1 has results in several formats" in caplog.text
+    assert "Repository 2" not in caplog.text
+
+
+def test_load_repository_data_selects_keys_missing_in_first_commit(tmp_path, make_result):
+    commits, summary = make_result(1)
+    del commits[0]['cc_type']
+    path = save_result(commits, summary, get_result_path(1, tmp_path, 'json', 'none'))
+
+    loaded = load_repository_data(path, columns=['cc_type'])['commits']
+    table = load_repository_data(path, as_table=True, columns=['cc_type'])['commits']
+
+    assert loaded == [{}] + [{'cc_type': commit['cc_type']} for commit in commits[1:]]
+    assert table.column('cc_type') == [None] + [commit['cc_type'] for commit in commits[1:]]
@@ -0,0 +1,27 @@
+# test_diff_stats.py
+import pytest
+
+import diff_stats
+from diff_stats import attach_diff_stats
+
+
+def test_missing_clone_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(diff_stats, 'DIFF_STATS', tmp_path / "diff_stats")
+    monkeypatch.setattr(diff_stats, 'open_repository', lambda summary: None)
+    repo = {'analysis_summary': {'id': 1, 'name': "owner/repo", 'language': "Python"},
+            'commits': [{'hash': "a" * 40, 'message': "feat: change"}]}
+
+    with pytest.raises(FileNotFoundError, match="owner/repo"):
+        attach_diff_stats([repo])
+    assert 'files_changed' not in repo['commits'][0]
+
+
+def test_cached_stats_need_no_clone(tmp_path, monkeypatch):
+    monkeypatch.setattr(diff_stats, 'DIFF_STATS', tmp_path / "diff_stats")
+    monkeypatch.setattr(diff_stats, 'open_repository', lambda summary: None)
+    diff_stats.save_diff_stats_cache(1, {"a" * 40: [2, 3, 4]})
+    repo = {'analysis_summary': {'id': 1, 'name': "owner/repo", 'language': "Python"},
+            'commits': [{'hash': "a" * 40, 'message': "feat: change"}]}
+
+    attach_diff_stats([repo])
+    assert repo['commits'][0]['files_changed'] == 2
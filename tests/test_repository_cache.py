@@ -0,0 +1,27 @@
+# test_repository_cache.py
+import diff_stats
+from data_saver import get_result_path, save_to_json
+from diff_stats import attach_diff_stats
+from repository_cache import RepositoryCache
+
+
+def test_diff_stats_survive_eviction(tmp_path, monkeypatch, make_result):
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    monkeypatch.setattr(diff_stats, 'DIFF_STATS', tmp_path / "diff_stats")
+    for repo_id in range(3):
+        commits, summary = make_result(repo_id, 50)
+        save_to_json(commits, summary, get_result_path(repo_id, results_dir, 'json', 'none'))
+        # Stats are already cached, so attach_diff_stats does not need a clone
+        diff_stats.save_diff_stats_cache(repo_id, {commit['hash']: [1, index, 2 * index]
+                                                   for index, commit in enumerate(commits)})
+
+    # A cap below the size of one repository evicts every repository when the next one is decoded
+    cache = RepositoryCache(results_dir, max_mb=1e-6)
+    attach_diff_stats(cache)
+    for repo in cache:
+        commits = list(repo['commits'])
+        assert all(commit['files_changed'] == 1 for commit in commits)
+        assert [commit['insertions'] for commit in commits] == list(range(len(commits)))
+        assert [commit['deletions'] for commit in commits] == [2 * index for index in range(len(commits))]
+    assert all(count > 1 for count in cache.decodes.values())
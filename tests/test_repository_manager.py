@@ -0,0 +1,38 @@
+# test_repository_manager.py
+import pytest
+
+import repository_manager
+from repository_manager import CloneCache, get_repository_dir
+
+
+@pytest.fixture
+def clones(tmp_path, monkeypatch):
+    monkeypatch.setattr(repository_manager, 'TEMP', tmp_path)
+    # Every repository has saved results, so all unpinned clones may be deleted
+    monkeypatch.setattr(repository_manager, 'find_result_path', lambda repo_id: tmp_path / f"{repo_id}.json")
+    repos = [{'id': repo_id, 'name': f"repo-{repo_id}", 'language': "Python"} for repo_id in range(3)]
+    for repo in repos:
+        get_repository_dir(repo).mkdir(parents=True)
+        (get_repository_dir(repo) / "file").write_bytes(b"x" * 1000)
+    return repos
+
+
+def test_seed_counts_existing_clones(clones, tmp_path):
+    cache = CloneCache(1500, tmp_path / "clone_cache.json")
+    cache.seed(clones)
+
+    assert cache.total_size() == 3000
+    cache.enforce_budget(keep=[get_repository_dir(clones[0])])
+    assert [get_repository_dir(repo).exists() for repo in clones] == [True, False, False]
+
+
+def test_unpin_enforces_budget(clones, tmp_path):
+    cache = CloneCache(1500, tmp_path / "clone_cache.json")
+    for repo in clones[:2]:
+        cache.pin(get_repository_dir(repo))
+        cache.touch(get_repository_dir(repo), repo['id'])
+    assert cache.enforce_budget() == []
+
+    cache.unpin(get_repository_dir(clones[0]))
+    assert not get_repository_dir(clones[0]).exists()
+    assert get_repository_dir(clones[1]).exists()
@@ -0,0 +1,61 @@
+# test_result_compression.py
+import pytest
+
+import result_compression
+from data_saver import get_result_path, load_repository_data, save_result
+
+zstandard = pytest.importorskip("zstandard")
+
+
+@pytest.fixture
+def dictionaries(tmp_path, monkeypatch):
+    dictionary_path = tmp_path / "zstd_dictionary"
+    archive_dir = tmp_path / "zstd_dictionaries"
+    monkeypatch.setattr(result_compression, 'ZSTD_DICTIONARY', dictionary_path)
+    monkeypatch.setattr(result_compression, 'ZSTD_DICTIONARIES', archive_dir)
+    result_compression.load_zstd_dictionary.cache_clear()
+    result_compression.load_zstd_dictionary_by_id.cache_clear()
+    yield dictionary_path, archive_dir
+    result_compression.load_zstd_dictionary.cache_clear()
+    result_compression.load_zstd_dictionary_by_id.cache_clear()
+
+
+@pytest.fixture
+def save_and_load(tmp_path, make_result):
+    def save_and_load(repo_id):
+        commits, summary = make_result(repo_id, 200)
+        path = save_result(commits, summary, get_result_path(repo_id, tmp_path, 'json', 'zstd'))
+        assert load_repository_data(path)['commits'] == commits
+        return path, commits
+    return save_and_load
+
+
+@pytest.fixture
+def train(dictionaries, make_commits):
+    def train(seed):
+        repos = [{'commits': make_commits(200, repo_id)} for repo_id in range(50)]
+        dictionary_path, archive_dir = dictionaries
+        return result_compression.train_zstd_dictionary(repos, dictionary_path, dict_size=4096, seed=seed,
+                                                        archive_dir=archive_dir)
+    return train
+
+
+def test_zstd_round_trip_without_dictionary(save_and_load, dictionaries):
+    path, _ = save_and_load(1)
+    with open(path, 'rb') as f:
+        assert zstandard.get_frame_parameters(f.read(18)).dict_id == 0
+
+
+def test_zstd_results_are_read_with_their_dictionary(save_and_load, train):
+    before, before_commits = save_and_load(1)
+
+    train(seed=1)
+    first, first_commits = save_and_load(2)
+    with open(first, 'rb') as f:
+        assert zstandard.get_frame_parameters(f.read(18)).dict_id != 0
+
+    # Results written before training and with the replaced dictionary can still be read
+    train(seed=2)
+    save_and_load(3)
+    assert load_repository_data(before)['commits'] == before_commits
+    assert load_repository_data(first)['commits'] == first_commits
@@ -0,0 +1,31 @@
+# test_sensitivity.py
+import numpy as np
+import pytest
+
+from sensitivity import collect_adoption_statistics
+
+
+@pytest.fixture
+def repos(make_commits):
+    rng = np.random.default_rng(0)
+    repos = []
+    for repo_id, n_commits in enumerate([0, 3, 6, 7, 50, 400]):
+        # The CC rate rises from 0 to 1 (the commits are newest first)
+        sequence = rng.random(n_commits) < np.linspace(1, 0, n_commits)
+        commits = make_commits(n_commits, repo_id, types=['feat' if cc else None for cc in sequence])
+        repos.append({'analysis_summary': {'id': repo_id, 'created_at': "2020-01-01"}, 'commits': commits})
+    return repos
+
+
+def test_engines_find_the_same_change_points(repos):
+    prefix_sum = collect_adoption_statistics(repos, engine='prefix_sum')
+    ruptures = collect_adoption_statistics(repos, engine='ruptures')
+
+    assert prefix_sum.equals(ruptures)
+    assert list(prefix_sum['change_point'][:3]) == [-1, -1, -1]
+    assert prefix_sum['change_point'].iloc[-1] > 0
+
+
+def test_multi_mode_is_not_supported(repos):
+    with pytest.raises(ValueError, match="multi"):
+        collect_adoption_statistics(repos, mode='multi')